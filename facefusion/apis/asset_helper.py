@@ -1,38 +1,40 @@
 from typing import Optional
 
-from facefusion.audio import detect_audio_duration
-from facefusion.ffprobe import detect_audio_channel_total, detect_audio_frame_total, detect_audio_sample_rate
 from facefusion.filesystem import is_audio, is_image, is_video
+from facefusion.media_probe import create_media_probe, probe_media
 from facefusion.types import AudioMetadata, ImageMetadata, MediaType, VideoMetadata
-from facefusion.vision import count_video_frame_total, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution
+from facefusion.vision import detect_video_duration
 
 
 def extract_audio_metadata(file_path : str) -> AudioMetadata:
+	media_probe = probe_media(file_path) or create_media_probe({})
 	metadata : AudioMetadata =\
 	{
-		'duration': detect_audio_duration(file_path),
-		'frame_total': detect_audio_frame_total(file_path),
-		'sample_rate': detect_audio_sample_rate(file_path),
-		'channels': detect_audio_channel_total(file_path)
+		'duration': media_probe.get('duration'),
+		'frame_total': media_probe.get('sample_total'),
+		'sample_rate': media_probe.get('sample_rate'),
+		'channels': media_probe.get('channels')
 	}
 	return metadata
 
 
 def extract_image_metadata(file_path : str) -> ImageMetadata:
+	media_probe = probe_media(file_path) or create_media_probe({})
 	metadata : ImageMetadata =\
 	{
-		'resolution': detect_image_resolution(file_path)
+		'resolution': media_probe.get('resolution')
 	}
 	return metadata
 
 
 def extract_video_metadata(file_path : str) -> VideoMetadata:
+	media_probe = probe_media(file_path) or create_media_probe({})
 	metadata : VideoMetadata =\
 	{
 		'duration': detect_video_duration(file_path),
-		'frame_total': count_video_frame_total(file_path),
-		'fps': detect_video_fps(file_path),
-		'resolution': detect_video_resolution(file_path)
+		'frame_total': media_probe.get('frame_total'),
+		'fps': media_probe.get('fps'),
+		'resolution': media_probe.get('resolution')
 	}
 	return metadata
 
@@ -5,6 +5,7 @@ from starlette.routing import Route, WebSocketRoute
 
 from facefusion.apis.endpoints.assets import delete_assets, get_asset, get_assets, upload_asset
 from facefusion.apis.endpoints.capabilities import get_capabilities
+from facefusion.apis.endpoints.jobs import create_job, get_job, websocket_job
 from facefusion.apis.endpoints.metrics import get_metrics, websocket_metrics
 from facefusion.apis.endpoints.ping import websocket_ping
 from facefusion.apis.endpoints.session import create_session, create_session_guard, destroy_session, get_session, refresh_session
@@ -25,6 +26,9 @@ def create_api() -> Starlette:
 			Route('/assets', upload_asset, methods = [ 'POST' ], middleware = [ session_guard ]),
 			Route('/assets/{asset_id}', get_asset, methods = [ 'GET' ], middleware = [ session_guard ]),
 			Route('/assets', delete_assets, methods = [ 'DELETE' ], middleware = [ session_guard ]),
+			Route('/jobs', create_job, methods = [ 'POST' ], middleware = [ session_guard ]),
+			Route('/jobs/{job_id}', get_job, methods = [ 'GET' ], middleware = [ session_guard ]),
+			WebSocketRoute('/jobs/{job_id}', websocket_job, middleware = [ session_guard ]),
 			Route('/capabilities', get_capabilities, methods = [ 'GET' ]),
 			Route('/metrics', get_metrics, methods = [ 'GET' ], middleware = [ session_guard ]),
 			WebSocketRoute('/metrics', websocket_metrics, middleware = [ session_guard ]),
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import uuid
+from typing import Any, Dict
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from starlette.websockets import WebSocket
+
+from facefusion import session_context, session_manager, state_manager, translator
+from facefusion.apis import job_executor, job_store
+from facefusion.apis.api_helper import get_sec_websocket_protocol
+from facefusion.apis.endpoints.session import extract_access_token
+from facefusion.filesystem import create_directory, get_file_extension, is_file
+from facefusion.types import ApiJob
+
+
+async def create_job(request : Request) -> JSONResponse:
+	access_token = extract_access_token(request.scope)
+	session_id = session_manager.find_session_id(access_token)
+	target_path = state_manager.get_item('target_path')
+
+	if session_id and is_file(target_path):
+		session_context.set_session_id(session_id)
+		job_id = str(uuid.uuid4())
+		output_path = os.path.join(state_manager.get_temp_path(), 'outputs', job_id + get_file_extension(target_path))
+		state = dict(state_manager.get_state())
+		state['output_path'] = output_path
+
+		if create_directory(os.path.dirname(output_path)):
+			job_store.create_job(session_id, job_id, output_path)
+			job_executor.submit_job(session_id, job_id, state)
+
+			return JSONResponse(
+			{
+				'job_id': job_id
+			}, status_code = HTTP_201_CREATED)
+
+	return JSONResponse(
+	{
+		'message': translator.get('target_asset_not_found', 'facefusion.apis')
+	}, status_code = HTTP_400_BAD_REQUEST)
+
+
+async def get_job(request : Request) -> JSONResponse:
+	access_token = extract_access_token(request.scope)
+	session_id = session_manager.find_session_id(access_token)
+	job_id = request.path_params.get('job_id')
+
+	if session_id and job_id:
+		job = job_store.get_job(session_id, job_id)
+
+		if job:
+			return JSONResponse(create_job_content(job), status_code = HTTP_200_OK)
+
+	return JSONResponse(
+	{
+		'message': translator.get('job_not_found', 'facefusion.apis')
+	}, status_code = HTTP_404_NOT_FOUND)
+
+
+async def websocket_job(websocket : WebSocket) -> None:
+	subprotocol = get_sec_websocket_protocol(websocket.scope)
+	access_token = extract_access_token(websocket.scope)
+	session_id = session_manager.find_session_id(access_token)
+	job_id = websocket.path_params.get('job_id')
+	await websocket.accept(subprotocol = subprotocol)
+
+	try:
+		while job := job_store.get_job(session_id, job_id):
+			await websocket.send_json(create_job_content(job))
+
+			if job.get('status') in [ 'completed', 'failed' ]:
+				break
+			await asyncio.sleep(0.5)
+
+		await websocket.close()
+
+	except Exception:
+		pass
+
+
+def create_job_content(job : ApiJob) -> Dict[str, Any]:
+	return\
+	{
+		'id': job.get('id'),
+		'created_at': job.get('created_at').isoformat(),
+		'status': job.get('status'),
+		'progress': job.get('progress'),
+		'asset_id': job.get('asset_id')
+	}
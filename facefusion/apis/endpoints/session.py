@@ -9,6 +9,7 @@ from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_401_UNAUTHORIZE
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from facefusion import session_context, session_manager, translator
+from facefusion.apis import job_store
 from facefusion.apis.api_helper import get_sec_websocket_protocol
 from facefusion.types import Token
 
@@ -85,6 +86,7 @@ async def destroy_session(request : Request) -> JSONResponse:
 
 		if session_id:
 			session_manager.clear_session(session_id)
+			job_store.clear_jobs(session_id)
 
 			return JSONResponse(
 			{
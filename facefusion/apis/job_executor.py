@@ -0,0 +1,133 @@
+import importlib
+import multiprocessing
+import queue
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Dict, Optional
+
+from tqdm import tqdm
+
+from facefusion import logger, state_manager
+from facefusion.apis import asset_store, job_store
+from facefusion.thread_helper import thread_lock
+from facefusion.types import ApiJobId, ApiJobProgress, ApiJobReportQueue, SessionId
+
+JOB_EXECUTOR : Optional[ProcessPoolExecutor] = None
+JOB_REPORT_QUEUE : Optional[ApiJobReportQueue] = None
+
+
+def get_job_executor() -> ProcessPoolExecutor:
+	global JOB_EXECUTOR
+
+	with thread_lock():
+		if not JOB_EXECUTOR:
+			job_report_queue : ApiJobReportQueue = multiprocessing.get_context('spawn').Queue()
+			JOB_EXECUTOR = ProcessPoolExecutor(max_workers = 1, mp_context = multiprocessing.get_context('spawn'), initializer = init_job_worker, initargs = (job_report_queue,))
+			threading.Thread(target = relay_job_reports, args = (JOB_EXECUTOR, job_report_queue), daemon = True).start()
+	return JOB_EXECUTOR
+
+
+def reset_job_executor(job_executor : ProcessPoolExecutor) -> None:
+	global JOB_EXECUTOR
+
+	with thread_lock():
+		if JOB_EXECUTOR is job_executor:
+			JOB_EXECUTOR = None
+	job_executor.shutdown(wait = False, cancel_futures = True)
+
+
+def submit_job(session_id : SessionId, job_id : ApiJobId, state : Dict[str, Any]) -> Future[bool]:
+	job_executor = get_job_executor()
+
+	try:
+		future = job_executor.submit(process_job, session_id, job_id, state)
+	except BrokenProcessPool:
+		reset_job_executor(job_executor)
+		job_executor = get_job_executor()
+		future = job_executor.submit(process_job, session_id, job_id, state)
+	future.add_done_callback(partial(resolve_job, job_executor, session_id, job_id))
+	return future
+
+
+def resolve_job(job_executor : ProcessPoolExecutor, session_id : SessionId, job_id : ApiJobId, future : Future[bool]) -> None:
+	job = job_store.get_job(session_id, job_id)
+
+	if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+		reset_job_executor(job_executor)
+
+	if job and not future.cancelled() and not future.exception() and future.result():
+		asset = asset_store.create_asset(session_id, 'output', job.get('output_path'))
+
+		if asset:
+			job_store.set_job_status(session_id, job_id, 'completed', asset.get('id'))
+			return None
+
+	job_store.set_job_status(session_id, job_id, 'failed', None)
+	return None
+
+
+def relay_job_reports(job_executor : ProcessPoolExecutor, job_report_queue : ApiJobReportQueue) -> None:
+	while JOB_EXECUTOR is job_executor:
+		try:
+			session_id, job_id, job_progress = job_report_queue.get(timeout = 0.5)
+		except queue.Empty:
+			continue
+		job_store.set_job_progress(session_id, job_id, job_progress)
+
+
+def init_job_worker(job_report_queue : ApiJobReportQueue) -> None:
+	global JOB_REPORT_QUEUE
+
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	JOB_REPORT_QUEUE = job_report_queue
+
+
+def process_job(session_id : SessionId, job_id : ApiJobId, state : Dict[str, Any]) -> bool:
+	core = importlib.import_module('facefusion.core')
+	report_event = threading.Event()
+	report_thread = threading.Thread(target = report_job_progress, args = (session_id, job_id, report_event), daemon = True)
+
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	logger.init(state_manager.get_item('log_level'))
+	report_thread.start()
+
+	try:
+		return core.common_pre_check() and core.processors_pre_check() and core.conditional_process() == 0
+	finally:
+		report_event.set()
+		report_thread.join()
+
+
+def report_job_progress(session_id : SessionId, job_id : ApiJobId, report_event : threading.Event) -> None:
+	JOB_REPORT_QUEUE.put((session_id, job_id, None))
+
+	while not report_event.wait(0.5):
+		for progress in list(getattr(tqdm, '_instances', [])):
+			JOB_REPORT_QUEUE.put((session_id, job_id, collect_job_progress(progress)))
+
+
+def collect_job_progress(progress : tqdm) -> ApiJobProgress:
+	format_dict = progress.format_dict
+	frame_done = int(format_dict.get('n'))
+	frame_total = int(format_dict.get('total') or 0)
+	fps = float(format_dict.get('rate') or 0)
+	eta = 0.0
+
+	if not fps and format_dict.get('elapsed'):
+		fps = frame_done / format_dict.get('elapsed')
+
+	if fps and frame_total:
+		eta = max(frame_total - frame_done, 0) / fps
+
+	return\
+	{
+		'stage': format_dict.get('prefix') or '',
+		'frame_done': frame_done,
+		'frame_total': frame_total,
+		'fps': round(fps, 2),
+		'eta': round(eta, 2)
+	}
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional
+
+from facefusion.types import ApiJob, ApiJobId, ApiJobProgress, ApiJobStatus, ApiJobStore, AssetId, SessionId
+
+JOB_STORE : ApiJobStore = {}
+
+
+def create_job(session_id : SessionId, job_id : ApiJobId, output_path : str) -> ApiJob:
+	if session_id not in JOB_STORE:
+		JOB_STORE[session_id] = {}
+
+	JOB_STORE[session_id][job_id] =\
+	{
+		'id': job_id,
+		'created_at': datetime.now(),
+		'status': 'queued',
+		'progress': None,
+		'output_path': output_path,
+		'asset_id': None
+	}
+	return JOB_STORE[session_id][job_id]
+
+
+def get_job(session_id : SessionId, job_id : ApiJobId) -> Optional[ApiJob]:
+	if session_id in JOB_STORE:
+		return JOB_STORE.get(session_id).get(job_id)
+	return None
+
+
+def set_job_progress(session_id : SessionId, job_id : ApiJobId, job_progress : Optional[ApiJobProgress]) -> None:
+	job = get_job(session_id, job_id)
+
+	if job and job.get('status') in [ 'queued', 'processing' ]:
+		job['status'] = 'processing'
+
+		if job_progress:
+			job['progress'] = job_progress
+	return None
+
+
+def set_job_status(session_id : SessionId, job_id : ApiJobId, job_status : ApiJobStatus, asset_id : Optional[AssetId]) -> None:
+	job = get_job(session_id, job_id)
+
+	if job:
+		job['status'] = job_status
+		job['asset_id'] = asset_id
+	return None
+
+
+def clear_jobs(session_id : SessionId) -> None:
+	if session_id in JOB_STORE:
+		del JOB_STORE[session_id]
+
+
+def clear() -> None:
+	JOB_STORE.clear()
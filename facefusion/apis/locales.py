@@ -9,6 +9,7 @@ LOCALES : Locales =\
 		'invalid_access_token': 'invalid access token',
 		'invalid_refresh_token': 'invalid refresh token',
 		'source_asset_not_found': 'source asset not found',
-		'target_asset_not_found': 'target asset not found'
+		'target_asset_not_found': 'target asset not found',
+		'job_not_found': 'job not found'
 	}
 }
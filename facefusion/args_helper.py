@@ -1,8 +1,9 @@
+import importlib
+
 from facefusion.filesystem import get_file_name, is_video, resolve_file_paths
 from facefusion.normalizer import normalize_fps, normalize_space
 from facefusion.processors.core import get_processors_modules
 from facefusion.types import ApplyStateItem, Args
-from facefusion.vision import detect_video_fps
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
@@ -13,6 +14,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# paths
 	apply_state_item('temp_path', args.get('temp_path'))
 	apply_state_item('jobs_path', args.get('jobs_path'))
+	apply_state_item('job_store', args.get('job_store'))
 	apply_state_item('source_paths', args.get('source_paths'))
 	apply_state_item('target_path', args.get('target_path'))
 	apply_state_item('output_path', args.get('output_path'))
@@ -26,6 +28,8 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_detector_margin', normalize_space(args.get('face_detector_margin')))
 	apply_state_item('face_detector_angles', args.get('face_detector_angles'))
 	apply_state_item('face_detector_score', args.get('face_detector_score'))
+	apply_state_item('face_tracker', args.get('face_tracker'))
+	apply_state_item('face_tracker_interval', args.get('face_tracker_interval'))
 	# face landmarker
 	apply_state_item('face_landmarker_model', args.get('face_landmarker_model'))
 	apply_state_item('face_landmarker_score', args.get('face_landmarker_score'))
@@ -53,6 +57,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_start', args.get('trim_frame_start'))
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
+	apply_state_item('temp_frame_mode', args.get('temp_frame_mode'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
 	apply_state_item('output_image_scale', args.get('output_image_scale'))
@@ -64,17 +69,23 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('output_video_quality', args.get('output_video_quality'))
 	apply_state_item('output_video_scale', args.get('output_video_scale'))
 	if args.get('output_video_fps') or is_video(args.get('target_path')):
-		output_video_fps = normalize_fps(args.get('output_video_fps')) or detect_video_fps(args.get('target_path'))
+		vision = importlib.import_module('facefusion.vision')
+		output_video_fps = normalize_fps(args.get('output_video_fps')) or vision.detect_video_fps(args.get('target_path'))
 		apply_state_item('output_video_fps', output_video_fps)
 	# processors
 	available_processors = [ get_file_name(file_path) for file_path in resolve_file_paths('facefusion/processors/modules') ]
 	apply_state_item('processors', args.get('processors'))
-	for processor_module in get_processors_modules(available_processors):
-		processor_module.apply_args(args, apply_state_item)
+	if args.get('processors'):
+		for processor_module in get_processors_modules(available_processors):
+			processor_module.apply_args(args, apply_state_item)
 	# execution
 	apply_state_item('execution_device_ids', args.get('execution_device_ids'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
+	apply_state_item('execution_device_scheduler', args.get('execution_device_scheduler'))
+	apply_state_item('execution_worker_mode', args.get('execution_worker_mode'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
+	apply_state_item('execution_batch_size', args.get('execution_batch_size'))
+	apply_state_item('execution_session_concurrency', args.get('execution_session_concurrency'))
 	# download
 	apply_state_item('download_providers', args.get('download_providers'))
 	apply_state_item('download_scope', args.get('download_scope'))
@@ -90,7 +101,14 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# misc
 	apply_state_item('log_level', args.get('log_level'))
 	apply_state_item('halt_on_error', args.get('halt_on_error'))
+	apply_state_item('profile', args.get('profile'))
 	# jobs
 	apply_state_item('job_id', args.get('job_id'))
 	apply_state_item('job_status', args.get('job_status'))
+	apply_state_item('job_workers', args.get('job_workers'))
+	apply_state_item('job_memory_budget', args.get('job_memory_budget'))
+	apply_state_item('job_temp_budget', args.get('job_temp_budget'))
+	apply_state_item('worker_id', args.get('worker_id'))
+	apply_state_item('segment_duration', args.get('segment_duration'))
+	apply_state_item('segment_count', args.get('segment_count'))
 	apply_state_item('step_index', args.get('step_index'))
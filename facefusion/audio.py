@@ -1,88 +1,239 @@
 import math
+import os
+import subprocess
+import tempfile
 from functools import lru_cache
-from typing import Any, List, Optional, Tuple
+from typing import Any, Iterator, Optional, Tuple
 
 import numpy
 import scipy
 from numpy.typing import NDArray
 
-from facefusion.ffmpeg import read_audio_buffer
-from facefusion.filesystem import is_audio
+from facefusion import state_manager
+from facefusion.ffmpeg import pipe_audio_buffer
+from facefusion.filesystem import create_directory, is_audio, is_file, resolve_relative_path
+from facefusion.hash_helper import create_file_hash, create_hash
 from facefusion.media_helper import restrict_trim_frame
-from facefusion.types import Audio, AudioFrame, Duration, Fps, Mel, MelFilterBank, Spectrogram
-from facefusion.voice_extractor import batch_extract_voice
+from facefusion.media_probe import probe_media
+from facefusion.types import Audio, AudioFrame, AudioFrameSet, Duration, Fps, Mel, MelFilterBank, Spectrogram
+from facefusion.voice_extractor import stream_extract_voice
 
 
 @lru_cache(maxsize = 64)
-def read_static_audio(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_static_audio(audio_path : str, fps : Fps) -> Optional[AudioFrameSet]:
 	return read_audio(audio_path, fps)
 
 
-def read_audio(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_audio(audio_path : str, fps : Fps) -> Optional[AudioFrameSet]:
+	if is_audio(audio_path):
+		spectrogram = read_audio_spectrogram(audio_path)
+
+		if spectrogram is not None:
+			return extract_audio_frames(spectrogram, fps)
+	return None
+
+
+def read_audio_spectrogram(audio_path : str) -> Optional[Spectrogram]:
+	audio_spectrogram_path = get_audio_spectrogram_path(audio_path)
+
+	if is_file(audio_spectrogram_path) or create_audio_spectrogram(audio_path, audio_spectrogram_path):
+		return numpy.load(audio_spectrogram_path, mmap_mode = 'r')
+	return None
+
+
+def create_audio_spectrogram(audio_path : str, spectrogram_path : str) -> bool:
 	audio_sample_rate = 48000
 	audio_sample_size = 16
 	audio_channel_total = 2
+	audio_chunk_size = 1024 * 1024
 
-	if is_audio(audio_path):
-		audio_buffer = read_audio_buffer(audio_path, audio_sample_rate, audio_sample_size, audio_channel_total)
-		audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, 2)
-		audio = prepare_audio(audio)
-		spectrogram = create_spectrogram(audio)
-		audio_frames = extract_audio_frames(spectrogram, fps)
-		return audio_frames
-	return None
+	process = pipe_audio_buffer(audio_path, audio_sample_rate, audio_sample_size, audio_channel_total)
+	process.stdin.close() #type:ignore[union-attr]
+	audio_chunks = read_audio_chunks(process, audio_chunk_size * audio_channel_total * audio_sample_size // 8, audio_channel_total)
+	audio_chunks = (audio.mean(axis = 1, dtype = numpy.float32) for audio in audio_chunks)
+	return stream_spectrogram(process, audio_chunks, math.ceil(detect_audio_duration(audio_path) * audio_sample_rate), spectrogram_path)
 
 
 @lru_cache(maxsize = 64)
-def read_static_voice(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_static_voice(audio_path : str, fps : Fps) -> Optional[AudioFrameSet]:
 	return read_voice(audio_path, fps)
 
 
-def read_voice(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_voice(audio_path : str, fps : Fps) -> Optional[AudioFrameSet]:
+	if is_audio(audio_path):
+		spectrogram = read_voice_spectrogram(audio_path)
+
+		if spectrogram is not None:
+			return extract_audio_frames(spectrogram, fps)
+	return None
+
+
+def read_voice_spectrogram(audio_path : str) -> Optional[Spectrogram]:
+	voice_spectrogram_path = get_voice_spectrogram_path(audio_path)
+
+	if is_file(voice_spectrogram_path) or create_voice_spectrogram(audio_path, voice_spectrogram_path):
+		return numpy.load(voice_spectrogram_path, mmap_mode = 'r')
+	return None
+
+
+def create_voice_spectrogram(audio_path : str, spectrogram_path : str) -> bool:
 	voice_sample_rate = 48000
+	voice_resample_rate = 16000
 	voice_sample_size = 16
 	voice_channel_total = 2
 	voice_chunk_size = 240 * 1024
 	voice_step_size = 180 * 1024
+	voice_batch_size = 8
+
+	process = pipe_audio_buffer(audio_path, voice_sample_rate, voice_sample_size, voice_channel_total)
+	process.stdin.close() #type:ignore[union-attr]
+	audio_chunks = read_audio_chunks(process, voice_step_size * voice_batch_size * voice_channel_total * voice_sample_size // 8, voice_channel_total)
+	voice_chunks = stream_extract_voice(audio_chunks, voice_chunk_size, voice_step_size, voice_batch_size)
+	voice_chunks = resample_audio_chunks((numpy.mean(voice, axis = 1) for voice in voice_chunks), voice_sample_rate // voice_resample_rate)
+	return stream_spectrogram(process, voice_chunks, math.ceil(detect_audio_duration(audio_path) * voice_resample_rate), spectrogram_path)
+
+
+def read_audio_chunks(process : subprocess.Popen[bytes], audio_buffer_size : int, audio_channel_total : int) -> Iterator[Audio]:
+	while audio_buffer := process.stdout.read(audio_buffer_size): #type:ignore[union-attr]
+		yield numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, audio_channel_total)
+	process.stdout.close() #type:ignore[union-attr]
+
+
+def resample_audio_chunks(audio_chunks : Iterator[Audio], resample_factor : int) -> Iterator[Audio]:
+	resample_pad_size = 32 * resample_factor
+	temp_audio = numpy.zeros(resample_pad_size)
+	audio_total = 0
+	resample_total = 0
+
+	for audio in audio_chunks:
+		temp_audio = numpy.concatenate([ temp_audio, audio ])
+		audio_total += len(audio)
+		resample_end = (len(temp_audio) - resample_pad_size) // resample_factor * resample_factor
+
+		if resample_end > resample_pad_size:
+			resample_audio = scipy.signal.resample_poly(temp_audio[:resample_end + resample_pad_size], 1, resample_factor)[resample_pad_size // resample_factor:resample_end // resample_factor]
+			resample_total += len(resample_audio)
+			temp_audio = temp_audio[resample_end - resample_pad_size:]
+			yield resample_audio
+
+	temp_audio = numpy.pad(temp_audio, (0, resample_pad_size))
+	resample_audio = scipy.signal.resample_poly(temp_audio, 1, resample_factor)[resample_pad_size // resample_factor:]
+	yield resample_audio[:math.ceil(audio_total / resample_factor) - resample_total]
+
+
+def stream_spectrogram(process : subprocess.Popen[bytes], audio_chunks : Iterator[Audio], audio_limit : int, spectrogram_path : str) -> bool:
+	mel_bin_total = 800
+	mel_bin_step = 200
+	mel_chunk_size = 4096
+	audio_total = 0
+	audio_max = 0.0
+	audio_filter_state = numpy.zeros(1)
+	temp_audio = numpy.zeros(mel_bin_total // 2, dtype = numpy.float32)
+	frame_total = 0
+	spectrogram_directory_path = os.path.dirname(spectrogram_path)
+
+	# peak memory is one audio chunk with its float copies plus one mel chunk of rfft frames, about 90 MB for
+	# 1M samples (and one voice batch when extracting voices) regardless of the duration, as frames go to a memory map
+	if create_directory(spectrogram_directory_path):
+		with tempfile.TemporaryDirectory(dir = spectrogram_directory_path) as temp_directory_path:
+			temp_spectrogram = allocate_spectrogram(temp_directory_path, audio_limit // mel_bin_step + 2)
+
+			for audio in audio_chunks:
+				audio_total += len(audio)
+				audio_max = max(audio_max, numpy.max(numpy.abs(audio), initial = 0))
+				audio, audio_filter_state = scipy.signal.lfilter([ 1.0, -0.97 ], [ 1.0 ], audio, zi = audio_filter_state)
+				spectrogram, temp_audio = transform_spectrogram(numpy.concatenate([ temp_audio, audio ]))
+				temp_spectrogram = append_spectrogram(temp_directory_path, temp_spectrogram, spectrogram, frame_total)
+				frame_total += spectrogram.shape[1]
+
+			temp_audio = numpy.pad(temp_audio, (0, mel_bin_total // 2 + -audio_total % mel_bin_step))
+			spectrogram, _ = transform_spectrogram(temp_audio)
+			temp_spectrogram = append_spectrogram(temp_directory_path, temp_spectrogram, spectrogram, frame_total)
+			frame_total += spectrogram.shape[1]
+
+			if process.wait() == 0:
+				if audio_max > 0:
+					for index in range(0, frame_total, mel_chunk_size):
+						temp_spectrogram[:, index:min(index + mel_chunk_size, frame_total)] /= audio_max
+				write_spectrogram(spectrogram_path, temp_spectrogram[:, :frame_total])
+			del temp_spectrogram
+	return is_file(spectrogram_path)
+
+
+def allocate_spectrogram(temp_directory_path : str, frame_limit : int) -> Spectrogram:
+	mel_filter_total = 80
+	return numpy.lib.format.open_memmap(os.path.join(temp_directory_path, str(frame_limit) + '.npy'), mode = 'w+', dtype = numpy.float32, shape = (mel_filter_total, frame_limit), fortran_order = True)
+
+
+def append_spectrogram(temp_directory_path : str, temp_spectrogram : Spectrogram, spectrogram : Spectrogram, frame_start : int) -> Spectrogram:
+	frame_end = frame_start + spectrogram.shape[1]
 
+	if frame_end > temp_spectrogram.shape[1]:
+		next_spectrogram = allocate_spectrogram(temp_directory_path, max(frame_end, temp_spectrogram.shape[1] * 2))
+		next_spectrogram[:, :frame_start] = temp_spectrogram[:, :frame_start]
+		temp_spectrogram = next_spectrogram
+
+	temp_spectrogram[:, frame_start:frame_end] = spectrogram
+	return temp_spectrogram
+
+
+def write_spectrogram(spectrogram_path : str, spectrogram : Spectrogram) -> bool:
+	spectrogram_directory_path = os.path.dirname(spectrogram_path)
+
+	if create_directory(spectrogram_directory_path):
+		with tempfile.NamedTemporaryFile(dir = spectrogram_directory_path, suffix = '.npy', delete = False) as spectrogram_file:
+			numpy.save(spectrogram_file, spectrogram)
+		os.replace(spectrogram_file.name, spectrogram_path)
+	return is_file(spectrogram_path)
+
+
+def get_audio_spectrogram_path(audio_path : str) -> str:
+	return resolve_relative_path('../.caches/audios/' + create_file_hash(audio_path) + '.npy')
+
+
+def get_voice_spectrogram_path(audio_path : str) -> str:
+	voice_spectrogram_key = create_hash('.'.join([ create_file_hash(audio_path), state_manager.get_item('voice_extractor_model') ]).encode())
+	return resolve_relative_path('../.caches/voices/' + voice_spectrogram_key + '.npy')
+
+
+def get_audio_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
 	if is_audio(audio_path):
-		audio_buffer = read_audio_buffer(audio_path, voice_sample_rate, voice_sample_size, voice_channel_total)
-		audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, 2)
-		audio = batch_extract_voice(audio, voice_chunk_size, voice_step_size)
-		audio = prepare_voice(audio)
-		spectrogram = create_spectrogram(audio)
-		audio_frames = extract_audio_frames(spectrogram, fps)
-		return audio_frames
+		audio_frame_set = read_static_audio(audio_path, fps)
+
+		if audio_frame_set:
+			return select_audio_frame(audio_frame_set, frame_number)
 	return None
 
 
-def get_audio_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
+def get_voice_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
 	if is_audio(audio_path):
-		audio_frames = read_static_audio(audio_path, fps)
-		if frame_number in range(len(audio_frames)):
-			return audio_frames[frame_number]
+		voice_frame_set = read_static_voice(audio_path, fps)
+
+		if voice_frame_set:
+			return select_audio_frame(voice_frame_set, frame_number)
 	return None
 
 
-def extract_audio_frames(spectrogram : Spectrogram, fps : Fps) -> List[AudioFrame]:
-	audio_frames = []
+def extract_audio_frames(spectrogram : Spectrogram, fps : Fps) -> AudioFrameSet:
 	mel_filter_total = 80
 	audio_step_size = 16
-	indices = numpy.arange(0, spectrogram.shape[1], mel_filter_total / fps).astype(numpy.int16)
-	indices = indices[indices >= audio_step_size]
+	frame_indices = numpy.arange(0, spectrogram.shape[1], mel_filter_total / fps).astype(numpy.int64)
+	frame_indices = frame_indices[frame_indices >= audio_step_size]
 
-	for index in indices:
-		start = max(0, index - audio_step_size)
-		audio_frames.append(spectrogram[:, start:index])
+	return\
+	{
+		'spectrogram': spectrogram,
+		'frame_indices': frame_indices
+	}
 
-	return audio_frames
 
+def select_audio_frame(audio_frame_set : AudioFrameSet, frame_number : int) -> Optional[AudioFrame]:
+	audio_step_size = 16
+	frame_indices = audio_frame_set.get('frame_indices')
 
-def get_voice_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
-	if is_audio(audio_path):
-		voice_frames = read_static_voice(audio_path, fps)
-		if frame_number in range(len(voice_frames)):
-			return voice_frames[frame_number]
+	if frame_number in range(len(frame_indices)):
+		index = frame_indices[frame_number]
+		return audio_frame_set.get('spectrogram')[:, index - audio_step_size:index]
 	return None
 
 
@@ -136,15 +287,39 @@ def create_mel_filter_bank() -> MelFilterBank:
 	return mel_filter_bank
 
 
+@lru_cache()
+def create_static_mel_filter_bank() -> MelFilterBank:
+	return create_mel_filter_bank()
+
+
 def create_spectrogram(audio : Audio) -> Spectrogram:
 	mel_bin_total = 800
-	mel_bin_overlap = 600
-	mel_filter_bank = create_mel_filter_bank()
-	spectrogram = scipy.signal.stft(audio, nperseg = mel_bin_total, nfft = mel_bin_total, noverlap = mel_bin_overlap)[2]
-	spectrogram = numpy.dot(mel_filter_bank, numpy.abs(spectrogram))
+	mel_bin_step = 200
+	audio = numpy.pad(audio, (mel_bin_total // 2, mel_bin_total // 2 + -len(audio) % mel_bin_step))
+	spectrogram, _ = transform_spectrogram(audio)
 	return spectrogram
 
 
+def transform_spectrogram(audio : Audio) -> Tuple[Spectrogram, Audio]:
+	mel_bin_total = 800
+	mel_bin_overlap = 600
+	mel_bin_step = mel_bin_total - mel_bin_overlap
+	mel_chunk_size = 4096
+	mel_filter_bank = create_static_mel_filter_bank()
+	mel_window = scipy.signal.windows.hann(mel_bin_total, sym = False)
+	frame_total = max(0, (len(audio) - mel_bin_total) // mel_bin_step + 1)
+	spectrogram = numpy.empty((mel_filter_bank.shape[0], frame_total), dtype = numpy.float32)
+
+	if frame_total > 0:
+		audio_frames = numpy.lib.stride_tricks.sliding_window_view(audio, mel_bin_total)[::mel_bin_step]
+
+		for index in range(0, frame_total, mel_chunk_size):
+			temp_spectrogram = numpy.fft.rfft(audio_frames[index:min(index + mel_chunk_size, frame_total)] * mel_window, axis = 1) / mel_window.sum()
+			spectrogram[:, index:index + mel_chunk_size] = numpy.dot(mel_filter_bank, numpy.abs(temp_spectrogram).T)
+
+	return spectrogram, audio[frame_total * mel_bin_step:]
+
+
 def count_audio_frame_total(audio_path : str, fps : Fps) -> int:
 	audio_duration = detect_audio_duration(audio_path)
 	if audio_duration > 0:
@@ -153,16 +328,11 @@ def count_audio_frame_total(audio_path : str, fps : Fps) -> int:
 
 
 def detect_audio_duration(audio_path : str) -> Duration:
-	audio_sample_rate = 48000
-	audio_sample_size = 16
-	audio_channel_total = 2
-
 	if is_audio(audio_path):
-		audio_buffer = read_audio_buffer(audio_path, audio_sample_rate, audio_sample_size, audio_channel_total)
-		if audio_buffer:
-			audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, audio_channel_total)
-			audio_duration = len(audio) / audio_sample_rate
-			return audio_duration
+		media_probe = probe_media(audio_path)
+
+		if media_probe:
+			return media_probe.get('duration')
 	return 0
 
 
@@ -9,7 +9,9 @@ import facefusion.choices
 from facefusion import content_analyser, core, state_manager
 from facefusion.cli_helper import render_table
 from facefusion.download import conditional_download, resolve_download_url
-from facefusion.face_store import clear_static_faces
+from facefusion.embedding_store import clear_static_embeddings
+from facefusion.face_store import clear_source_faces, clear_static_faces
+from facefusion.face_tracker import clear_face_tracker
 from facefusion.filesystem import get_file_extension
 from facefusion.types import BenchmarkCycleSet
 from facefusion.vision import count_video_frame_total, detect_video_fps
@@ -65,6 +67,9 @@ def cycle(cycle_count : int) -> BenchmarkCycleSet:
 			content_analyser.analyse_image.cache_clear()
 			content_analyser.analyse_video.cache_clear()
 			clear_static_faces()
+			clear_source_faces()
+			clear_static_embeddings()
+			clear_face_tracker()
 
 		start_time = perf_counter()
 		core.conditional_process()
@@ -2,7 +2,7 @@ import logging
 from typing import List, Sequence
 
 from facefusion.common_helper import create_float_range, create_int_range
-from facefusion.types import Angle, AudioEncoder, AudioFormat, AudioTypeSet, BenchmarkMode, BenchmarkResolution, BenchmarkSet, DownloadProvider, DownloadProviderSet, DownloadScope, EncoderSet, ExecutionProvider, ExecutionProviderSet, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskArea, FaceMaskAreaSet, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, Gender, ImageFormat, ImageTypeSet, JobStatus, LogLevel, LogLevelSet, Race, Score, TempFrameFormat, VideoEncoder, VideoFormat, VideoMemoryStrategy, VideoPreset, VideoTypeSet, VoiceExtractorModel, WorkFlow
+from facefusion.types import Angle, AudioEncoder, AudioFormat, AudioTypeSet, BenchmarkMode, BenchmarkResolution, BenchmarkSet, DownloadProvider, DownloadProviderSet, DownloadScope, EncoderSet, ExecutionDeviceScheduler, ExecutionProvider, ExecutionProviderSet, ExecutionWorkerMode, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskArea, FaceMaskAreaSet, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, Gender, ImageFormat, ImageTypeSet, JobStatus, JobStore, LogLevel, LogLevelSet, Race, Score, TempFrameFormat, TempFrameMode, VideoEncoder, VideoFormat, VideoMemoryStrategy, VideoPreset, VideoTypeSet, VoiceExtractorModel, WorkFlow
 
 face_detector_set : FaceDetectorSet =\
 {
@@ -80,6 +80,7 @@ audio_formats : List[AudioFormat] = list(audio_type_set.keys())
 image_formats : List[ImageFormat] = list(image_type_set.keys())
 video_formats : List[VideoFormat] = list(video_type_set.keys())
 temp_frame_formats : List[TempFrameFormat] = [ 'bmp', 'jpeg', 'png', 'tiff' ]
+temp_frame_modes : List[TempFrameMode] = [ 'disk', 'pipe' ]
 
 output_encoder_set : EncoderSet =\
 {
@@ -115,6 +116,8 @@ execution_provider_set : ExecutionProviderSet =\
 	'cpu': 'CPUExecutionProvider'
 }
 execution_providers : List[ExecutionProvider] = list(execution_provider_set.keys())
+execution_device_schedulers : List[ExecutionDeviceScheduler] = [ 'least-outstanding', 'round-robin' ]
+execution_worker_modes : List[ExecutionWorkerMode] = [ 'thread', 'process' ]
 download_provider_set : DownloadProviderSet =\
 {
 	'github':
@@ -149,13 +152,24 @@ log_level_set : LogLevelSet =\
 }
 log_levels : List[LogLevel] = list(log_level_set.keys())
 
+commands : List[str] = [ 'run', 'batch-run', 'force-download', 'benchmark', 'api', 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step', 'job-run', 'job-run-all', 'job-retry', 'job-retry-all', 'job-migrate' ]
+job_runner_commands : List[str] = [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]
 job_statuses : List[JobStatus] = [ 'drafted', 'queued', 'completed', 'failed' ]
+job_stores : List[JobStore] = [ 'json', 'sqlite' ]
 
 benchmark_cycle_count_range : Sequence[int] = create_int_range(1, 10, 1)
+job_workers_range : Sequence[int] = create_int_range(1, 32, 1)
+job_memory_budget_range : Sequence[int] = create_int_range(0, 128, 1)
+job_temp_budget_range : Sequence[int] = create_int_range(0, 1024, 1)
+segment_duration_range : Sequence[int] = create_int_range(1, 3600, 1)
+segment_count_range : Sequence[int] = create_int_range(1, 64, 1)
 execution_thread_count_range : Sequence[int] = create_int_range(1, 32, 1)
+execution_batch_size_range : Sequence[int] = create_int_range(1, 32, 1)
+execution_session_concurrency_range : Sequence[int] = create_int_range(1, 32, 1)
 face_detector_margin_range : Sequence[int] = create_int_range(0, 100, 1)
 face_detector_angles : Sequence[Angle] = create_int_range(0, 270, 90)
 face_detector_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
+face_tracker_interval_range : Sequence[int] = create_int_range(1, 30, 1)
 face_landmarker_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
 face_mask_blur_range : Sequence[float] = create_float_range(0.0, 1.0, 0.05)
 face_mask_padding_range : Sequence[int] = create_int_range(0, 100, 1)
@@ -1,17 +1,21 @@
+import os
 from functools import lru_cache
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy
 from tqdm import tqdm
 
-from facefusion import inference_manager, state_manager, translator
+from facefusion import ffmpeg, inference_manager, state_manager, translator
 from facefusion.common_helper import is_macos
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.execution import has_execution_provider
-from facefusion.filesystem import resolve_relative_path
+from facefusion.filesystem import create_directory, resolve_relative_path
+from facefusion.hash_helper import create_file_hash
+from facefusion.json import read_json, write_json
+from facefusion.tensor_helper import prepare_vision_tensor
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.types import Detection, DownloadScope, DownloadSet, ExecutionProvider, Fps, InferencePool, ModelSet, VisionFrame
-from facefusion.vision import detect_video_fps, fit_contain_frame, read_image, read_video_frame
+from facefusion.types import ContentAnalysisSet, Detection, DownloadScope, DownloadSet, ExecutionProvider, Fps, InferencePool, ModelSet, VisionFrame
+from facefusion.vision import detect_video_fps, detect_video_resolution, fit_contain_frame, read_image, scale_resolution
 
 STREAM_COUNTER = 0
 
@@ -164,21 +168,44 @@ def analyse_image(image_path : str) -> bool:
 
 @lru_cache()
 def analyse_video(video_path : str, trim_frame_start : int, trim_frame_end : int) -> bool:
+	analysis_key = create_analysis_key(video_path, trim_frame_start, trim_frame_end)
+	content_analysis = get_content_analysis(analysis_key)
+
+	if content_analysis is None:
+		content_analysis = detect_video_content(video_path, trim_frame_start, trim_frame_end)
+
+		if content_analysis is None:
+			return True
+		set_content_analysis(analysis_key, content_analysis)
+
+	return content_analysis
+
+
+def detect_video_content(video_path : str, trim_frame_start : int, trim_frame_end : int) -> Optional[bool]:
 	video_fps = detect_video_fps(video_path)
-	frame_range = range(trim_frame_start, trim_frame_end)
+	video_resolution = detect_video_resolution(video_path)
+	sample_interval = int(video_fps)
+	sample_resolution = scale_resolution(video_resolution, min(640 / max(video_resolution), 1))
+	sample_width, sample_height = sample_resolution
+	sample_total = len(range(-(-trim_frame_start // sample_interval) * sample_interval, trim_frame_end, sample_interval))
 	rate = 0.0
 	total = 0
 	counter = 0
 
-	with tqdm(total = len(frame_range), desc = translator.get('analysing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+	process = ffmpeg.pipe_sample_frames(video_path, sample_resolution, video_fps, trim_frame_start, trim_frame_end, sample_interval)
 
-		for frame_number in frame_range:
-			if frame_number % int(video_fps) == 0:
-				vision_frame = read_video_frame(video_path, frame_number)
-				total += 1
+	with tqdm(total = sample_total, desc = translator.get('analysing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 
-				if analyse_frame(vision_frame):
-					counter += 1
+		while total < sample_total:
+			vision_frame = numpy.empty((sample_height, sample_width, 3), dtype = numpy.uint8)
+
+			if process.stdout.readinto(vision_frame.data) < vision_frame.nbytes: #type:ignore[attr-defined]
+				break
+
+			total += 1
+
+			if analyse_frame(vision_frame):
+				counter += 1
 
 			if counter > 0 and total > 0:
 				rate = counter / total * 100
@@ -186,7 +213,33 @@ def analyse_video(video_path : str, trim_frame_start : int, trim_frame_end : int
 			progress.set_postfix(rate = rate)
 			progress.update()
 
-	return bool(rate > 10.0)
+	process.stdout.close()
+
+	if process.wait() == 0 and total == sample_total:
+		return bool(rate > 10.0)
+	return None
+
+
+def create_analysis_key(video_path : str, trim_frame_start : int, trim_frame_end : int) -> str:
+	return '.'.join(map(str, [ create_file_hash(video_path), trim_frame_start, trim_frame_end ]))
+
+
+def get_content_analysis(analysis_key : str) -> Optional[bool]:
+	content_analysis_set : ContentAnalysisSet = read_json(get_content_analysis_path(analysis_key)) or {} #type:ignore[assignment]
+	return content_analysis_set.get(analysis_key)
+
+
+def set_content_analysis(analysis_key : str, content_analysis : bool) -> bool:
+	content_analysis_path = get_content_analysis_path(analysis_key)
+	content_analysis_set : ContentAnalysisSet =\
+	{
+		analysis_key: content_analysis
+	}
+	return create_directory(os.path.dirname(content_analysis_path)) and write_json(content_analysis_path, content_analysis_set)
+
+
+def get_content_analysis_path(analysis_key : str) -> str:
+	return resolve_relative_path('../.caches/content_analyses/' + analysis_key + '.json')
 
 
 def detect_nsfw(vision_frame : VisionFrame) -> bool:
@@ -240,8 +293,5 @@ def prepare_detect_frame(temp_vision_frame : VisionFrame, model_name : str) -> V
 	model_standard_deviation = model_set.get('standard_deviation')
 
 	detect_vision_frame = fit_contain_frame(temp_vision_frame, model_size)
-	detect_vision_frame = detect_vision_frame[:, :, ::-1] / 255.0
-	detect_vision_frame -= model_mean
-	detect_vision_frame /= model_standard_deviation
-	detect_vision_frame = numpy.expand_dims(detect_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
+	detect_vision_frame = prepare_vision_tensor(detect_vision_frame, model_mean, model_standard_deviation, 'content_analyser')
 	return detect_vision_frame
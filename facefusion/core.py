@@ -1,31 +1,33 @@
+import importlib
 import itertools
+import math
 import shutil
 import signal
 import sys
 from time import time
+from types import ModuleType
+from typing import List
 
-import uvicorn
-
-from facefusion import args_store, benchmarker, cli_helper, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, state_manager, translator, voice_extractor
-from facefusion.apis.core import create_api
+from facefusion import args_store, cli_helper, logger, profiler, state_manager, translator
 from facefusion.args_helper import apply_args
-from facefusion.download import conditional_download_hashes, conditional_download_sources
 from facefusion.exit_helper import hard_exit, signal_exit
-from facefusion.filesystem import get_file_extension, has_audio, has_image, has_video
+from facefusion.ffprobe import detect_video_keyframe_numbers
+from facefusion.filesystem import get_file_extension, has_audio, has_image, has_video, is_video
 from facefusion.filesystem import get_file_name, resolve_file_paths, resolve_file_pattern
-from facefusion.jobs import job_helper, job_manager, job_runner
+from facefusion.jobs import job_helper, job_manager
 from facefusion.jobs.job_list import compose_job_list
 from facefusion.processors.core import get_processors_modules
-from facefusion.program import create_program
+from facefusion.program import apply_config_path, create_program, detect_command
 from facefusion.program_helper import validate_args
+from facefusion.system import limit_job_workers
 from facefusion.types import Args, ErrorCode, WorkFlow
-from facefusion.workflows import audio_to_image, audio_to_image_as_frames, image_to_image, image_to_video, image_to_video_as_frames
 
 
 def cli() -> None:
 	if pre_check():
 		signal.signal(signal.SIGINT, signal_exit)
-		program = create_program()
+		apply_config_path(sys.argv[1:])
+		program = create_program(detect_command(sys.argv[1:]))
 
 		if validate_args(program):
 			args = vars(program.parse_args())
@@ -48,35 +50,40 @@ def route(args : Args) -> None:
 		hard_exit(error_code)
 
 	if state_manager.get_item('command') == 'benchmark':
+		benchmarker = importlib.import_module('facefusion.benchmarker')
+
 		if not common_pre_check() or not processors_pre_check() or not benchmarker.pre_check():
 			hard_exit(2)
 		benchmarker.render()
 
 	if state_manager.get_item('command') == 'api':
+		uvicorn = importlib.import_module('uvicorn')
+		api_core = importlib.import_module('facefusion.apis.core')
+
 		logger.info(translator.get('api_started').format(host = state_manager.get_item('api_host'), port = state_manager.get_item('api_port')), __name__)
-		uvicorn.run(create_api(), host = state_manager.get_item('api_host'), port = state_manager.get_item('api_port'))
+		uvicorn.run(api_core.create_api(), host = state_manager.get_item('api_host'), port = state_manager.get_item('api_port'))
 		hard_exit(1)
 
-	if state_manager.get_item('command') in [ 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step' ]:
-		if not job_manager.init_jobs(state_manager.get_jobs_path()):
+	if state_manager.get_item('command') in [ 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step', 'job-migrate' ]:
+		if not job_manager.init_jobs(state_manager.get_jobs_path(), state_manager.get_item('job_store')):
 			hard_exit(1)
 		error_code = route_job_manager(args)
 		hard_exit(error_code)
 
 	if state_manager.get_item('command') == 'run':
-		if not job_manager.init_jobs(state_manager.get_jobs_path()):
+		if not job_manager.init_jobs(state_manager.get_jobs_path(), state_manager.get_item('job_store')):
 			hard_exit(1)
 		error_code = process_headless(args)
 		hard_exit(error_code)
 
 	if state_manager.get_item('command') == 'batch-run':
-		if not job_manager.init_jobs(state_manager.get_jobs_path()):
+		if not job_manager.init_jobs(state_manager.get_jobs_path(), state_manager.get_item('job_store')):
 			hard_exit(1)
 		error_code = process_batch(args)
 		hard_exit(error_code)
 
 	if state_manager.get_item('command') in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]:
-		if not job_manager.init_jobs(state_manager.get_jobs_path()):
+		if not job_manager.init_jobs(state_manager.get_jobs_path(), state_manager.get_item('job_store')):
 			hard_exit(1)
 		error_code = route_job_runner()
 		hard_exit(error_code)
@@ -97,19 +104,16 @@ def pre_check() -> bool:
 	return True
 
 
-def common_pre_check() -> bool:
-	common_modules =\
-	[
-		content_analyser,
-		face_classifier,
-		face_detector,
-		face_landmarker,
-		face_masker,
-		face_recognizer,
-		voice_extractor
-	]
+def get_common_modules() -> List[ModuleType]:
+	common_modules = []
+
+	for module_name in [ 'content_analyser', 'face_classifier', 'face_detector', 'face_landmarker', 'face_masker', 'face_recognizer', 'voice_extractor' ]:
+		common_modules.append(importlib.import_module('facefusion.' + module_name))
+	return common_modules
+
 
-	return all(module.pre_check() for module in common_modules)
+def common_pre_check() -> bool:
+	return all(module.pre_check() for module in get_common_modules())
 
 
 def processors_pre_check() -> bool:
@@ -120,16 +124,8 @@ def processors_pre_check() -> bool:
 
 
 def force_download() -> ErrorCode:
-	common_modules =\
-	[
-		content_analyser,
-		face_classifier,
-		face_detector,
-		face_landmarker,
-		face_masker,
-		face_recognizer,
-		voice_extractor
-	]
+	download = importlib.import_module('facefusion.download')
+	common_modules = get_common_modules()
 	available_processors = [ get_file_name(file_path) for file_path in resolve_file_paths('facefusion/processors/modules') ]
 	processor_modules = get_processors_modules(available_processors)
 
@@ -140,7 +136,7 @@ def force_download() -> ErrorCode:
 				model_source_set = model.get('sources')
 
 				if model_hash_set and model_source_set:
-					if not conditional_download_hashes(model_hash_set) or not conditional_download_sources(model_source_set):
+					if not download.conditional_download_hashes(model_hash_set) or not download.conditional_download_sources(model_source_set):
 						return 1
 
 	return 0
@@ -190,10 +186,17 @@ def route_job_manager(args : Args) -> ErrorCode:
 		logger.error(translator.get('job_all_not_deleted'), __name__)
 		return 1
 
+	if state_manager.get_item('command') == 'job-migrate':
+		if job_manager.migrate_jobs(state_manager.get_jobs_path(), state_manager.get_item('job_store')):
+			logger.info(translator.get('jobs_migrated').format(job_store = state_manager.get_item('job_store')), __name__)
+			return 0
+		logger.error(translator.get('jobs_not_migrated').format(job_store = state_manager.get_item('job_store')), __name__)
+		return 1
+
 	if state_manager.get_item('command') == 'job-add-step':
 		step_args = args_store.filter_step_args(args)
 
-		if job_manager.add_step(state_manager.get_item('job_id'), step_args):
+		if all(job_manager.add_step(state_manager.get_item('job_id'), segment_step_args) for segment_step_args in split_step_args(step_args)):
 			logger.info(translator.get('job_step_added').format(job_id = state_manager.get_item('job_id')), __name__)
 			return 0
 		logger.error(translator.get('job_step_not_added').format(job_id = state_manager.get_item('job_id')), __name__)
@@ -227,6 +230,8 @@ def route_job_manager(args : Args) -> ErrorCode:
 
 
 def route_job_runner() -> ErrorCode:
+	job_runner = importlib.import_module('facefusion.jobs.job_runner')
+
 	if state_manager.get_item('command') == 'job-run':
 		logger.info(translator.get('running_job').format(job_id = state_manager.get_item('job_id')), __name__)
 		if job_runner.run_job(state_manager.get_item('job_id'), process_step):
@@ -237,7 +242,7 @@ def route_job_runner() -> ErrorCode:
 
 	if state_manager.get_item('command') == 'job-run-all':
 		logger.info(translator.get('running_jobs'), __name__)
-		if job_runner.run_jobs(process_step, state_manager.get_item('halt_on_error')):
+		if job_runner.run_jobs(process_step, state_manager.get_item('halt_on_error'), resolve_job_workers(), state_manager.get_item('worker_id')):
 			logger.info(translator.get('processing_jobs_succeeded'), __name__)
 			return 0
 		logger.info(translator.get('processing_jobs_failed'), __name__)
@@ -253,7 +258,7 @@ def route_job_runner() -> ErrorCode:
 
 	if state_manager.get_item('command') == 'job-retry-all':
 		logger.info(translator.get('retrying_jobs'), __name__)
-		if job_runner.retry_jobs(process_step, state_manager.get_item('halt_on_error')):
+		if job_runner.retry_jobs(process_step, state_manager.get_item('halt_on_error'), resolve_job_workers(), state_manager.get_item('worker_id')):
 			logger.info(translator.get('processing_jobs_succeeded'), __name__)
 			return 0
 		logger.info(translator.get('processing_jobs_failed'), __name__)
@@ -261,7 +266,40 @@ def route_job_runner() -> ErrorCode:
 	return 2
 
 
+def resolve_job_workers() -> int:
+	job_workers = limit_job_workers(state_manager.get_item('job_workers'), state_manager.get_item('execution_thread_count'), state_manager.get_item('job_memory_budget'), state_manager.get_item('job_temp_budget'), state_manager.get_temp_path())
+
+	if job_workers < state_manager.get_item('job_workers'):
+		logger.info(translator.get('limiting_job_workers').format(job_workers = job_workers), __name__)
+	return job_workers
+
+
+def split_step_args(step_args : Args) -> List[Args]:
+	vision = importlib.import_module('facefusion.vision')
+	target_path = step_args.get('target_path')
+
+	if is_video(target_path) and (state_manager.get_item('segment_duration') or state_manager.get_item('segment_count')):
+		video_fps = vision.detect_video_fps(target_path)
+		trim_frame_start, trim_frame_end = vision.restrict_trim_video_frame(target_path, step_args.get('trim_frame_start'), step_args.get('trim_frame_end'))
+		segment_step_args_list = []
+
+		if state_manager.get_item('segment_duration'):
+			segment_frame_total = round(state_manager.get_item('segment_duration') * video_fps)
+		else:
+			segment_frame_total = math.ceil((trim_frame_end - trim_frame_start) / state_manager.get_item('segment_count'))
+
+		for segment_frame_start, segment_frame_end in job_helper.create_segment_ranges(trim_frame_start, trim_frame_end, max(segment_frame_total, 1), detect_video_keyframe_numbers(target_path, video_fps)):
+			segment_step_args = step_args.copy()
+			segment_step_args['trim_frame_start'] = segment_frame_start
+			segment_step_args['trim_frame_end'] = segment_frame_end
+			segment_step_args_list.append(segment_step_args)
+
+		return segment_step_args_list
+	return [ step_args ]
+
+
 def process_headless(args : Args) -> ErrorCode:
+	job_runner = importlib.import_module('facefusion.jobs.job_runner')
 	job_id = job_helper.suggest_job_id('headless')
 	step_args = args_store.filter_step_args(args)
 
@@ -271,6 +309,7 @@ def process_headless(args : Args) -> ErrorCode:
 
 
 def process_batch(args : Args) -> ErrorCode:
+	job_runner = importlib.import_module('facefusion.jobs.job_runner')
 	job_id = job_helper.suggest_job_id('batch')
 	step_args = args_store.filter_step_args(args)
 	source_paths = resolve_file_pattern(step_args.get('source_pattern'))
@@ -287,7 +326,7 @@ def process_batch(args : Args) -> ErrorCode:
 				except KeyError:
 					return 1
 
-				if not job_manager.add_step(job_id, step_args):
+				if not all(job_manager.add_step(job_id, segment_step_args) for segment_step_args in split_step_args(step_args)):
 					return 1
 			if job_manager.submit_job(job_id) and job_runner.run_job(job_id, process_step):
 				return 0
@@ -301,7 +340,7 @@ def process_batch(args : Args) -> ErrorCode:
 				except KeyError:
 					return 1
 
-				if not job_manager.add_step(job_id, step_args):
+				if not all(job_manager.add_step(job_id, segment_step_args) for segment_step_args in split_step_args(step_args)):
 					return 1
 			if job_manager.submit_job(job_id) and job_runner.run_job(job_id, process_step):
 				return 0
@@ -332,16 +371,22 @@ def conditional_process() -> ErrorCode:
 		if not processor_module.pre_process('output'):
 			return 2
 
+	error_code = process_workflow(start_time)
+	profiler.conditional_report(state_manager.get_item('output_path'))
+	return error_code
+
+
+def process_workflow(start_time : float) -> ErrorCode:
 	if state_manager.get_item('workflow') == 'audio-to-image:video':
-		return audio_to_image.process(start_time)
+		return importlib.import_module('facefusion.workflows.audio_to_image').process(start_time)
 	if state_manager.get_item('workflow') == 'audio-to-image:frames':
-		return audio_to_image_as_frames.process(start_time)
+		return importlib.import_module('facefusion.workflows.audio_to_image_as_frames').process(start_time)
 	if state_manager.get_item('workflow') == 'image-to-image':
-		return image_to_image.process(start_time)
+		return importlib.import_module('facefusion.workflows.image_to_image').process(start_time)
 	if state_manager.get_item('workflow') == 'image-to-video':
-		return image_to_video.process(start_time)
+		return importlib.import_module('facefusion.workflows.image_to_video').process(start_time)
 	if state_manager.get_item('workflow') == 'image-to-video:frames':
-		return image_to_video_as_frames.process(start_time)
+		return importlib.import_module('facefusion.workflows.image_to_video_as_frames').process(start_time)
 
 	return 0
 
@@ -1,5 +1,6 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import List, Optional, Tuple
 from urllib.parse import urlparse
@@ -145,8 +146,11 @@ def validate_source_paths(source_paths : List[str]) -> Tuple[List[str], List[str
 	valid_source_paths = []
 	invalid_source_paths = []
 
-	for source_path in source_paths:
-		if validate_hash(source_path):
+	with ThreadPoolExecutor() as executor:
+		source_validations = list(executor.map(validate_hash, source_paths))
+
+	for source_path, is_valid in zip(source_paths, source_validations):
+		if is_valid:
 			valid_source_paths.append(source_path)
 		else:
 			invalid_source_paths.append(source_path)
@@ -0,0 +1,47 @@
+import os
+from typing import Optional
+
+import numpy
+
+from facefusion.filesystem import create_directory, is_file, resolve_relative_path
+from facefusion.thread_helper import thread_lock
+from facefusion.types import Embedding, EmbeddingStore
+
+EMBEDDING_STORE : EmbeddingStore =\
+{
+	'static_embeddings': {}
+}
+
+
+def get_static_embedding(embedding_key : str) -> Optional[Embedding]:
+	return EMBEDDING_STORE.get('static_embeddings').get(embedding_key)
+
+
+def set_static_embedding(embedding_key : str, embedding : Embedding) -> None:
+	with thread_lock():
+		EMBEDDING_STORE['static_embeddings'][embedding_key] = embedding
+
+
+def read_static_embedding(embedding_key : str) -> Optional[Embedding]:
+	embedding_path = resolve_embedding_path(embedding_key)
+
+	if is_file(embedding_path):
+		return numpy.load(embedding_path)
+	return None
+
+
+def write_static_embedding(embedding_key : str, embedding : Embedding) -> bool:
+	embedding_path = resolve_embedding_path(embedding_key)
+
+	if create_directory(os.path.dirname(embedding_path)):
+		numpy.save(embedding_path, embedding)
+	return is_file(embedding_path)
+
+
+def resolve_embedding_path(embedding_key : str) -> str:
+	return resolve_relative_path('../.caches/embeddings/' + embedding_key + '.npy')
+
+
+def clear_static_embeddings() -> None:
+	with thread_lock():
+		EMBEDDING_STORE['static_embeddings'].clear()
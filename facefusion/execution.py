@@ -1,20 +1,18 @@
+import importlib
 from typing import List
 
-from onnxruntime import get_available_providers, set_default_logger_severity
-
 import facefusion.choices
 from facefusion.system import detect_static_graphic_devices
 from facefusion.types import ExecutionProvider, InferenceSessionProvider
 
-set_default_logger_severity(3)
-
 
 def has_execution_provider(execution_provider : ExecutionProvider) -> bool:
 	return execution_provider in get_available_execution_providers()
 
 
 def get_available_execution_providers() -> List[ExecutionProvider]:
-	inference_session_providers = get_available_providers()
+	onnxruntime = importlib.import_module('onnxruntime')
+	inference_session_providers = onnxruntime.get_available_providers()
 	available_execution_providers : List[ExecutionProvider] = []
 
 	for execution_provider, execution_provider_value in facefusion.choices.execution_provider_set.items():
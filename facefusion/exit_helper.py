@@ -5,7 +5,7 @@ from time import sleep
 from types import FrameType
 
 from facefusion import process_manager, state_manager
-from facefusion.temp_helper import clear_temp_directory
+from facefusion.temp_helper import clear_temp_directory, read_temp_checkpoint
 from facefusion.types import ErrorCode
 
 
@@ -28,7 +28,7 @@ def graceful_exit(error_code : ErrorCode) -> None:
 	while process_manager.is_processing():
 		sleep(0.5)
 
-	if state_manager.get_item('output_path'):
+	if state_manager.get_item('output_path') and not read_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path')):
 		clear_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
 
 	hard_exit(error_code)
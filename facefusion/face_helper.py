@@ -5,6 +5,8 @@ import cv2
 import numpy
 from cv2.typing import Size
 
+from facefusion.profiler import profile_function
+from facefusion.tensor_helper import get_tensor_buffer
 from facefusion.types import Anchors, Angle, BoundingBox, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
 
 WARP_TEMPLATE_SET : WarpTemplateSet =\
@@ -74,6 +76,7 @@ def estimate_matrix_by_face_landmark_5(face_landmark_5 : FaceLandmark5, warp_tem
 	return affine_matrix
 
 
+@profile_function
 def warp_face_by_face_landmark_5(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5, warp_template : WarpTemplate, crop_size : Size) -> Tuple[VisionFrame, Matrix]:
 	affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, warp_template, crop_size)
 	crop_vision_frame = cv2.warpAffine(temp_vision_frame, affine_matrix, crop_size, borderMode = cv2.BORDER_REPLICATE, flags = cv2.INTER_AREA)
@@ -99,18 +102,34 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 
 
 def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+	return paste_back_faces(temp_vision_frame, [ crop_vision_frame ], [ crop_vision_mask ], [ affine_matrix ])
+
+
+@profile_function
+def paste_back_faces(temp_vision_frame : VisionFrame, crop_vision_frames : List[VisionFrame], crop_vision_masks : List[Mask], affine_matrices : List[Matrix]) -> VisionFrame:
+	temp_vision_frame = temp_vision_frame.copy()
+
+	for crop_vision_frame, crop_vision_mask, affine_matrix in zip(crop_vision_frames, crop_vision_masks, affine_matrices):
+		blend_paste_area(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+	return temp_vision_frame
+
+
+def blend_paste_area(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> None:
 	paste_bounding_box, paste_matrix = calculate_paste_area(temp_vision_frame, crop_vision_frame, affine_matrix)
 	x1, y1, x2, y2 = paste_bounding_box
 	paste_width = x2 - x1
 	paste_height = y2 - y1
-	inverse_vision_mask = cv2.warpAffine(crop_vision_mask, paste_matrix, (paste_width, paste_height)).clip(0, 1)
-	inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
-	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
-	temp_vision_frame = temp_vision_frame.copy()
-	paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
-	paste_vision_frame = paste_vision_frame * (1 - inverse_vision_mask) + inverse_vision_frame * inverse_vision_mask
-	temp_vision_frame[y1:y2, x1:x2] = paste_vision_frame.astype(temp_vision_frame.dtype)
-	return temp_vision_frame
+
+	if paste_width > 0 and paste_height > 0:
+		inverse_vision_mask = cv2.warpAffine(crop_vision_mask, paste_matrix, (paste_width, paste_height)).clip(0, 1)
+		inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
+		inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
+		paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
+		blend_vision_frame = get_tensor_buffer('paste', inverse_vision_frame.shape)
+		numpy.subtract(inverse_vision_frame, paste_vision_frame, out = blend_vision_frame, dtype = numpy.float32)
+		numpy.multiply(blend_vision_frame, inverse_vision_mask, out = blend_vision_frame)
+		numpy.add(blend_vision_frame, paste_vision_frame, out = blend_vision_frame)
+		numpy.copyto(paste_vision_frame, blend_vision_frame, casting = 'unsafe')
 
 
 def calculate_paste_area(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, affine_matrix : Matrix) -> Tuple[BoundingBox, Matrix]:
@@ -234,6 +253,21 @@ def apply_nms(bounding_boxes : List[BoundingBox], scores : List[Score], score_th
 	return keep_indices
 
 
+def calculate_bounding_box_iou(bounding_box : BoundingBox, other_bounding_box : BoundingBox) -> float:
+	x1 = max(bounding_box[0], other_bounding_box[0])
+	y1 = max(bounding_box[1], other_bounding_box[1])
+	x2 = min(bounding_box[2], other_bounding_box[2])
+	y2 = min(bounding_box[3], other_bounding_box[3])
+	intersection_area = max(0, x2 - x1) * max(0, y2 - y1)
+	bounding_box_area = (bounding_box[2] - bounding_box[0]) * (bounding_box[3] - bounding_box[1])
+	other_bounding_box_area = (other_bounding_box[2] - other_bounding_box[0]) * (other_bounding_box[3] - other_bounding_box[1])
+	union_area = bounding_box_area + other_bounding_box_area - intersection_area
+
+	if union_area > 0:
+		return float(intersection_area / union_area)
+	return 0.0
+
+
 def get_nms_threshold(face_detector_model : FaceDetectorModel, face_detector_angles : List[Angle]) -> float:
 	if face_detector_model == 'many':
 		return 0.1
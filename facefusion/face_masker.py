@@ -3,13 +3,19 @@ from typing import List, Tuple
 
 import cv2
 import numpy
+from cv2.typing import Size
 
 import facefusion.choices
 from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
+from facefusion.face_helper import merge_matrix, scale_face_landmark_5, warp_face_by_face_landmark_5
+from facefusion.face_store import get_face_mask, set_face_mask
 from facefusion.filesystem import resolve_relative_path
+from facefusion.hash_helper import create_hash
+from facefusion.profiler import profile_function
+from facefusion.tensor_helper import prepare_vision_tensor
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.types import DownloadScope, DownloadSet, FaceLandmark68, FaceMaskArea, FaceMaskRegion, InferencePool, Mask, ModelSet, Padding, VisionFrame
+from facefusion.types import AnalysisContext, DownloadScope, DownloadSet, FaceLandmark5, FaceLandmark68, FaceMask, FaceMaskArea, FaceMaskRegion, InferencePool, Mask, Matrix, ModelSet, Padding, VisionFrame
 
 
 @lru_cache()
@@ -201,6 +207,28 @@ def create_box_mask(crop_vision_frame : VisionFrame, face_mask_blur : float, fac
 
 
 def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
+	occlusion_mask = detect_occlusion_mask(crop_vision_frame)
+	occlusion_mask = cv2.resize(occlusion_mask, crop_vision_frame.shape[:2][::-1])
+	occlusion_mask = (cv2.GaussianBlur(occlusion_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
+	return occlusion_mask
+
+
+def resolve_occlusion_mask(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5, affine_matrix : Matrix, crop_size : Size, analysis_context : AnalysisContext) -> Mask:
+	mask_key = create_mask_key(face_landmark_5, state_manager.get_item('face_occluder_model'))
+	face_mask = get_face_mask(analysis_context, mask_key)
+
+	if face_mask is None:
+		mask_vision_frame, mask_matrix = warp_face_mask_frame(temp_vision_frame, face_landmark_5)
+		face_mask = create_face_mask(detect_occlusion_mask(mask_vision_frame), mask_matrix, mask_vision_frame.shape[:2][::-1])
+		set_face_mask(analysis_context, mask_key, face_mask)
+
+	occlusion_mask = warp_face_mask(face_mask.get('mask'), face_mask.get('affine_matrix'), affine_matrix, crop_size)
+	occlusion_mask = (cv2.GaussianBlur(occlusion_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
+	return occlusion_mask
+
+
+@profile_function
+def detect_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 	temp_masks = []
 
 	if state_manager.get_item('face_occluder_model') == 'many':
@@ -215,11 +243,9 @@ def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 		prepare_vision_frame = prepare_vision_frame.transpose(0, 1, 2, 3)
 		temp_mask = forward_occlude_face(prepare_vision_frame, model_name)
 		temp_mask = temp_mask.transpose(0, 1, 2).clip(0, 1).astype(numpy.float32)
-		temp_mask = cv2.resize(temp_mask, crop_vision_frame.shape[:2][::-1])
-		temp_masks.append(temp_mask)
+		temp_masks.append(temp_mask.reshape(model_size[::-1]))
 
 	occlusion_mask = numpy.minimum.reduce(temp_masks)
-	occlusion_mask = (cv2.GaussianBlur(occlusion_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
 	return occlusion_mask
 
 
@@ -239,21 +265,63 @@ def create_area_mask(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLan
 
 
 def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List[FaceMaskRegion]) -> Mask:
-	model_name = state_manager.get_item('face_parser_model')
-	model_size = create_static_model_set('full').get(model_name).get('size')
-	prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
-	prepare_vision_frame = prepare_vision_frame[:, :, ::-1].astype(numpy.float32) / 255.0
-	prepare_vision_frame = numpy.subtract(prepare_vision_frame, numpy.array([ 0.485, 0.456, 0.406 ]).astype(numpy.float32))
-	prepare_vision_frame = numpy.divide(prepare_vision_frame, numpy.array([ 0.229, 0.224, 0.225 ]).astype(numpy.float32))
-	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0)
-	prepare_vision_frame = prepare_vision_frame.transpose(0, 3, 1, 2)
-	region_mask = forward_parse_face(prepare_vision_frame)
-	region_mask = numpy.isin(region_mask.argmax(0), [ facefusion.choices.face_mask_region_set.get(face_mask_region) for face_mask_region in face_mask_regions ])
+	region_labels = detect_region_labels(crop_vision_frame)
+	region_mask : Mask = numpy.isin(region_labels, [ facefusion.choices.face_mask_region_set.get(face_mask_region) for face_mask_region in face_mask_regions ])
 	region_mask = cv2.resize(region_mask.astype(numpy.float32), crop_vision_frame.shape[:2][::-1])
 	region_mask = (cv2.GaussianBlur(region_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
 	return region_mask
 
 
+def resolve_region_mask(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5, affine_matrix : Matrix, crop_size : Size, face_mask_regions : List[FaceMaskRegion], analysis_context : AnalysisContext) -> Mask:
+	mask_key = create_mask_key(face_landmark_5, state_manager.get_item('face_parser_model'))
+	face_mask = get_face_mask(analysis_context, mask_key)
+
+	if face_mask is None:
+		mask_vision_frame, mask_matrix = warp_face_mask_frame(temp_vision_frame, face_landmark_5)
+		face_mask = create_face_mask(detect_region_labels(mask_vision_frame), mask_matrix, mask_vision_frame.shape[:2][::-1])
+		set_face_mask(analysis_context, mask_key, face_mask)
+
+	region_mask : Mask = numpy.isin(face_mask.get('mask'), [ facefusion.choices.face_mask_region_set.get(face_mask_region) for face_mask_region in face_mask_regions ])
+	region_mask = warp_face_mask(region_mask.astype(numpy.float32), face_mask.get('affine_matrix'), affine_matrix, crop_size)
+	region_mask = (cv2.GaussianBlur(region_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
+	return region_mask
+
+
+@profile_function
+def detect_region_labels(crop_vision_frame : VisionFrame) -> Mask:
+	model_name = state_manager.get_item('face_parser_model')
+	model_size = create_static_model_set('full').get(model_name).get('size')
+	prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
+	prepare_vision_frame = prepare_vision_tensor(prepare_vision_frame, [ 0.485, 0.456, 0.406 ], [ 0.229, 0.224, 0.225 ], 'face_parser')
+	region_labels = forward_parse_face(prepare_vision_frame).argmax(0).astype(numpy.uint8)
+	return region_labels
+
+
+def create_mask_key(face_landmark_5 : FaceLandmark5, model_name : str) -> str:
+	return create_hash(face_landmark_5.tobytes() + model_name.encode())
+
+
+def warp_face_mask_frame(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[VisionFrame, Matrix]:
+	face_landmark_5 = scale_face_landmark_5(face_landmark_5, 1.125)
+	return warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'ffhq_512', (512, 512))
+
+
+def create_face_mask(mask : Mask, affine_matrix : Matrix, crop_size : Size) -> FaceMask:
+	mask_height, mask_width = mask.shape[:2]
+	mask_matrix = numpy.dot(numpy.diag([ mask_width / crop_size[0], mask_height / crop_size[1] ]), affine_matrix)
+
+	return\
+	{
+		'mask': mask,
+		'affine_matrix': mask_matrix
+	}
+
+
+def warp_face_mask(mask : Mask, mask_matrix : Matrix, affine_matrix : Matrix, crop_size : Size) -> Mask:
+	temp_matrix = merge_matrix([ cv2.invertAffineTransform(mask_matrix), affine_matrix ])
+	return cv2.warpAffine(mask, temp_matrix, crop_size, borderMode = cv2.BORDER_REPLICATE)
+
+
 def forward_occlude_face(prepare_vision_frame : VisionFrame, model_name : str) -> Mask:
 	face_occluder = get_inference_pool().get(model_name)
 
@@ -7,6 +7,7 @@ from facefusion import inference_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_helper import warp_face_by_face_landmark_5
 from facefusion.filesystem import resolve_relative_path
+from facefusion.tensor_helper import prepare_vision_tensor
 from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.types import DownloadScope, Embedding, FaceLandmark5, InferencePool, ModelOptions, ModelSet, VisionFrame
 
@@ -72,9 +73,7 @@ def calculate_face_embedding(temp_vision_frame : VisionFrame, face_landmark_5 :
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
-	crop_vision_frame = crop_vision_frame / 127.5 - 1
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
+	crop_vision_frame = prepare_vision_tensor(crop_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], 'face_recognizer')
 	face_embedding = forward(crop_vision_frame)
 	face_embedding = face_embedding.ravel()
 	face_embedding_norm = face_embedding / numpy.linalg.norm(face_embedding)
@@ -1,14 +1,15 @@
-from typing import List
+from typing import List, Optional
 
 import numpy
 
 from facefusion import state_manager
-from facefusion.face_analyser import get_many_faces, get_one_face
-from facefusion.types import Face, FaceSelectorOrder, Gender, Race, Score, VisionFrame
+from facefusion.face_analyser import detect_many_faces, get_many_faces, get_one_face
+from facefusion.face_tracker import get_track_match, set_track_match, track_faces
+from facefusion.types import AnalysisContext, Face, FaceSelectorOrder, Gender, Race, Score, VisionFrame
 
 
-def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> List[Face]:
-	target_faces = get_many_faces([ target_vision_frame ])
+def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : VisionFrame, analysis_context : Optional[AnalysisContext] = None) -> List[Face]:
+	target_faces = get_target_faces(target_vision_frame, analysis_context)
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		return sort_and_filter_faces(target_faces)
@@ -19,7 +20,7 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 			return [ target_face ]
 
 	if state_manager.get_item('face_selector_mode') == 'reference':
-		reference_faces = get_many_faces([ reference_vision_frame ])
+		reference_faces = get_reference_faces(reference_vision_frame, analysis_context)
 		reference_faces = sort_and_filter_faces(reference_faces)
 		reference_face = get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
 		if reference_face:
@@ -29,18 +30,49 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 	return []
 
 
+def get_target_faces(target_vision_frame : VisionFrame, analysis_context : Optional[AnalysisContext]) -> List[Face]:
+	if analysis_context:
+		if analysis_context.get('target_faces') is None:
+			if state_manager.get_item('face_tracker') and analysis_context.get('frame_number') is not None:
+				analysis_context['target_faces'] = track_faces(target_vision_frame, analysis_context.get('frame_number'))
+			else:
+				analysis_context['target_faces'] = detect_many_faces(target_vision_frame)
+		return analysis_context.get('target_faces')
+	return get_many_faces([ target_vision_frame ])
+
+
+def get_reference_faces(reference_vision_frame : VisionFrame, analysis_context : Optional[AnalysisContext]) -> List[Face]:
+	if analysis_context:
+		if analysis_context.get('reference_faces') is None:
+			analysis_context['reference_faces'] = get_many_faces([ reference_vision_frame ])
+		return analysis_context.get('reference_faces')
+	return get_many_faces([ reference_vision_frame ])
+
+
 def find_match_faces(reference_faces : List[Face], target_faces : List[Face], face_distance : float) -> List[Face]:
 	match_faces : List[Face] = []
 
-	for reference_face in reference_faces:
+	for reference_index, reference_face in enumerate(reference_faces):
 		if reference_face:
 			for index, target_face in enumerate(target_faces):
-				if compare_faces(target_face, reference_face, face_distance):
+				if is_match_face(target_face, reference_face, reference_index, face_distance):
 					match_faces.append(target_faces[index])
 
 	return match_faces
 
 
+def is_match_face(target_face : Face, reference_face : Face, reference_index : int, face_distance : float) -> bool:
+	if target_face.track_id is not None:
+		is_match = get_track_match(target_face.track_id, reference_index)
+
+		if is_match is None:
+			is_match = compare_faces(target_face, reference_face, face_distance)
+			set_track_match(target_face.track_id, reference_index, is_match)
+		return is_match
+
+	return compare_faces(target_face, reference_face, face_distance)
+
+
 def compare_faces(face : Face, reference_face : Face, face_distance : float) -> bool:
 	current_face_distance = calculate_face_distance(face, reference_face)
 	current_face_distance = float(numpy.interp(current_face_distance, [ 0, 2 ], [ 0, 1 ]))
@@ -1,24 +1,128 @@
+from collections import OrderedDict
 from typing import List, Optional
 
-from facefusion.hash_helper import create_hash
-from facefusion.types import Face, FaceStore, VisionFrame
+from facefusion import state_manager
+from facefusion.hash_helper import create_file_hash, create_hash
+from facefusion.thread_helper import thread_lock
+from facefusion.types import AnalysisContext, Face, FaceMask, FaceStore, FaceStoreStats, VisionFrame
 
+FACE_STORE_SIZE = 64
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {}
+	'static_faces': OrderedDict(),
+	'source_faces': OrderedDict(),
+	'hit_total': 0,
+	'miss_total': 0
 }
 
 
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
 	vision_hash = create_hash(vision_frame.tobytes())
-	return FACE_STORE.get('static_faces').get(vision_hash)
+
+	with thread_lock():
+		if vision_hash in FACE_STORE.get('static_faces'):
+			FACE_STORE['static_faces'].move_to_end(vision_hash)
+			FACE_STORE['hit_total'] += 1
+			return FACE_STORE.get('static_faces').get(vision_hash)
+
+		FACE_STORE['miss_total'] += 1
+	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
 	vision_hash = create_hash(vision_frame.tobytes())
+
 	if vision_hash:
-		FACE_STORE['static_faces'][vision_hash] = faces
+		with thread_lock():
+			FACE_STORE['static_faces'][vision_hash] = faces
+			FACE_STORE['static_faces'].move_to_end(vision_hash)
+
+			while len(FACE_STORE.get('static_faces')) > FACE_STORE_SIZE:
+				FACE_STORE['static_faces'].popitem(last = False)
+
+
+def get_face_mask(analysis_context : AnalysisContext, mask_key : str) -> Optional[FaceMask]:
+	return analysis_context.get('face_masks').get(mask_key)
+
+
+def set_face_mask(analysis_context : AnalysisContext, mask_key : str, face_mask : FaceMask) -> None:
+	analysis_context['face_masks'][mask_key] = face_mask
+
+
+def get_source_face(source_paths : List[str]) -> Optional[Face]:
+	source_key = create_source_key(source_paths)
+
+	with thread_lock():
+		if source_key in FACE_STORE.get('source_faces'):
+			FACE_STORE['source_faces'].move_to_end(source_key)
+			return FACE_STORE.get('source_faces').get(source_key)
+	return None
+
+
+def set_source_face(source_paths : List[str], source_face : Face) -> None:
+	source_key = create_source_key(source_paths)
+
+	with thread_lock():
+		FACE_STORE['source_faces'][source_key] = source_face
+		FACE_STORE['source_faces'].move_to_end(source_key)
+
+		while len(FACE_STORE.get('source_faces')) > FACE_STORE_SIZE:
+			FACE_STORE['source_faces'].popitem(last = False)
+
+
+def create_source_key(source_paths : List[str]) -> str:
+	source_hashes = [ create_file_hash(source_path) or source_path for source_path in source_paths ]
+	source_hashes.extend(
+	[
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		state_manager.get_item('face_detector_margin'),
+		state_manager.get_item('face_detector_angles'),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score'),
+		state_manager.get_item('face_selector_order'),
+		state_manager.get_item('face_selector_age_start'),
+		state_manager.get_item('face_selector_age_end'),
+		state_manager.get_item('face_selector_gender'),
+		state_manager.get_item('face_selector_race')
+	])
+	return create_hash('.'.join(map(str, source_hashes)).encode())
+
+
+def clear_source_faces() -> None:
+	with thread_lock():
+		FACE_STORE['source_faces'].clear()
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'].clear()
+	with thread_lock():
+		FACE_STORE['static_faces'].clear()
+		FACE_STORE['hit_total'] = 0
+		FACE_STORE['miss_total'] = 0
+
+
+def get_face_store_stats() -> FaceStoreStats:
+	request_total = FACE_STORE.get('hit_total') + FACE_STORE.get('miss_total')
+	hit_rate = 0.0
+
+	if request_total > 0:
+		hit_rate = FACE_STORE.get('hit_total') / request_total
+
+	return\
+	{
+		'size': len(FACE_STORE.get('static_faces')),
+		'hit_total': FACE_STORE.get('hit_total'),
+		'miss_total': FACE_STORE.get('miss_total'),
+		'hit_rate': round(hit_rate, 2)
+	}
+
+
+def create_analysis_context(frame_number : Optional[int] = None) -> AnalysisContext:
+	return\
+	{
+		'frame_number': frame_number,
+		'reference_faces': None,
+		'target_faces': None,
+		'face_masks': {}
+	}
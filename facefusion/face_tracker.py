@@ -0,0 +1,171 @@
+import threading
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_analyser import detect_many_faces
+from facefusion.face_helper import calculate_bounding_box_iou, convert_to_face_landmark_5
+from facefusion.face_landmarker import detect_face_landmark
+from facefusion.thread_helper import thread_lock
+from facefusion.types import Face, FaceLandmarkSet, FaceScoreSet, FaceTrack, FaceTracker, VisionFrame
+
+FACE_TRACKER_SIZE = 64
+FACE_TRACKER_IOU_THRESHOLD = 0.3
+FACE_TRACKER_SCENE_THRESHOLD = 30.0
+FACE_TRACKER_TIMEOUT = 10
+FACE_TRACKER : FaceTracker =\
+{
+	'face_tracks': {},
+	'match_set': {},
+	'track_total': 0
+}
+
+
+def track_faces(vision_frame : VisionFrame, frame_number : int) -> List[Face]:
+	track_index = frame_number // state_manager.get_item('face_tracker_interval')
+	face_track, is_claimed = claim_face_track(track_index)
+
+	if is_claimed:
+		return detect_track_faces(vision_frame, track_index, face_track)
+
+	if face_track.get('event').wait(FACE_TRACKER_TIMEOUT) and not detect_scene_cut(vision_frame, face_track.get('vision_frame')):
+		propagate_faces = propagate_track_faces(vision_frame, face_track.get('faces'))
+
+		if propagate_faces is not None:
+			return propagate_faces
+
+	return assign_track_ids(detect_many_faces(vision_frame), face_track.get('faces'))
+
+
+def claim_face_track(track_index : int) -> Tuple[FaceTrack, bool]:
+	with thread_lock():
+		face_tracks = FACE_TRACKER.get('face_tracks')
+
+		if track_index in face_tracks:
+			return face_tracks.get(track_index), False
+
+		face_track : FaceTrack =\
+		{
+			'faces': [],
+			'vision_frame': None,
+			'event': threading.Event()
+		}
+		face_tracks[track_index] = face_track
+
+		for index in sorted(face_tracks.keys())[:-FACE_TRACKER_SIZE]:
+			del face_tracks[index]
+
+	return face_track, True
+
+
+def detect_track_faces(vision_frame : VisionFrame, track_index : int, face_track : FaceTrack) -> List[Face]:
+	previous_faces : List[Face] = []
+
+	try:
+		previous_face_track = FACE_TRACKER.get('face_tracks').get(track_index - 1)
+
+		if previous_face_track and previous_face_track.get('event').wait(FACE_TRACKER_TIMEOUT):
+			previous_faces = previous_face_track.get('faces')
+
+		face_track['faces'] = assign_track_ids(detect_many_faces(vision_frame), previous_faces)
+		face_track['vision_frame'] = create_track_vision_frame(vision_frame)
+	finally:
+		face_track.get('event').set()
+
+	return face_track.get('faces')
+
+
+def propagate_track_faces(vision_frame : VisionFrame, track_faces : List[Face]) -> Optional[List[Face]]:
+	propagate_faces = []
+
+	if state_manager.get_item('face_landmarker_score') > 0:
+		for track_face in track_faces:
+			face_landmark_68, face_landmark_score_68 = detect_face_landmark(vision_frame, track_face.bounding_box, track_face.angle)
+
+			if face_landmark_score_68 <= state_manager.get_item('face_landmarker_score'):
+				return None
+
+			face_landmark_5_68 = convert_to_face_landmark_5(face_landmark_68)
+			face_offset = numpy.mean(face_landmark_5_68 - track_face.landmark_set.get('5/68'), axis = 0)
+			face_landmark_set : FaceLandmarkSet =\
+			{
+				'5': track_face.landmark_set.get('5') + face_offset,
+				'5/68': face_landmark_5_68,
+				'68': face_landmark_68,
+				'68/5': track_face.landmark_set.get('68/5') + face_offset
+			}
+			face_score_set : FaceScoreSet =\
+			{
+				'detector': track_face.score_set.get('detector'),
+				'landmarker': face_landmark_score_68
+			}
+			propagate_faces.append(track_face._replace(
+				bounding_box = track_face.bounding_box + numpy.tile(face_offset, 2),
+				score_set = face_score_set,
+				landmark_set = face_landmark_set
+			))
+		return propagate_faces
+
+	return None
+
+
+def assign_track_ids(faces : List[Face], previous_faces : List[Face]) -> List[Face]:
+	track_faces : List[Optional[Face]] = [ None ] * len(faces)
+	face_pairs = []
+
+	for face_index, face in enumerate(faces):
+		for previous_face in previous_faces:
+			face_iou = calculate_bounding_box_iou(face.bounding_box, previous_face.bounding_box)
+
+			if face_iou > FACE_TRACKER_IOU_THRESHOLD:
+				face_pairs.append((face_iou, face_index, previous_face.track_id))
+
+	track_ids = set()
+
+	for _, face_index, track_id in sorted(face_pairs, key = lambda face_pair: face_pair[0], reverse = True):
+		if track_faces[face_index] is None and track_id not in track_ids:
+			track_faces[face_index] = faces[face_index]._replace(track_id = track_id)
+			track_ids.add(track_id)
+
+	for face_index, face in enumerate(faces):
+		if track_faces[face_index] is None:
+			track_faces[face_index] = face._replace(track_id = create_track_id())
+
+	return track_faces #type:ignore[return-value]
+
+
+def create_track_id() -> int:
+	with thread_lock():
+		FACE_TRACKER['track_total'] += 1
+		return FACE_TRACKER.get('track_total')
+
+
+def create_track_vision_frame(vision_frame : VisionFrame) -> VisionFrame:
+	track_vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+	track_vision_frame = cv2.resize(track_vision_frame, (64, 36), interpolation = cv2.INTER_AREA)
+	return track_vision_frame
+
+
+def detect_scene_cut(vision_frame : VisionFrame, track_vision_frame : Optional[VisionFrame]) -> bool:
+	if track_vision_frame is None:
+		return True
+	scene_difference = numpy.mean(cv2.absdiff(create_track_vision_frame(vision_frame), track_vision_frame))
+	return bool(scene_difference > FACE_TRACKER_SCENE_THRESHOLD)
+
+
+def get_track_match(track_id : int, reference_index : int) -> Optional[bool]:
+	return FACE_TRACKER.get('match_set').get((track_id, reference_index))
+
+
+def set_track_match(track_id : int, reference_index : int, is_match : bool) -> None:
+	with thread_lock():
+		FACE_TRACKER['match_set'][(track_id, reference_index)] = is_match
+
+
+def clear_face_tracker() -> None:
+	with thread_lock():
+		FACE_TRACKER['face_tracks'].clear()
+		FACE_TRACKER['match_set'].clear()
+		FACE_TRACKER['track_total'] = 0
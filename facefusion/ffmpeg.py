@@ -125,6 +125,31 @@ def extract_frames(target_path : str, output_path : str, temp_video_resolution :
 		return process.returncode == 0
 
 
+def pipe_extract_frames(target_path : str, temp_video_resolution : Resolution, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> subprocess.Popen[bytes]:
+	commands = ffmpeg_builder.chain(
+		ffmpeg_builder.set_input(target_path),
+		ffmpeg_builder.set_media_resolution(pack_resolution(temp_video_resolution)),
+		ffmpeg_builder.select_frame_range(trim_frame_start, trim_frame_end, temp_video_fps),
+		ffmpeg_builder.prevent_frame_drop(),
+		ffmpeg_builder.capture_raw_video('bgr24'),
+		ffmpeg_builder.cast_stream()
+	)
+	return open_ffmpeg(commands)
+
+
+def pipe_sample_frames(target_path : str, sample_resolution : Resolution, target_video_fps : Fps, trim_frame_start : int, trim_frame_end : int, sample_interval : int) -> subprocess.Popen[bytes]:
+	commands = ffmpeg_builder.chain(
+		ffmpeg_builder.set_input_start(trim_frame_start, target_video_fps),
+		ffmpeg_builder.set_input(target_path),
+		ffmpeg_builder.select_frame_interval(trim_frame_start, trim_frame_end, sample_interval),
+		ffmpeg_builder.set_media_resolution(pack_resolution(sample_resolution)),
+		ffmpeg_builder.prevent_frame_drop(),
+		ffmpeg_builder.capture_raw_video('bgr24'),
+		ffmpeg_builder.cast_stream()
+	)
+	return open_ffmpeg(commands)
+
+
 def spawn_frames(target_path : str, output_path : str, temp_video_resolution : Resolution, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> bool:
 	spawn_frame_total = trim_frame_end - trim_frame_start
 	duration = spawn_frame_total / temp_video_fps
@@ -167,6 +192,15 @@ def finalize_image(output_path : str, output_image_resolution : Resolution) -> b
 
 
 def read_audio_buffer(target_path : str, audio_sample_rate : int, audio_sample_size : int, audio_channel_total : int) -> Optional[AudioBuffer]:
+	process = pipe_audio_buffer(target_path, audio_sample_rate, audio_sample_size, audio_channel_total)
+	audio_buffer, _ = process.communicate()
+
+	if process.returncode == 0:
+		return audio_buffer
+	return None
+
+
+def pipe_audio_buffer(target_path : str, audio_sample_rate : int, audio_sample_size : int, audio_channel_total : int) -> subprocess.Popen[bytes]:
 	commands = ffmpeg_builder.chain(
 		ffmpeg_builder.set_input(target_path),
 		ffmpeg_builder.ignore_video_stream(),
@@ -175,13 +209,7 @@ def read_audio_buffer(target_path : str, audio_sample_rate : int, audio_sample_s
 		ffmpeg_builder.set_audio_channel_total(audio_channel_total),
 		ffmpeg_builder.cast_stream()
 	)
-
-	process = open_ffmpeg(commands)
-	audio_buffer, _ = process.communicate()
-
-	if process.returncode == 0:
-		return audio_buffer
-	return None
+	return open_ffmpeg(commands)
 
 
 def restore_audio(target_path : str, output_path : str, trim_frame_start : int, trim_frame_end : int) -> bool:
@@ -263,6 +291,34 @@ def merge_video(target_path : str, output_path : str, temp_video_fps : Fps, outp
 		return process.returncode == 0
 
 
+def pipe_merge_video(output_path : str, temp_video_fps : Fps, temp_video_resolution : Resolution, output_video_resolution : Resolution) -> subprocess.Popen[bytes]:
+	output_video_fps = state_manager.get_item('output_video_fps')
+	output_video_encoder = state_manager.get_item('output_video_encoder')
+	output_video_quality = state_manager.get_item('output_video_quality')
+	output_video_preset = state_manager.get_item('output_video_preset')
+	temp_video_path = get_temp_file_path(state_manager.get_temp_path(), output_path)
+	temp_video_format = cast(VideoFormat, get_file_format(output_path))
+
+	output_video_encoder = fix_video_encoder(temp_video_format, output_video_encoder)
+	commands = ffmpeg_builder.chain(
+		ffmpeg_builder.capture_raw_video('bgra'),
+		ffmpeg_builder.set_media_resolution(pack_resolution(temp_video_resolution)),
+		ffmpeg_builder.set_input_fps(temp_video_fps),
+		ffmpeg_builder.set_input('-'),
+		ffmpeg_builder.set_media_resolution(pack_resolution(output_video_resolution)),
+		ffmpeg_builder.set_video_encoder(output_video_encoder),
+		ffmpeg_builder.set_video_quality(output_video_encoder, output_video_quality),
+		ffmpeg_builder.set_video_preset(output_video_encoder, output_video_preset),
+		ffmpeg_builder.concat(
+			ffmpeg_builder.set_video_fps(output_video_fps),
+			ffmpeg_builder.keep_video_alpha(output_video_encoder)
+		),
+		ffmpeg_builder.set_pixel_format(output_video_encoder),
+		ffmpeg_builder.force_output(temp_video_path)
+	)
+	return open_ffmpeg(commands)
+
+
 def concat_video(output_path : str, temp_output_paths : List[str]) -> bool:
 	concat_video_path = tempfile.mktemp()
 
@@ -51,6 +51,10 @@ def set_input_fps(input_fps : Fps) -> List[Command]:
 	return [ '-r', str(input_fps) ]
 
 
+def set_input_start(frame_start : int, input_fps : Fps) -> List[Command]:
+	return [ '-ss', str(frame_start / input_fps) ]
+
+
 def set_output(output_path : str) -> List[Command]:
 	return [ output_path ]
 
@@ -113,6 +117,10 @@ def select_frame_range(frame_start : int, frame_end : int, video_fps : Fps) -> L
 	return [ '-vf', 'fps=' + str(video_fps) ]
 
 
+def select_frame_interval(frame_start : int, frame_end : int, frame_interval : int) -> List[Command]:
+	return [ '-vf', 'select=between(n\\,0\\,' + str(frame_end - frame_start - 1) + ')*not(mod(n+' + str(frame_start) + '\\,' + str(frame_interval) + '))' ]
+
+
 def prevent_frame_drop() -> List[Command]:
 	return [ '-vsync', '0' ]
 
@@ -259,6 +267,10 @@ def capture_video() -> List[Command]:
 	return [ '-f', 'rawvideo', '-pix_fmt', 'rgb24' ]
 
 
+def capture_raw_video(pixel_format : str) -> List[Command]:
+	return [ '-f', 'rawvideo', '-pix_fmt', pixel_format ]
+
+
 def ignore_video_stream() -> List[Command]:
 	return [ '-vn' ]
 
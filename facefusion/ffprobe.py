@@ -3,7 +3,7 @@ import subprocess
 from typing import Dict, List, Optional
 
 from facefusion import ffprobe_builder
-from facefusion.types import Command
+from facefusion.types import Command, Fps
 
 
 def run_ffprobe(commands : List[Command]) -> subprocess.Popen[bytes]:
@@ -58,3 +58,31 @@ def detect_audio_frame_total(audio_path : str) -> Optional[int]:
 	if audio_duration and audio_sample_rate:
 		return int(float(audio_duration) * int(audio_sample_rate))
 	return None
+
+
+def detect_video_keyframe_numbers(video_path : str, video_fps : Fps) -> List[int]:
+	commands = ffprobe_builder.chain(
+		ffprobe_builder.select_video_stream(),
+		ffprobe_builder.show_packet_entries([ 'pts_time', 'flags' ]),
+		ffprobe_builder.format_to_csv(),
+		ffprobe_builder.set_input(video_path)
+	)
+	process = run_ffprobe(commands)
+	output, _ = process.communicate()
+	packet_times = []
+	keyframe_times = []
+
+	if output:
+		for line in output.decode().strip().splitlines():
+			packet_entries = line.split(',')
+
+			if len(packet_entries) == 2 and packet_entries[0] != 'N/A':
+				packet_times.append(float(packet_entries[0]))
+
+				if 'K' in packet_entries[1]:
+					keyframe_times.append(float(packet_entries[0]))
+
+	if packet_times:
+		start_time = min(packet_times)
+		return sorted({ round((keyframe_time - start_time) * video_fps) for keyframe_time in keyframe_times })
+	return []
@@ -17,6 +17,22 @@ def show_entries(entries : List[str]) -> List[Command]:
 	return [ '-show_entries', 'stream=' + ','.join(entries) ]
 
 
+def show_packet_entries(entries : List[str]) -> List[Command]:
+	return [ '-show_entries', 'packet=' + ','.join(entries) ]
+
+
+def select_video_stream() -> List[Command]:
+	return [ '-select_streams', 'v:0' ]
+
+
+def show_streams() -> List[Command]:
+	return [ '-show_streams' ]
+
+
+def show_format() -> List[Command]:
+	return [ '-show_format' ]
+
+
 def format_to_value() -> List[Command]:
 	return [ '-of', 'default=noprint_wrappers=1:nokey=1' ]
 
@@ -25,5 +41,13 @@ def format_to_key_value() -> List[Command]:
 	return [ '-of', 'default=noprint_wrappers=1' ]
 
 
+def format_to_csv() -> List[Command]:
+	return [ '-of', 'csv=p=0' ]
+
+
+def format_to_json() -> List[Command]:
+	return [ '-of', 'json' ]
+
+
 def set_input(input_path : str) -> List[Command]:
 	return [ input_path ]
@@ -3,6 +3,8 @@ import os
 import shutil
 from typing import List, Optional
 
+import psutil
+
 import facefusion.choices
 
 
@@ -163,6 +165,21 @@ def in_directory(file_path : str) -> bool:
 	return False
 
 
+def is_network_directory(directory_path : str) -> bool:
+	if is_directory(directory_path):
+		directory_path = os.path.realpath(directory_path)
+
+		if directory_path.startswith('\\\\'):
+			return True
+
+		disk_partitions = [ disk_partition for disk_partition in psutil.disk_partitions(all = True) if directory_path == disk_partition.mountpoint or directory_path.startswith(os.path.join(disk_partition.mountpoint, '')) ]
+
+		if disk_partitions:
+			disk_partition = max(disk_partitions, key = lambda disk_partition: len(disk_partition.mountpoint))
+			return disk_partition.fstype in [ '9p', 'afs', 'ceph', 'cifs', 'fuse.sshfs', 'glusterfs', 'lustre', 'nfs', 'nfs4', 'smb3', 'smbfs' ] or 'remote' in disk_partition.opts
+	return False
+
+
 def create_directory(directory_path : str) -> bool:
 	if directory_path and not is_file(directory_path):
 		os.makedirs(directory_path, exist_ok = True)
@@ -0,0 +1,159 @@
+import multiprocessing
+import signal
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy
+
+from facefusion import logger, state_manager
+from facefusion.types import ExecutionWorkerMode, FrameBuffer, FramePool, SharedFrameSet, VisionFrame
+
+SHARED_MEMORY_SET : Dict[str, SharedMemory] = {}
+
+
+@contextmanager
+def open_frame_pool(execution_worker_mode : ExecutionWorkerMode, worker_total : int) -> Iterator[FramePool]:
+	frame_pool : FramePool =\
+	{
+		'executor': create_executor(execution_worker_mode, worker_total),
+		'frame_buffer': None,
+		'slot_total': worker_total * 2
+	}
+
+	try:
+		yield frame_pool
+	finally:
+		frame_pool.get('executor').shutdown()
+
+		if frame_pool.get('frame_buffer'):
+			destroy_frame_buffer(frame_pool.get('frame_buffer'))
+
+
+def create_executor(execution_worker_mode : ExecutionWorkerMode, worker_total : int) -> Executor:
+	if execution_worker_mode == 'process':
+		return ProcessPoolExecutor(max_workers = worker_total, mp_context = multiprocessing.get_context('spawn'), initializer = init_frame_worker, initargs = (dict(state_manager.get_state()),))
+	return ThreadPoolExecutor(max_workers = worker_total)
+
+
+def init_frame_worker(state : Dict[str, Any]) -> None:
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	logger.init(state_manager.get_item('log_level'))
+
+
+def submit_frames(frame_pool : FramePool, process_method : Callable[..., List[VisionFrame]], vision_frames : List[VisionFrame], *args : Any) -> Future[List[VisionFrame]]:
+	executor = frame_pool.get('executor')
+
+	if isinstance(executor, ProcessPoolExecutor):
+		frame_buffer = conditional_create_frame_buffer(frame_pool, vision_frames)
+
+		if sum(vision_frame.nbytes for vision_frame in vision_frames) <= frame_buffer.get('slot_size'):
+			slot_index = frame_buffer.get('slot_queue').get()
+			frame_shapes = write_shared_frames(frame_buffer.get('shared_memory'), slot_index, frame_buffer.get('slot_size'), vision_frames)
+			shared_future = executor.submit(process_shared_frames, process_method, frame_buffer.get('shared_memory').name, slot_index, frame_buffer.get('slot_size'), frame_shapes, *args)
+			future : Future[List[VisionFrame]] = Future()
+			future.add_done_callback(partial(cancel_shared_future, shared_future))
+			shared_future.add_done_callback(partial(resolve_shared_frames, frame_buffer, slot_index, future))
+			return future
+
+	return executor.submit(process_method, vision_frames, *args)
+
+
+def process_shared_frames(process_method : Callable[..., List[VisionFrame]], shared_memory_name : str, slot_index : int, slot_size : int, frame_shapes : List[Tuple[int, ...]], *args : Any) -> SharedFrameSet:
+	shared_memory = get_shared_memory(shared_memory_name)
+	vision_frames = [ vision_frame.copy() for vision_frame in read_shared_frames(shared_memory, slot_index, slot_size, frame_shapes) ]
+	vision_frames = process_method(vision_frames, *args)
+	frame_shapes = [ vision_frame.shape for vision_frame in vision_frames ]
+
+	if sum(vision_frame.nbytes for vision_frame in vision_frames) <= slot_size:
+		write_shared_frames(shared_memory, slot_index, slot_size, vision_frames)
+		vision_frames = []
+
+	return\
+	{
+		'frame_shapes': frame_shapes,
+		'vision_frames': vision_frames
+	}
+
+
+def resolve_shared_frames(frame_buffer : FrameBuffer, slot_index : int, future : Future[List[VisionFrame]], shared_future : Future[SharedFrameSet]) -> None:
+	try:
+		if not shared_future.cancelled() and future.set_running_or_notify_cancel():
+			if shared_future.exception():
+				future.set_exception(shared_future.exception())
+			else:
+				future.set_result(read_shared_frame_set(frame_buffer, slot_index, shared_future.result()))
+		else:
+			future.cancel()
+	finally:
+		frame_buffer.get('slot_queue').put(slot_index)
+
+
+def read_shared_frame_set(frame_buffer : FrameBuffer, slot_index : int, shared_frame_set : SharedFrameSet) -> List[VisionFrame]:
+	if shared_frame_set.get('vision_frames'):
+		return shared_frame_set.get('vision_frames')
+	return [ vision_frame.copy() for vision_frame in read_shared_frames(frame_buffer.get('shared_memory'), slot_index, frame_buffer.get('slot_size'), shared_frame_set.get('frame_shapes')) ]
+
+
+def cancel_shared_future(shared_future : Future[SharedFrameSet], future : Future[List[VisionFrame]]) -> None:
+	if future.cancelled():
+		shared_future.cancel()
+
+
+def read_shared_frames(shared_memory : SharedMemory, slot_index : int, slot_size : int, frame_shapes : List[Tuple[int, ...]]) -> List[VisionFrame]:
+	buffer_offset = slot_index * slot_size
+	vision_frames = []
+
+	for frame_shape in frame_shapes:
+		vision_frame = numpy.ndarray(frame_shape, dtype = numpy.uint8, buffer = shared_memory.buf, offset = buffer_offset)
+		vision_frames.append(vision_frame)
+		buffer_offset += vision_frame.nbytes
+
+	return vision_frames
+
+
+def write_shared_frames(shared_memory : SharedMemory, slot_index : int, slot_size : int, vision_frames : List[VisionFrame]) -> List[Tuple[int, ...]]:
+	frame_shapes = [ vision_frame.shape for vision_frame in vision_frames ]
+
+	for shared_frame, vision_frame in zip(read_shared_frames(shared_memory, slot_index, slot_size, frame_shapes), vision_frames):
+		numpy.copyto(shared_frame, vision_frame)
+
+	return frame_shapes
+
+
+def get_shared_memory(shared_memory_name : str) -> SharedMemory:
+	if shared_memory_name not in SHARED_MEMORY_SET:
+		SHARED_MEMORY_SET[shared_memory_name] = SharedMemory(name = shared_memory_name)
+	return SHARED_MEMORY_SET.get(shared_memory_name)
+
+
+def conditional_create_frame_buffer(frame_pool : FramePool, vision_frames : List[VisionFrame]) -> FrameBuffer:
+	if not frame_pool.get('frame_buffer'):
+		slot_size = sum(vision_frame.shape[0] * vision_frame.shape[1] * 4 for vision_frame in vision_frames)
+		frame_pool['frame_buffer'] = create_frame_buffer(frame_pool.get('slot_total'), slot_size)
+	return frame_pool.get('frame_buffer')
+
+
+def create_frame_buffer(slot_total : int, slot_size : int) -> FrameBuffer:
+	slot_queue : Queue[int] = Queue()
+
+	for slot_index in range(slot_total):
+		slot_queue.put(slot_index)
+
+	return\
+	{
+		'shared_memory': SharedMemory(create = True, size = slot_total * slot_size),
+		'slot_size': slot_size,
+		'slot_queue': slot_queue
+	}
+
+
+def destroy_frame_buffer(frame_buffer : FrameBuffer) -> None:
+	frame_buffer.get('shared_memory').close()
+	frame_buffer.get('shared_memory').unlink()
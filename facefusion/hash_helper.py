@@ -1,14 +1,42 @@
 import os
 import zlib
+from functools import lru_cache
 from typing import Optional
 
-from facefusion.filesystem import get_file_name, is_file
+from facefusion.filesystem import create_directory, get_file_name, is_file
+from facefusion.json import read_json, write_json
+from facefusion.types import HashValidation
 
 
 def create_hash(content : bytes) -> str:
 	return format(zlib.crc32(content), '08x')
 
 
+def create_file_hash(file_path : str) -> Optional[str]:
+	if is_file(file_path):
+		file_stat = os.stat(file_path)
+		return create_static_file_hash(file_path, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+	return None
+
+
+def create_file_signature(file_path : str) -> Optional[str]:
+	if is_file(file_path):
+		file_stat = os.stat(file_path)
+		return create_hash('.'.join(map(str, [ os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino ])).encode())
+	return None
+
+
+@lru_cache(maxsize = 1024)
+def create_static_file_hash(file_path : str, file_size : int, file_mtime : int, file_inode : int) -> str:
+	file_hash = 0
+
+	with open(file_path, 'rb') as file:
+		for file_chunk in iter(lambda: file.read(1024 * 1024), b''):
+			file_hash = zlib.crc32(file_chunk, file_hash)
+
+	return format(file_hash, '08x')
+
+
 def validate_hash(validate_path : str) -> bool:
 	hash_path = get_hash_path(validate_path)
 
@@ -16,13 +44,42 @@ def validate_hash(validate_path : str) -> bool:
 		with open(hash_path) as hash_file:
 			hash_content = hash_file.read()
 
-		with open(validate_path, 'rb') as validate_file:
-			validate_content = validate_file.read()
-
-		return create_hash(validate_content) == hash_content
+		return resolve_file_hash(validate_path) == hash_content
 	return False
 
 
+def resolve_file_hash(file_path : str) -> str:
+	file_stat = os.stat(file_path)
+	hash_validation = get_hash_validation(file_path)
+
+	if hash_validation and hash_validation.get('file_size') == file_stat.st_size and hash_validation.get('file_mtime') == file_stat.st_mtime_ns and hash_validation.get('file_inode') == file_stat.st_ino:
+		return hash_validation.get('file_hash')
+
+	file_hash = create_static_file_hash(file_path, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+	set_hash_validation(file_path,
+	{
+		'file_size': file_stat.st_size,
+		'file_mtime': file_stat.st_mtime_ns,
+		'file_inode': file_stat.st_ino,
+		'file_hash': file_hash
+	})
+	return file_hash
+
+
+def get_hash_validation(file_path : str) -> Optional[HashValidation]:
+	return read_json(get_hash_validation_path(file_path)) #type:ignore[return-value]
+
+
+def set_hash_validation(file_path : str, hash_validation : HashValidation) -> bool:
+	hash_validation_path = get_hash_validation_path(file_path)
+	return create_directory(os.path.dirname(hash_validation_path)) and write_json(hash_validation_path, hash_validation) #type:ignore[arg-type]
+
+
+def get_hash_validation_path(file_path : str) -> str:
+	validate_directory_path, file_name_and_extension = os.path.split(file_path)
+	return os.path.join(validate_directory_path, 'hash_validations', file_name_and_extension + '.json')
+
+
 def get_hash_path(validate_path : str) -> Optional[str]:
 	if is_file(validate_path):
 		validate_directory_path, file_name_and_extension = os.path.split(validate_path)
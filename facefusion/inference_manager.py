@@ -1,24 +1,36 @@
 import importlib
-import random
-from time import sleep, time
-from typing import List
+import threading
+from contextlib import contextmanager
+from time import perf_counter, sleep, time
+from typing import Dict, Iterator, List
 
-from onnxruntime import InferenceSession
+from onnxruntime import InferenceSession, set_default_logger_severity
 
-from facefusion import logger, process_manager, state_manager, translator
+from facefusion import logger, process_manager, profiler, state_manager, translator
 from facefusion.app_context import detect_app_context
 from facefusion.common_helper import is_windows
 from facefusion.execution import create_inference_session_providers, has_execution_provider
 from facefusion.exit_helper import fatal_exit
 from facefusion.filesystem import get_file_name, is_file
+from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
 from facefusion.time_helper import calculate_end_time
-from facefusion.types import DownloadSet, ExecutionProvider, InferencePool, InferencePoolSet
+from facefusion.types import DownloadSet, ExecutionDeviceLoad, ExecutionProvider, InferencePool, InferencePoolSet, InferenceSessionLimiter, InferenceSessionMetric
+
+set_default_logger_severity(3)
 
 INFERENCE_POOL_SET : InferencePoolSet =\
 {
 	'cli': {},
 	'api': {}
 }
+EXECUTION_DEVICE_LOAD : ExecutionDeviceLoad =\
+{
+	'in_flight_loads': {},
+	'request_total': 0
+}
+EXECUTION_DEVICE_AFFINITY = threading.local()
+INFERENCE_SESSION_LIMITER_SET : Dict[int, InferenceSessionLimiter] = {}
+INFERENCE_SESSION_METRIC_SET : Dict[str, InferenceSessionMetric] = {}
 
 
 def get_inference_pool(module_name : str, model_names : List[str], model_source_set : DownloadSet) -> InferencePool:
@@ -38,7 +50,7 @@ def get_inference_pool(module_name : str, model_names : List[str], model_source_
 		if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
 			INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers)
 
-	current_inference_context = get_inference_context(module_name, model_names, random.choice(execution_device_ids), execution_providers)
+	current_inference_context = get_inference_context(module_name, model_names, get_execution_device_id(execution_device_ids), execution_providers)
 	return INFERENCE_POOL_SET.get(app_context).get(current_inference_context)
 
 
@@ -60,10 +72,13 @@ def clear_inference_pool(module_name : str, model_names : List[str]) -> None:
 
 	if is_windows() and has_execution_provider('directml'):
 		INFERENCE_POOL_SET[app_context].clear()
+		INFERENCE_SESSION_LIMITER_SET.clear()
 
 	for execution_device_id in execution_device_ids:
 		inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
 		if INFERENCE_POOL_SET.get(app_context).get(inference_context):
+			for inference_session in INFERENCE_POOL_SET.get(app_context).get(inference_context).values():
+				INFERENCE_SESSION_LIMITER_SET.pop(id(inference_session), None)
 			del INFERENCE_POOL_SET[app_context][inference_context]
 
 
@@ -74,6 +89,10 @@ def create_inference_session(model_path : str, execution_device_id : int, execut
 	try:
 		inference_session_providers = create_inference_session_providers(execution_device_id, execution_providers)
 		inference_session = InferenceSession(model_path, providers = inference_session_providers)
+		INFERENCE_SESSION_LIMITER_SET[id(inference_session)] = create_inference_session_limiter(model_file_name)
+
+		if profiler.is_profiling():
+			inference_session.run = profiler.create_profile_wrapper('inference.' + model_file_name, inference_session.run) #type:ignore[method-assign]
 		logger.debug(translator.get('loading_model_succeeded').format(model_name = model_file_name, seconds = calculate_end_time(start_time)), __name__)
 		return inference_session
 
@@ -82,6 +101,120 @@ def create_inference_session(model_path : str, execution_device_id : int, execut
 		fatal_exit(1)
 
 
+@contextmanager
+def bind_execution_device() -> Iterator[int]:
+	execution_device_id = select_execution_device_id(state_manager.get_item('execution_device_ids'))
+
+	with thread_lock():
+		EXECUTION_DEVICE_LOAD['in_flight_loads'][execution_device_id] = EXECUTION_DEVICE_LOAD.get('in_flight_loads').get(execution_device_id, 0) + 1
+	EXECUTION_DEVICE_AFFINITY.execution_device_id = execution_device_id
+
+	try:
+		yield execution_device_id
+	finally:
+		EXECUTION_DEVICE_AFFINITY.execution_device_id = None
+
+		with thread_lock():
+			EXECUTION_DEVICE_LOAD['in_flight_loads'][execution_device_id] -= 1
+
+
+@contextmanager
+def pin_execution_device(execution_device_id : int) -> Iterator[int]:
+	pinned_execution_device_id = getattr(EXECUTION_DEVICE_AFFINITY, 'execution_device_id', None)
+	EXECUTION_DEVICE_AFFINITY.execution_device_id = execution_device_id
+
+	try:
+		yield execution_device_id
+	finally:
+		EXECUTION_DEVICE_AFFINITY.execution_device_id = pinned_execution_device_id
+
+
+def get_execution_device_id(execution_device_ids : List[int]) -> int:
+	execution_device_id = getattr(EXECUTION_DEVICE_AFFINITY, 'execution_device_id', None)
+
+	if execution_device_id in execution_device_ids:
+		return execution_device_id
+	return select_execution_device_id(execution_device_ids)
+
+
+def select_execution_device_id(execution_device_ids : List[int]) -> int:
+	with thread_lock():
+		request_total = EXECUTION_DEVICE_LOAD.get('request_total')
+		EXECUTION_DEVICE_LOAD['request_total'] += 1
+		execution_device_ids = execution_device_ids[request_total % len(execution_device_ids):] + execution_device_ids[:request_total % len(execution_device_ids)]
+
+		if state_manager.get_item('execution_device_scheduler') == 'least-outstanding':
+			return min(execution_device_ids, key = lambda execution_device_id: EXECUTION_DEVICE_LOAD.get('in_flight_loads').get(execution_device_id, 0))
+		return execution_device_ids[0]
+
+
+def get_execution_device_loads() -> Dict[int, int]:
+	return EXECUTION_DEVICE_LOAD.get('in_flight_loads').copy()
+
+
+def create_inference_session_limiter(model_name : str) -> InferenceSessionLimiter:
+	execution_session_concurrency = state_manager.get_item('execution_session_concurrency') or 1
+
+	return\
+	{
+		'model_name': model_name,
+		'semaphore': threading.BoundedSemaphore(execution_session_concurrency)
+	}
+
+
+@contextmanager
+def session_semaphore(inference_session : InferenceSession) -> Iterator[None]:
+	with thread_lock():
+		inference_session_limiter = INFERENCE_SESSION_LIMITER_SET.get(id(inference_session))
+
+		if not inference_session_limiter:
+			inference_session_limiter = create_inference_session_limiter('unknown')
+			INFERENCE_SESSION_LIMITER_SET[id(inference_session)] = inference_session_limiter
+	model_name = inference_session_limiter.get('model_name')
+	wait_start_time = perf_counter()
+
+	with inference_session_limiter.get('semaphore'), conditional_thread_semaphore():
+		run_start_time = perf_counter()
+
+		try:
+			yield
+		finally:
+			run_end_time = perf_counter()
+
+			with thread_lock():
+				inference_session_metric = INFERENCE_SESSION_METRIC_SET.setdefault(model_name,
+				{
+					'wait_time': 0.0,
+					'run_time': 0.0,
+					'run_total': 0
+				})
+				inference_session_metric['wait_time'] += run_start_time - wait_start_time
+				inference_session_metric['run_time'] += run_end_time - run_start_time
+				inference_session_metric['run_total'] += 1
+
+
+def get_inference_session_metrics() -> Dict[str, InferenceSessionMetric]:
+	inference_session_metrics : Dict[str, InferenceSessionMetric] = {}
+
+	with thread_lock():
+		for model_name, inference_session_metric in INFERENCE_SESSION_METRIC_SET.items():
+			inference_session_metrics[model_name] = inference_session_metric.copy()
+
+	return inference_session_metrics
+
+
+def clear_inference_session_metrics() -> None:
+	with thread_lock():
+		INFERENCE_SESSION_METRIC_SET.clear()
+
+
+def has_batch_support(inference_session : InferenceSession) -> bool:
+	for session_input in inference_session.get_inputs():
+		if isinstance(session_input.shape[0], int):
+			return False
+	return True
+
+
 def get_inference_context(module_name : str, model_names : List[str], execution_device_id : int, execution_providers : List[ExecutionProvider]) -> str:
 	inference_context = '.'.join([ module_name ] + model_names + [ str(execution_device_id) ] + list(execution_providers))
 	return inference_context
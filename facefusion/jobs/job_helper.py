@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from facefusion.filesystem import get_file_extension, get_file_name
 
@@ -18,5 +18,26 @@ def get_step_output_path(job_id : str, step_index : int, output_path : str) -> O
 	return None
 
 
+def get_step_lease_id(job_id : str, step_index : int) -> str:
+	return job_id + '.' + str(step_index)
+
+
 def suggest_job_id(job_prefix : str = 'job') -> str:
 	return job_prefix + '-' + datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+
+
+def create_segment_ranges(trim_frame_start : int, trim_frame_end : int, segment_frame_total : int, keyframe_numbers : List[int]) -> List[Tuple[int, int]]:
+	segment_ranges = []
+	segment_frame_start = trim_frame_start
+
+	while trim_frame_end - segment_frame_start > segment_frame_total:
+		segment_frame_end = segment_frame_start + segment_frame_total
+		keyframe_candidates = [ keyframe_number for keyframe_number in keyframe_numbers if segment_frame_start < keyframe_number < trim_frame_end - segment_frame_total // 2 and abs(keyframe_number - segment_frame_end) <= segment_frame_total // 2 ]
+
+		if keyframe_candidates:
+			segment_frame_end = min(keyframe_candidates, key = lambda keyframe_number: abs(keyframe_number - segment_frame_end))
+		segment_ranges.append((segment_frame_start, segment_frame_end))
+		segment_frame_start = segment_frame_end
+
+	segment_ranges.append((segment_frame_start, trim_frame_end))
+	return segment_ranges
@@ -0,0 +1,131 @@
+import os
+import threading
+from contextlib import contextmanager
+from time import sleep
+from typing import Iterator, Optional
+
+from facefusion import logger, process_manager, translator
+from facefusion.filesystem import create_directory, remove_file
+from facefusion.jobs import job_manager
+
+LEASE_DURATION : int = 60
+LEASE_INTERVAL : int = 15
+LEASE_DELAY : float = 0.1
+
+
+def claim_lease(job_id : str, worker_id : str) -> bool:
+	lease_path = get_lease_path(job_id)
+
+	if create_directory(os.path.dirname(lease_path)):
+		if is_lease_expired(lease_path):
+			reclaim_lease(job_id, worker_id)
+
+		try:
+			lease_descriptor = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+		except FileExistsError:
+			return False
+
+		with os.fdopen(lease_descriptor, 'w') as lease_file:
+			lease_file.write(worker_id)
+		return True
+	return False
+
+
+def renew_lease(job_id : str, worker_id : str) -> bool:
+	lease_path = get_lease_path(job_id)
+
+	if read_lease(job_id) == worker_id:
+		os.utime(lease_path)
+		return True
+	return False
+
+
+def release_lease(job_id : str, worker_id : str) -> bool:
+	lease_path = get_lease_path(job_id)
+
+	if read_lease(job_id) == worker_id:
+		return remove_file(lease_path)
+	return False
+
+
+def reclaim_lease(job_id : str, worker_id : str) -> bool:
+	lease_path = get_lease_path(job_id)
+	stale_lease_path = lease_path + '.' + worker_id + '-' + str(os.getpid())
+
+	try:
+		os.rename(lease_path, stale_lease_path)
+	except FileNotFoundError:
+		return False
+
+	if is_lease_expired(stale_lease_path):
+		return remove_file(stale_lease_path)
+
+	try:
+		os.link(stale_lease_path, lease_path)
+	except OSError:
+		pass
+	remove_file(stale_lease_path)
+	return False
+
+
+def read_lease(job_id : str) -> Optional[str]:
+	lease_path = get_lease_path(job_id)
+
+	try:
+		with open(lease_path) as lease_file:
+			return lease_file.read()
+	except FileNotFoundError:
+		return None
+
+
+def is_lease_expired(lease_path : str) -> bool:
+	try:
+		return get_lease_time(os.path.dirname(lease_path)) - os.path.getmtime(lease_path) > LEASE_DURATION
+	except FileNotFoundError:
+		return False
+
+
+def get_lease_time(leases_path : str) -> float:
+	probe_path = os.path.join(leases_path, 'probe-' + str(os.getpid()) + '-' + str(threading.get_ident()))
+
+	with open(probe_path, 'w'):
+		os.utime(probe_path)
+
+	probe_time = os.path.getmtime(probe_path)
+	remove_file(probe_path)
+	return probe_time
+
+
+def get_lease_path(job_id : str) -> str:
+	return os.path.join(job_manager.JOBS_PATH, 'leases', job_id + '.lease')
+
+
+@contextmanager
+def keep_lease(job_id : str, worker_id : str) -> Iterator[None]:
+	lease_event = threading.Event()
+	lease_thread = threading.Thread(target = heartbeat_lease, args = (job_id, worker_id, lease_event), daemon = True)
+	lease_thread.start()
+
+	try:
+		yield
+	finally:
+		lease_event.set()
+		lease_thread.join()
+		release_lease(job_id, worker_id)
+
+
+@contextmanager
+def lock_lease(job_id : str, worker_id : str) -> Iterator[None]:
+	while not claim_lease(job_id, worker_id):
+		sleep(LEASE_DELAY)
+
+	with keep_lease(job_id, worker_id):
+		yield
+
+
+def heartbeat_lease(job_id : str, worker_id : str, lease_event : threading.Event) -> None:
+	while not lease_event.wait(LEASE_INTERVAL):
+		if not renew_lease(job_id, worker_id):
+			logger.warn(translator.get('job_lease_lost').format(job_id = job_id), __name__)
+			process_manager.stop()
+			break
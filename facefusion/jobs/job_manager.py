@@ -1,26 +1,33 @@
-import os
+import importlib
 from copy import copy
+from types import ModuleType
 from typing import List, Optional
 
 import facefusion.choices
-from facefusion.filesystem import create_directory, get_file_name, is_directory, is_file, move_file, remove_directory, remove_file, resolve_file_pattern
+from facefusion.filesystem import remove_directory
 from facefusion.jobs.job_helper import get_step_output_path
-from facefusion.json import read_json, write_json
 from facefusion.time_helper import get_current_date_time
-from facefusion.types import Args, Job, JobSet, JobStatus, JobStep, JobStepStatus
+from facefusion.types import Args, Job, JobSet, JobStatus, JobStep, JobStepStatus, JobStore
 
 JOBS_PATH : Optional[str] = None
+JOB_STORE : JobStore = 'json'
 
 
-def init_jobs(jobs_path : str) -> bool:
+def init_jobs(jobs_path : str, job_store : JobStore = 'json') -> bool:
 	global JOBS_PATH
+	global JOB_STORE
 
 	JOBS_PATH = jobs_path
-	job_status_paths = [ os.path.join(JOBS_PATH, job_status) for job_status in facefusion.choices.job_statuses ]
+	JOB_STORE = job_store
+	return get_job_store().init_jobs(JOBS_PATH)
 
-	for job_status_path in job_status_paths:
-		create_directory(job_status_path)
-	return all(is_directory(status_path) for status_path in job_status_paths)
+
+def get_job_store() -> ModuleType:
+	return load_job_store(JOB_STORE)
+
+
+def load_job_store(job_store : JobStore) -> ModuleType:
+	return importlib.import_module('facefusion.jobs.stores.' + job_store + '_store')
 
 
 def clear_jobs(jobs_path : str) -> bool:
@@ -36,34 +43,40 @@ def create_job(job_id : str) -> bool:
 		'steps': []
 	}
 
-	return create_job_file(job_id, job)
+	return get_job_store().create_jobs(JOBS_PATH, { job_id: job }, 'drafted')
 
 
 def submit_job(job_id : str) -> bool:
-	drafted_job_ids = find_job_ids('drafted')
 	steps = get_steps(job_id)
 
-	if job_id in drafted_job_ids and steps:
-		return set_steps_status(job_id, 'queued') and move_job_file(job_id, 'queued')
+	if find_job_status(job_id) == 'drafted' and steps:
+		return transition_jobs([ job_id ], 'queued', 'queued')
 	return False
 
 
 def submit_jobs(halt_on_error : bool) -> bool:
 	drafted_job_ids = find_job_ids('drafted')
+	submit_job_ids = []
 	has_error = False
 
 	if drafted_job_ids:
 		for job_id in drafted_job_ids:
-			if not submit_job(job_id):
+			if not get_steps(job_id):
 				has_error = True
 				if halt_on_error:
-					return False
-		return not has_error
+					break
+			else:
+				submit_job_ids.append(job_id)
+		return transition_jobs(submit_job_ids, 'queued', 'queued') and not has_error
 	return False
 
 
+def transition_jobs(job_ids : List[str], job_status : JobStatus, step_status : Optional[JobStepStatus]) -> bool:
+	return get_job_store().transition_jobs(JOBS_PATH, job_ids, job_status, step_status)
+
+
 def delete_job(job_id : str) -> bool:
-	return delete_job_file(job_id)
+	return get_job_store().delete_job(JOBS_PATH, job_id)
 
 
 def delete_jobs(halt_on_error : bool) -> bool:
@@ -90,15 +103,11 @@ def find_jobs(job_status : JobStatus) -> JobSet:
 
 
 def find_job_ids(job_status : JobStatus) -> List[str]:
-	job_pattern = os.path.join(JOBS_PATH, job_status, '*.json')
-	job_paths = resolve_file_pattern(job_pattern)
-	job_paths.sort(key = os.path.getmtime)
-	job_ids = []
+	return get_job_store().find_job_ids(JOBS_PATH, job_status)
+
 
-	for job_path in job_paths:
-		job_id = get_file_name(job_path)
-		job_ids.append(job_id)
-	return job_ids
+def find_job_status(job_id : str) -> Optional[JobStatus]:
+	return get_job_store().find_job_status(JOBS_PATH, job_id)
 
 
 def validate_job(job_id : str) -> bool:
@@ -184,14 +193,7 @@ def count_step_total(job_id : str) -> int:
 
 
 def set_step_status(job_id : str, step_index : int, step_status : JobStepStatus) -> bool:
-	job = read_job_file(job_id)
-
-	if job:
-		steps = job.get('steps')
-		if has_step(job_id, step_index):
-			steps[step_index]['status'] = step_status
-			return update_job_file(job_id, job)
-	return False
+	return get_job_store().set_step_status(JOBS_PATH, job_id, step_index, step_status)
 
 
 def set_steps_status(job_id : str, step_status : JobStepStatus) -> bool:
@@ -205,61 +207,29 @@ def set_steps_status(job_id : str, step_status : JobStepStatus) -> bool:
 
 
 def read_job_file(job_id : str) -> Optional[Job]:
-	job_path = find_job_path(job_id)
-	return read_json(job_path) #type:ignore[return-value]
-
-
-def create_job_file(job_id : str, job : Job) -> bool:
-	job_path = find_job_path(job_id)
-
-	if not is_file(job_path):
-		job_create_path = suggest_job_path(job_id, 'drafted')
-		return write_json(job_create_path, job) #type:ignore[arg-type]
-	return False
+	return get_job_store().read_job(JOBS_PATH, job_id)
 
 
 def update_job_file(job_id : str, job : Job) -> bool:
-	job_path = find_job_path(job_id)
-
-	if is_file(job_path):
-		job['date_updated'] = get_current_date_time().isoformat()
-		return write_json(job_path, job) #type:ignore[arg-type]
-	return False
+	return get_job_store().update_job(JOBS_PATH, job_id, job)
 
 
 def move_job_file(job_id : str, job_status : JobStatus) -> bool:
-	job_path = find_job_path(job_id)
-	job_move_path = suggest_job_path(job_id, job_status)
-	return move_file(job_path, job_move_path)
-
-
-def delete_job_file(job_id : str) -> bool:
-	job_path = find_job_path(job_id)
-	return remove_file(job_path)
+	return transition_jobs([ job_id ], job_status, None)
 
 
-def suggest_job_path(job_id : str, job_status : JobStatus) -> Optional[str]:
-	job_file_name = get_job_file_name(job_id)
+def migrate_jobs(jobs_path : str, job_store : JobStore) -> bool:
+	source_job_store = load_job_store('json')
+	target_job_store = load_job_store(job_store)
 
-	if job_file_name:
-		return os.path.join(JOBS_PATH, job_status, job_file_name)
-	return None
-
-
-def find_job_path(job_id : str) -> Optional[str]:
-	job_file_name = get_job_file_name(job_id)
-
-	if job_file_name:
+	if job_store != 'json' and target_job_store.init_jobs(jobs_path):
 		for job_status in facefusion.choices.job_statuses:
-			job_pattern = os.path.join(JOBS_PATH, job_status, job_file_name)
-			job_paths = resolve_file_pattern(job_pattern)
-
-			for job_path in job_paths:
-				return job_path
-	return None
-
-
-def get_job_file_name(job_id : str) -> Optional[str]:
-	if job_id:
-		return job_id + '.json'
-	return None
+			job_set : JobSet = {}
+
+			for job_id in source_job_store.find_job_ids(jobs_path, job_status):
+				if not target_job_store.find_job_status(jobs_path, job_id):
+					job_set[job_id] = source_job_store.read_job(jobs_path, job_id)
+			if not target_job_store.create_jobs(jobs_path, job_set, job_status):
+				return False
+		return True
+	return False
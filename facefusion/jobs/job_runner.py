@@ -1,15 +1,20 @@
+import multiprocessing
 import os
+import signal
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from facefusion import args_store, logger, state_manager, translator
+from facefusion.exit_helper import signal_exit
 from facefusion.ffmpeg import concat_video
-from facefusion.filesystem import are_images, are_videos, copy_file, create_directory, is_directory, is_file, move_directory, move_file, remove_directory, remove_file, resolve_file_paths
-from facefusion.jobs import job_helper, job_manager
-from facefusion.types import JobOutputSet, JobStep, ProcessStep
+from facefusion.filesystem import are_images, are_videos, copy_file, create_directory, is_directory, is_file, move_file, remove_directory, remove_file, resolve_file_paths
+from facefusion.jobs import job_helper, job_lease, job_manager
+from facefusion.types import Args, ArgumentStore, JobOutputSet, JobStep, JobStepStatus, JobStore, ProcessStep
 
 
 def run_job(job_id : str, process_step : ProcessStep) -> bool:
-	queued_job_ids = job_manager.find_job_ids('queued')
-
-	if job_id in queued_job_ids:
+	if job_manager.find_job_status(job_id) == 'queued':
 		if run_steps(job_id, process_step) and finalize_steps(job_id):
 			clean_steps(job_id)
 			return job_manager.move_job_file(job_id, 'completed')
@@ -18,11 +23,14 @@ def run_job(job_id : str, process_step : ProcessStep) -> bool:
 	return False
 
 
-def run_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
+def run_jobs(process_step : ProcessStep, halt_on_error : bool, job_workers : int = 1, worker_id : Optional[str] = None) -> bool:
 	queued_job_ids = job_manager.find_job_ids('queued')
 	has_error = False
 
 	if queued_job_ids:
+		if job_workers > 1 or worker_id:
+			return run_job_pool(queued_job_ids, process_step, halt_on_error, job_workers, worker_id or 'local')
+
 		for job_id in queued_job_ids:
 			if not run_job(job_id, process_step):
 				has_error = True
@@ -33,18 +41,20 @@ def run_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
 
 
 def retry_job(job_id : str, process_step : ProcessStep) -> bool:
-	failed_job_ids = job_manager.find_job_ids('failed')
-
-	if job_id in failed_job_ids:
-		return job_manager.set_steps_status(job_id, 'queued') and job_manager.move_job_file(job_id, 'queued') and run_job(job_id, process_step)
+	if job_manager.find_job_status(job_id) == 'failed':
+		return job_manager.transition_jobs([ job_id ], 'queued', 'queued') and run_job(job_id, process_step)
 	return False
 
 
-def retry_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
+def retry_jobs(process_step : ProcessStep, halt_on_error : bool, job_workers : int = 1, worker_id : Optional[str] = None) -> bool:
 	failed_job_ids = job_manager.find_job_ids('failed')
 	has_error = False
 
 	if failed_job_ids:
+		if job_workers > 1 or worker_id:
+			requeued_job_ids = [ job_id for job_id in failed_job_ids if requeue_job(job_id, worker_id or 'local') ]
+			return run_job_pool(requeued_job_ids, process_step, halt_on_error, job_workers, worker_id or 'local')
+
 		for job_id in failed_job_ids:
 			if not retry_job(job_id, process_step):
 				has_error = True
@@ -54,20 +64,160 @@ def retry_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
 	return False
 
 
-def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
-	step_args = step.get('args')
+def requeue_job(job_id : str, worker_id : str) -> bool:
+	with job_lease.lock_lease(job_id, worker_id):
+		if job_manager.find_job_status(job_id) == 'failed':
+			return job_manager.transition_jobs([ job_id ], 'queued', 'queued')
+	return job_manager.find_job_status(job_id) == 'queued'
+
+
+def run_job_pool(job_ids : List[str], process_step : ProcessStep, halt_on_error : bool, job_workers : int, worker_id : str) -> bool:
+	step_futures : Dict[Future[bool], Tuple[str, int]] = {}
+	submitted_steps : Set[Tuple[str, int]] = set()
+	has_error = False
+
+	with ProcessPoolExecutor(max_workers = job_workers, mp_context = multiprocessing.get_context('spawn'), initializer = init_job_worker, initargs = (job_manager.JOBS_PATH, job_manager.JOB_STORE, dict(state_manager.get_state()), args_store.ARGUMENT_STORE)) as executor:
+		for job_id in job_ids:
+			submit_steps(executor, job_id, process_step, worker_id, step_futures, submitted_steps)
+
+		while step_futures:
+			done_futures, _ = wait(step_futures, return_when = FIRST_COMPLETED)
+
+			for future in done_futures:
+				job_id, step_index = step_futures.pop(future)
+
+				if future.cancelled():
+					continue
 
-	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
-		output_path = step_args.get('output_path')
-		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
+				if resolve_step(future, job_id, step_index, worker_id):
+					submit_steps(executor, job_id, process_step, worker_id, step_futures, submitted_steps)
+				else:
+					has_error = True
+					if halt_on_error:
+						for step_future in step_futures:
+							step_future.cancel()
 
-		if is_directory(output_path):
-			return move_directory(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
-		return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
+				if job_id not in [ pending_job_id for pending_job_id, _ in step_futures.values() ] and not conclude_job(job_id, worker_id):
+					has_error = True
+
+	for job_id in job_ids:
+		if job_id not in [ submitted_job_id for submitted_job_id, _ in submitted_steps ] and not conclude_job(job_id, worker_id):
+			has_error = True
+	return not has_error
+
+
+def submit_steps(executor : ProcessPoolExecutor, job_id : str, process_step : ProcessStep, worker_id : str, step_futures : Dict[Future[bool], Tuple[str, int]], submitted_steps : Set[Tuple[str, int]]) -> None:
+	for step_index in collect_ready_step_indices(job_id):
+		if (job_id, step_index) not in submitted_steps:
+			try:
+				step_futures[executor.submit(run_leased_step, job_id, step_index, process_step, worker_id)] = (job_id, step_index)
+			except BrokenProcessPool:
+				return
+			submitted_steps.add((job_id, step_index))
+
+
+def resolve_step(future : Future[bool], job_id : str, step_index : int, worker_id : str) -> bool:
+	step_lease_id = job_helper.get_step_lease_id(job_id, step_index)
+
+	try:
+		return future.result()
+	except BrokenProcessPool:
+		if job_lease.read_lease(step_lease_id) == worker_id:
+			job_lease.release_lease(step_lease_id, worker_id)
+			transition_step(job_id, step_index, [ 'started' ], 'failed', worker_id)
+			logger.error(translator.get('job_worker_lost').format(job_id = job_id, step_index = step_index), __name__)
+	return False
+
+
+def init_job_worker(jobs_path : str, job_store : JobStore, state : Dict[str, Any], argument_store : ArgumentStore) -> None:
+	signal.signal(signal.SIGINT, signal_exit)
+	args_store.ARGUMENT_STORE.update(argument_store)
+
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	logger.init(state_manager.get_item('log_level'))
+	job_manager.init_jobs(jobs_path, job_store)
+
+
+def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
+	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, prepare_step_args(job_id, step_index, step)):
+		return job_manager.set_step_status(job_id, step_index, 'completed')
 	job_manager.set_step_status(job_id, step_index, 'failed')
 	return False
 
 
+def run_leased_step(job_id : str, step_index : int, process_step : ProcessStep, worker_id : str) -> bool:
+	step_lease_id = job_helper.get_step_lease_id(job_id, step_index)
+
+	if job_lease.claim_lease(step_lease_id, worker_id):
+		with job_lease.keep_lease(step_lease_id, worker_id):
+			if transition_step(job_id, step_index, [ 'queued', 'started' ], 'started', worker_id):
+				step = job_manager.get_steps(job_id)[step_index]
+
+				if process_step(job_id, step_index, prepare_step_args(job_id, step_index, step)):
+					return transition_step(job_id, step_index, [ 'started' ], 'completed', worker_id)
+				transition_step(job_id, step_index, [ 'started' ], 'failed', worker_id)
+				return False
+		return True
+
+	logger.info(translator.get('job_step_leased').format(job_id = job_id, step_index = step_index), __name__)
+	return True
+
+
+def transition_step(job_id : str, step_index : int, step_statuses : List[JobStepStatus], next_step_status : JobStepStatus, worker_id : str) -> bool:
+	with job_lease.lock_lease(job_id, worker_id):
+		steps = job_manager.get_steps(job_id)
+
+		if step_index in range(len(steps)) and steps[step_index].get('status') in step_statuses:
+			return job_manager.set_step_status(job_id, step_index, next_step_status)
+	return False
+
+
+def conclude_job(job_id : str, worker_id : str) -> bool:
+	with job_lease.lock_lease(job_id, worker_id):
+		if job_manager.find_job_status(job_id) == 'queued':
+			step_statuses = [ step.get('status') for step in job_manager.get_steps(job_id) ]
+
+			if all(step_status == 'completed' for step_status in step_statuses):
+				if finalize_steps(job_id):
+					clean_steps(job_id)
+					return job_manager.move_job_file(job_id, 'completed')
+				clean_steps(job_id)
+				job_manager.move_job_file(job_id, 'failed')
+				return False
+
+			if 'failed' in step_statuses:
+				clean_steps(job_id)
+				job_manager.move_job_file(job_id, 'failed')
+				return False
+	return True
+
+
+def prepare_step_args(job_id : str, step_index : int, step : JobStep) -> Args:
+	step_args = step.get('args').copy()
+	step_args['output_path'] = job_helper.get_step_output_path(job_id, step_index, step_args.get('output_path'))
+	return step_args
+
+
+def collect_ready_step_indices(job_id : str) -> List[int]:
+	steps = job_manager.get_steps(job_id)
+	step_indices = []
+
+	for step_index, step in enumerate(steps):
+		if step.get('status') in [ 'queued', 'started' ] and is_step_ready(job_id, steps, step_index):
+			step_indices.append(step_index)
+	return step_indices
+
+
+def is_step_ready(job_id : str, steps : List[JobStep], step_index : int) -> bool:
+	target_path = steps[step_index].get('args').get('target_path')
+
+	for index, step in enumerate(steps[:step_index]):
+		if job_helper.get_step_output_path(job_id, index, step.get('args').get('output_path')) == target_path:
+			return step.get('status') == 'completed'
+	return True
+
+
 def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	steps = job_manager.get_steps(job_id)
 
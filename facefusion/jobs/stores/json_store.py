@@ -0,0 +1,101 @@
+import os
+from typing import List, Optional
+
+import facefusion.choices
+from facefusion.filesystem import create_directory, get_file_name, is_directory, is_file, move_file, remove_file, resolve_file_pattern
+from facefusion.json import read_json, write_json
+from facefusion.time_helper import get_current_date_time
+from facefusion.types import Job, JobSet, JobStatus, JobStepStatus
+
+
+def init_jobs(jobs_path : str) -> bool:
+	job_status_paths = [ os.path.join(jobs_path, job_status) for job_status in facefusion.choices.job_statuses ]
+
+	for job_status_path in job_status_paths:
+		create_directory(job_status_path)
+	return all(is_directory(status_path) for status_path in job_status_paths)
+
+
+def find_job_ids(jobs_path : str, job_status : JobStatus) -> List[str]:
+	job_pattern = os.path.join(jobs_path, job_status, '*.json')
+	job_paths = resolve_file_pattern(job_pattern)
+	job_paths.sort(key = os.path.getmtime)
+	job_ids = []
+
+	for job_path in job_paths:
+		job_id = get_file_name(job_path)
+		job_ids.append(job_id)
+	return job_ids
+
+
+def find_job_status(jobs_path : str, job_id : str) -> Optional[JobStatus]:
+	if job_id:
+		for job_status in facefusion.choices.job_statuses:
+			if is_file(suggest_job_path(jobs_path, job_id, job_status)):
+				return job_status
+	return None
+
+
+def read_job(jobs_path : str, job_id : str) -> Optional[Job]:
+	job_path = find_job_path(jobs_path, job_id)
+	return read_json(job_path) #type:ignore[return-value]
+
+
+def create_jobs(jobs_path : str, job_set : JobSet, job_status : JobStatus) -> bool:
+	for job_id, job in job_set.items():
+		if find_job_path(jobs_path, job_id) or not write_json(suggest_job_path(jobs_path, job_id, job_status), job): #type:ignore[arg-type]
+			return False
+	return True
+
+
+def update_job(jobs_path : str, job_id : str, job : Job) -> bool:
+	job_path = find_job_path(jobs_path, job_id)
+
+	if job_path:
+		job['date_updated'] = get_current_date_time().isoformat()
+		return write_json(job_path, job) #type:ignore[arg-type]
+	return False
+
+
+def set_step_status(jobs_path : str, job_id : str, step_index : int, step_status : JobStepStatus) -> bool:
+	job = read_job(jobs_path, job_id)
+
+	if job and step_index in range(len(job.get('steps'))):
+		job.get('steps')[step_index]['status'] = step_status
+		return update_job(jobs_path, job_id, job)
+	return False
+
+
+def transition_jobs(jobs_path : str, job_ids : List[str], job_status : JobStatus, step_status : Optional[JobStepStatus]) -> bool:
+	for job_id in job_ids:
+		job = read_job(jobs_path, job_id)
+
+		if not job:
+			return False
+
+		if step_status:
+			for step in job.get('steps'):
+				step['status'] = step_status
+			if not update_job(jobs_path, job_id, job):
+				return False
+
+		if not move_file(find_job_path(jobs_path, job_id), suggest_job_path(jobs_path, job_id, job_status)):
+			return False
+	return True
+
+
+def delete_job(jobs_path : str, job_id : str) -> bool:
+	job_path = find_job_path(jobs_path, job_id)
+	return remove_file(job_path)
+
+
+def suggest_job_path(jobs_path : str, job_id : str, job_status : JobStatus) -> str:
+	return os.path.join(jobs_path, job_status, job_id + '.json')
+
+
+def find_job_path(jobs_path : str, job_id : str) -> Optional[str]:
+	job_status = find_job_status(jobs_path, job_id)
+
+	if job_status:
+		return suggest_job_path(jobs_path, job_id, job_status)
+	return None
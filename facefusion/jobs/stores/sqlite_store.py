@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Optional
+
+from facefusion.filesystem import create_directory, is_file, is_network_directory
+from facefusion.time_helper import get_current_date_time
+from facefusion.types import Job, JobSet, JobStatus, JobStepStatus
+
+
+def init_jobs(jobs_path : str) -> bool:
+	if create_directory(jobs_path):
+		with open_job_store(jobs_path) as job_store:
+			job_store.execute('PRAGMA journal_mode = ' + resolve_journal_mode(jobs_path))
+			job_store.execute('CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, job_status TEXT NOT NULL, job_sequence INTEGER NOT NULL, version TEXT NOT NULL, date_created TEXT NOT NULL, date_updated TEXT)')
+			job_store.execute('CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (job_status, job_sequence)')
+			job_store.execute('CREATE INDEX IF NOT EXISTS jobs_by_sequence ON jobs (job_sequence)')
+			job_store.execute('CREATE TABLE IF NOT EXISTS steps (job_id TEXT NOT NULL REFERENCES jobs (job_id) ON DELETE CASCADE, step_index INTEGER NOT NULL, step_args TEXT NOT NULL, step_status TEXT NOT NULL, PRIMARY KEY (job_id, step_index))')
+		return is_file(get_job_store_path(jobs_path))
+	return False
+
+
+def resolve_journal_mode(jobs_path : str) -> str:
+	if is_network_directory(jobs_path):
+		return 'DELETE'
+	return 'WAL'
+
+
+@contextmanager
+def open_job_store(jobs_path : str) -> Iterator[sqlite3.Connection]:
+	with closing(sqlite3.connect(get_job_store_path(jobs_path), timeout = 30)) as job_store:
+		job_store.execute('PRAGMA foreign_keys = ON')
+		job_store.execute('PRAGMA synchronous = NORMAL')
+
+		with job_store:
+			yield job_store
+
+
+def get_job_store_path(jobs_path : str) -> str:
+	return os.path.join(jobs_path, 'jobs.db')
+
+
+def find_job_ids(jobs_path : str, job_status : JobStatus) -> List[str]:
+	with open_job_store(jobs_path) as job_store:
+		rows = job_store.execute('SELECT job_id FROM jobs WHERE job_status = ? ORDER BY job_sequence', (job_status,)).fetchall()
+	return [ row[0] for row in rows ]
+
+
+def find_job_status(jobs_path : str, job_id : str) -> Optional[JobStatus]:
+	with open_job_store(jobs_path) as job_store:
+		row = job_store.execute('SELECT job_status FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+
+	if row:
+		return row[0]
+	return None
+
+
+def read_job(jobs_path : str, job_id : str) -> Optional[Job]:
+	with open_job_store(jobs_path) as job_store:
+		row = job_store.execute('SELECT version, date_created, date_updated FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+		step_rows = job_store.execute('SELECT step_args, step_status FROM steps WHERE job_id = ? ORDER BY step_index', (job_id,)).fetchall()
+
+	if row:
+		version, date_created, date_updated = row
+		job : Job =\
+		{
+			'version': version,
+			'date_created': date_created,
+			'date_updated': date_updated,
+			'steps': [ { 'args': json.loads(step_args), 'status': step_status } for step_args, step_status in step_rows ]
+		}
+		return job
+	return None
+
+
+def create_jobs(jobs_path : str, job_set : JobSet, job_status : JobStatus) -> bool:
+	try:
+		with open_job_store(jobs_path) as job_store:
+			for job_id, job in job_set.items():
+				job_store.execute('INSERT INTO jobs VALUES (?, ?, (SELECT IFNULL(MAX(job_sequence), 0) + 1 FROM jobs), ?, ?, ?)', (job_id, job_status, job.get('version'), job.get('date_created'), job.get('date_updated')))
+				write_steps(job_store, job_id, job)
+		return True
+	except sqlite3.IntegrityError:
+		return False
+
+
+def update_job(jobs_path : str, job_id : str, job : Job) -> bool:
+	job['date_updated'] = get_current_date_time().isoformat()
+
+	with open_job_store(jobs_path) as job_store:
+		if touch_job(job_store, job_id, job.get('date_updated')):
+			job_store.execute('DELETE FROM steps WHERE job_id = ?', (job_id,))
+			write_steps(job_store, job_id, job)
+			return True
+	return False
+
+
+def set_step_status(jobs_path : str, job_id : str, step_index : int, step_status : JobStepStatus) -> bool:
+	with open_job_store(jobs_path) as job_store:
+		if job_store.execute('UPDATE steps SET step_status = ? WHERE job_id = ? AND step_index = ?', (step_status, job_id, step_index)).rowcount:
+			return touch_job(job_store, job_id, get_current_date_time().isoformat())
+	return False
+
+
+def transition_jobs(jobs_path : str, job_ids : List[str], job_status : JobStatus, step_status : Optional[JobStepStatus]) -> bool:
+	with open_job_store(jobs_path) as job_store:
+		for job_id in job_ids:
+			if step_status:
+				job_store.execute('UPDATE steps SET step_status = ? WHERE job_id = ?', (step_status, job_id))
+
+				if not touch_job(job_store, job_id, get_current_date_time().isoformat()):
+					job_store.rollback()
+					return False
+
+			if not job_store.execute('UPDATE jobs SET job_status = ? WHERE job_id = ?', (job_status, job_id)).rowcount:
+				job_store.rollback()
+				return False
+	return True
+
+
+def delete_job(jobs_path : str, job_id : str) -> bool:
+	with open_job_store(jobs_path) as job_store:
+		return job_store.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,)).rowcount > 0
+
+
+def touch_job(job_store : sqlite3.Connection, job_id : str, date_updated : str) -> bool:
+	return job_store.execute('UPDATE jobs SET job_sequence = (SELECT MAX(job_sequence) + 1 FROM jobs), date_updated = ? WHERE job_id = ?', (date_updated, job_id)).rowcount > 0
+
+
+def write_steps(job_store : sqlite3.Connection, job_id : str, job : Job) -> None:
+	job_store.executemany('INSERT INTO steps VALUES (?, ?, ?, ?)', [ (job_id, step_index, json.dumps(step.get('args')), step.get('status')) for step_index, step in enumerate(job.get('steps')) ])
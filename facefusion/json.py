@@ -1,10 +1,15 @@
 import json
+import os
+import tempfile
 from json import JSONDecodeError
 from typing import Optional
 
-from facefusion.filesystem import is_file
+from facefusion.filesystem import is_file, remove_file
 from facefusion.types import Content
 
+FILE_UMASK = os.umask(0)
+os.umask(FILE_UMASK)
+
 
 def read_json(json_path : str) -> Optional[Content]:
 	if is_file(json_path):
@@ -17,6 +22,13 @@ def read_json(json_path : str) -> Optional[Content]:
 
 
 def write_json(json_path : str, content : Content) -> bool:
-	with open(json_path, 'w') as json_file:
-		json.dump(content, json_file, indent = 4)
+	json_file = tempfile.NamedTemporaryFile('w', dir = os.path.dirname(os.path.abspath(json_path)), suffix = '.tmp', delete = False)
+
+	try:
+		with json_file:
+			json.dump(content, json_file, indent = 4)
+		os.chmod(json_file.name, 0o666 & ~FILE_UMASK)
+		os.replace(json_file.name, json_path)
+	finally:
+		remove_file(json_file.name)
 	return is_file(json_path)
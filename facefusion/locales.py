@@ -12,6 +12,7 @@ LOCALES : Locales =\
 		'extracting_frames': 'extracting frames with a resolution of {resolution} and {fps} frames per second',
 		'extracting_frames_succeeded': 'extracting frames succeeded',
 		'extracting_frames_failed': 'extracting frames failed',
+		'reusing_frames': 'reusing {frame_total} extracted frames',
 		'spawning_frames_succeeded': 'spawning frames succeeded',
 		'spawning_frames_failed': 'spawning frames failed',
 		'analysing': 'analysing',
@@ -31,13 +32,20 @@ LOCALES : Locales =\
 		'merging_video': 'merging video with a resolution of {resolution} and {fps} frames per second',
 		'merging_video_succeeded': 'merging video succeeded',
 		'merging_video_failed': 'merging video failed',
+		'piping_frames': 'piping frames with a resolution of {resolution} and {fps} frames per second',
+		'piping_frames_succeeded': 'piping frames succeeded',
+		'piping_frames_failed': 'piping frames failed',
 		'skipping_audio': 'skipping audio',
 		'replacing_audio_succeeded': 'replacing audio succeeded',
 		'replacing_audio_skipped': 'replacing audio skipped',
 		'restoring_audio_succeeded': 'restoring audio succeeded',
 		'restoring_audio_skipped': 'restoring audio skipped',
 		'clearing_temp': 'clearing temporary resources',
+		'keeping_temp': 'keeping temporary resources',
 		'processing_stopped': 'processing stopped',
+		'face_store_stats': 'face store holds {size} entries with a hit rate of {hit_rate}',
+		'writing_profile_trace_succeeded': 'profile trace written to {trace_path}',
+		'inference_session_stats': 'model {model_name} ran {run_total} times, waited {wait_time} seconds and ran {run_time} seconds',
 		'processing_image_succeeded': 'processing to image succeeded in {seconds} seconds',
 		'processing_image_failed': 'processing to image failed',
 		'processing_frames_succeeded': 'processing to frames succeeded in {seconds} seconds',
@@ -66,6 +74,8 @@ LOCALES : Locales =\
 		'job_not_deleted': 'job {job_id} not deleted',
 		'job_all_deleted': 'jobs deleted',
 		'job_all_not_deleted': 'jobs not deleted',
+		'jobs_migrated': 'jobs migrated to the {job_store} store',
+		'jobs_not_migrated': 'jobs not migrated to the {job_store} store',
 		'job_step_added': 'step added to job {job_id}',
 		'job_step_not_added': 'step not added to job {job_id}',
 		'job_remix_step_added': 'step {step_index} remixed from job {job_id}',
@@ -76,6 +86,10 @@ LOCALES : Locales =\
 		'job_step_not_removed': 'step {step_index} not removed from job {job_id}',
 		'running_job': 'running queued job {job_id}',
 		'running_jobs': 'running all queued jobs',
+		'limiting_job_workers': 'limiting job workers to {job_workers} due to the available resources',
+		'job_step_leased': 'skipping step {step_index} of job {job_id} claimed by another worker',
+		'job_worker_lost': 'worker processing step {step_index} of job {job_id} terminated abruptly',
+		'job_lease_lost': 'lease of job {job_id} was lost to another worker',
 		'retrying_job': 'retrying failed job {job_id}',
 		'retrying_jobs': 'retrying all failed jobs',
 		'processing_job_succeeded': 'processing of job {job_id} succeeded',
@@ -107,6 +121,7 @@ LOCALES : Locales =\
 			'config_path': 'choose the config file to override defaults',
 			'temp_path': 'specify the directory for the temporary resources',
 			'jobs_path': 'specify the directory to store jobs',
+			'job_store': 'choose the backend to store jobs',
 			'source_paths': 'choose the image or audio paths',
 			'target_path': 'choose the image or video path',
 			'output_path': 'specify the image or video within a directory',
@@ -118,6 +133,8 @@ LOCALES : Locales =\
 			'face_detector_margin': 'apply top, right, bottom and left margin to the frame',
 			'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 			'face_detector_score': 'filter the detected faces based on the confidence score',
+			'face_tracker': 'track the faces between key frames instead of detecting them on every frame',
+			'face_tracker_interval': 'specify the frame interval to detect the faces while tracking',
 			'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 			'face_landmarker_score': 'filter the detected face landmarks based on the confidence score',
 			'face_selector_mode': 'use reference based tracking or simple matching',
@@ -140,6 +157,7 @@ LOCALES : Locales =\
 			'trim_frame_start': 'specify the starting frame of the target video',
 			'trim_frame_end': 'specify the ending frame of the target video',
 			'temp_frame_format': 'specify the temporary resources format',
+			'temp_frame_mode': 'choose whether the video frames are written to disk or streamed through a pipe',
 			'output_image_quality': 'specify the image quality which translates to the image compression',
 			'output_image_scale': 'specify the image scale based on the target image',
 			'output_audio_encoder': 'specify the encoder used for the audio',
@@ -162,10 +180,21 @@ LOCALES : Locales =\
 			'api_port': 'specify the API port',
 			'execution_device_ids': 'specify the devices used for processing',
 			'execution_providers': 'inference using different providers (choices: {choices}, ...)',
+			'execution_device_scheduler': 'choose the strategy to distribute the frames across the devices',
+			'execution_worker_mode': 'choose whether the frames are processed by threads or processes',
 			'execution_thread_count': 'specify the amount of parallel threads while processing',
+			'execution_batch_size': 'specify the amount of frames processed in a single batch',
+			'execution_session_concurrency': 'specify the amount of parallel runs per inference session',
 			'video_memory_strategy': 'balance fast processing and low VRAM usage',
 			'log_level': 'adjust the message severity displayed in the terminal',
 			'halt_on_error': 'halt the program once an error occurred',
+			'job_workers': 'specify the amount of jobs processed in parallel',
+			'job_memory_budget': 'specify the memory in GB reserved per job worker (0 disables the check)',
+			'job_temp_budget': 'specify the temp disk space in GB reserved per job worker (0 disables the check)',
+			'worker_id': 'specify the worker id to lease jobs when several runners share the jobs path',
+			'segment_duration': 'split the target video into steps of the specified seconds aligned to keyframes',
+			'segment_count': 'split the target video into the specified amount of steps aligned to keyframes',
+			'profile': 'record the time spent per stage and write a trace next to the output',
 			'run': 'run the program',
 			'batch_run': 'run the program in batch mode',
 			'force_download': 'force automate downloads and exit',
@@ -187,7 +216,8 @@ LOCALES : Locales =\
 			'job_run': 'run a queued job',
 			'job_run_all': 'run all queued jobs',
 			'job_retry': 'retry a failed job',
-			'job_retry_all': 'retry all failed jobs'
+			'job_retry_all': 'retry all failed jobs',
+			'job_migrate': 'migrate the json jobs to the configured job store'
 		},
 		'about':
 		{
@@ -0,0 +1,105 @@
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from facefusion import ffprobe_builder
+from facefusion.ffprobe import run_ffprobe
+from facefusion.filesystem import is_file
+from facefusion.types import Fps, MediaProbe, Resolution
+
+
+def probe_media(media_path : str) -> Optional[MediaProbe]:
+	if is_file(media_path):
+		media_stat = os.stat(media_path)
+		return probe_static_media(media_path, media_stat.st_size, media_stat.st_mtime_ns)
+	return None
+
+
+@lru_cache(maxsize = 64)
+def probe_static_media(media_path : str, media_size : int, media_mtime : int) -> Optional[MediaProbe]:
+	commands = ffprobe_builder.chain(
+		ffprobe_builder.show_streams(),
+		ffprobe_builder.show_format(),
+		ffprobe_builder.format_to_json(),
+		ffprobe_builder.set_input(media_path)
+	)
+	process = run_ffprobe(commands)
+	output, _ = process.communicate()
+
+	if process.returncode == 0 and output:
+		return create_media_probe(json.loads(output))
+	return None
+
+
+def create_media_probe(probe_content : Dict[str, Any]) -> MediaProbe:
+	media_streams = probe_content.get('streams', [])
+	video_stream = get_media_stream(media_streams, 'video')
+	audio_stream = get_media_stream(media_streams, 'audio')
+	media_duration = float(probe_content.get('format', {}).get('duration') or 0)
+	media_probe : MediaProbe =\
+	{
+		'streams': [ media_stream.get('codec_type') for media_stream in media_streams ],
+		'duration': media_duration,
+		'fps': None,
+		'frame_total': 0,
+		'resolution': None,
+		'sample_rate': None,
+		'sample_total': None,
+		'channels': None
+	}
+
+	if video_stream:
+		video_duration = float(video_stream.get('duration') or media_duration)
+		video_fps = parse_frame_rate(video_stream.get('avg_frame_rate')) or parse_frame_rate(video_stream.get('r_frame_rate'))
+		media_probe['fps'] = video_fps
+		media_probe['resolution'] = parse_resolution(video_stream)
+
+		if video_stream.get('nb_frames'):
+			media_probe['frame_total'] = int(video_stream.get('nb_frames'))
+		elif video_fps:
+			media_probe['frame_total'] = round(video_duration * video_fps)
+
+	if audio_stream:
+		if not video_stream:
+			media_probe['duration'] = float(audio_stream.get('duration') or media_duration)
+
+		if audio_stream.get('sample_rate'):
+			media_probe['sample_rate'] = int(audio_stream.get('sample_rate'))
+			media_probe['sample_total'] = int(media_probe.get('duration') * media_probe.get('sample_rate'))
+		if audio_stream.get('channels'):
+			media_probe['channels'] = int(audio_stream.get('channels'))
+
+	return media_probe
+
+
+def get_media_stream(media_streams : List[Dict[str, Any]], codec_type : str) -> Optional[Dict[str, Any]]:
+	for media_stream in media_streams:
+		if media_stream.get('codec_type') == codec_type:
+			return media_stream
+	return None
+
+
+def parse_frame_rate(frame_rate : Optional[str]) -> Optional[Fps]:
+	if frame_rate and '/' in frame_rate:
+		numerator, denominator = map(float, frame_rate.split('/'))
+
+		if numerator > 0 and denominator > 0:
+			return numerator / denominator
+	return None
+
+
+def parse_resolution(video_stream : Dict[str, Any]) -> Optional[Resolution]:
+	width = int(video_stream.get('width') or 0)
+	height = int(video_stream.get('height') or 0)
+	rotation = int(video_stream.get('tags', {}).get('rotate') or 0)
+
+	for side_data in video_stream.get('side_data_list', []):
+		if 'rotation' in side_data:
+			rotation = int(side_data.get('rotation'))
+
+	if width > 0 and height > 0:
+		if abs(rotation) % 180 == 90:
+			return height, width
+		return width, height
+	return None
@@ -12,16 +12,16 @@ from facefusion.common_helper import create_int_metavar, is_macos
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import merge_matrix, paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_box_mask, create_occlusion_mask
+from facefusion.face_helper import blend_paste_area, merge_matrix, scale_face_landmark_5, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_box_mask, resolve_occlusion_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path
 from facefusion.processors.modules.age_modifier import choices as age_modifier_choices
 from facefusion.processors.modules.age_modifier.types import AgeModifierDirection, AgeModifierInputs
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
-from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.tensor_helper import normalize_vision_tensor, prepare_vision_tensor
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import match_frame_color, read_static_image, read_static_video_frame
 
 
@@ -146,7 +146,7 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def modify_age(target_face : Face, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
 	model_templates = get_model_options().get('templates')
 	model_sizes = get_model_options().get('sizes')
 	face_landmark_5 = target_face.landmark_set.get('5/68').copy()
@@ -161,7 +161,7 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	]
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
+		occlusion_mask = resolve_occlusion_mask(temp_vision_frame, face_landmark_5, affine_matrix, model_sizes.get('target'), analysis_context)
 		temp_matrix = merge_matrix([ extend_affine_matrix, cv2.invertAffineTransform(affine_matrix) ])
 		occlusion_mask = cv2.warpAffine(occlusion_mask, temp_matrix, model_sizes.get('target_with_background'))
 		crop_masks.append(occlusion_mask)
@@ -175,8 +175,8 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	extend_affine_matrix *= (model_sizes.get('target')[0] * 4) / model_sizes.get('target_with_background')[0]
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
 	crop_mask = cv2.resize(crop_mask, (model_sizes.get('target')[0] * 4, model_sizes.get('target')[1] * 4))
-	paste_vision_frame = paste_back(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix)
-	return paste_vision_frame
+	blend_paste_area(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix)
+	return temp_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame, age_modifier_direction : AgeModifierDirection) -> VisionFrame:
@@ -194,26 +194,19 @@ def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame,
 		if age_modifier_input.name == 'direction':
 			age_modifier_inputs[age_modifier_input.name] = age_modifier_direction
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(age_modifier):
 		crop_vision_frame = age_modifier.run(None, age_modifier_inputs)[0][0]
 
 	return crop_vision_frame
 
 
 def prepare_vision_frame(vision_frame : VisionFrame) -> VisionFrame:
-	vision_frame = vision_frame[:, :, ::-1] / 255.0
-	vision_frame = (vision_frame - 0.5) / 0.5
-	vision_frame = numpy.expand_dims(vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return vision_frame
+	return prepare_vision_tensor(vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ])
 
 
 def normalize_extend_frame(extend_vision_frame : VisionFrame) -> VisionFrame:
 	model_sizes = get_model_options().get('sizes')
-	extend_vision_frame = numpy.clip(extend_vision_frame, -1, 1)
-	extend_vision_frame = (extend_vision_frame + 1) / 2
-	extend_vision_frame = extend_vision_frame.transpose(1, 2, 0).clip(0, 255)
-	extend_vision_frame = (extend_vision_frame * 255.0)
-	extend_vision_frame = extend_vision_frame.astype(numpy.uint8)[:, :, ::-1]
+	extend_vision_frame = normalize_vision_tensor(extend_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ])
 	extend_vision_frame = cv2.resize(extend_vision_frame, (model_sizes.get('target')[0] * 4, model_sizes.get('target')[1] * 4), interpolation = cv2.INTER_AREA)
 	return extend_vision_frame
 
@@ -223,11 +216,14 @@ def process_frame(inputs : AgeModifierInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = modify_age(target_face, temp_vision_frame)
+			temp_vision_frame = modify_age(target_face, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
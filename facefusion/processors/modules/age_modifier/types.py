@@ -2,14 +2,15 @@ from typing import Any, Literal, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from facefusion.types import Mask, VisionFrame
+from facefusion.types import AnalysisContext, Mask, VisionFrame
 
 AgeModifierInputs = TypedDict('AgeModifierInputs',
 {
 	'reference_vision_frame' : VisionFrame,
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
-	'temp_vision_mask' : Mask
+	'temp_vision_mask' : Mask,
+	'analysis_context' : AnalysisContext
 })
 
 AgeModifierModel = Literal['styleganex_age']
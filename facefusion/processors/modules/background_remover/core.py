@@ -18,7 +18,7 @@ from facefusion.processors.modules.background_remover.types import BackgroundRem
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.sanitizer import sanitize_int_range
-from facefusion.thread_helper import thread_semaphore
+from facefusion.tensor_helper import prepare_vision_tensor
 from facefusion.types import ApplyStateItem, Args, DownloadScope, ExecutionProvider, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import read_static_image, read_static_video_frame
 
@@ -481,11 +481,24 @@ def remove_background(temp_vision_frame : VisionFrame) -> Tuple[VisionFrame, Mas
 	return temp_vision_frame, temp_vision_mask
 
 
+def remove_backgrounds(temp_vision_frames : List[VisionFrame]) -> List[Tuple[VisionFrame, Mask]]:
+	temp_vision_masks = forward_batch(numpy.concatenate([ prepare_temp_frame(temp_vision_frame) for temp_vision_frame in temp_vision_frames ]))
+	remove_outputs = []
+
+	for temp_vision_frame, temp_vision_mask in zip(temp_vision_frames, temp_vision_masks):
+		temp_vision_mask = normalize_vision_mask(temp_vision_mask)
+		temp_vision_mask = cv2.resize(temp_vision_mask, temp_vision_frame.shape[:2][::-1])
+		temp_vision_frame = apply_background_color(temp_vision_frame, temp_vision_mask)
+		remove_outputs.append((temp_vision_frame, temp_vision_mask))
+
+	return remove_outputs
+
+
 def forward(temp_vision_frame : VisionFrame) -> VisionFrame:
 	background_remover = get_inference_pool().get('background_remover')
 	model_name = state_manager.get_item('background_remover_model')
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(background_remover):
 		remove_vision_frame = background_remover.run(None,
 		{
 			'input': temp_vision_frame
@@ -497,17 +510,32 @@ def forward(temp_vision_frame : VisionFrame) -> VisionFrame:
 	return remove_vision_frame
 
 
+def forward_batch(temp_vision_frames : VisionFrame) -> VisionFrame:
+	background_remover = get_inference_pool().get('background_remover')
+	model_name = state_manager.get_item('background_remover_model')
+
+	if inference_manager.has_batch_support(background_remover):
+		with inference_manager.session_semaphore(background_remover):
+			remove_vision_frames = background_remover.run(None,
+			{
+				'input': temp_vision_frames
+			})[0]
+
+			if model_name == 'u2net_cloth':
+				remove_vision_frames = numpy.argmax(remove_vision_frames, axis = 1)
+
+		return remove_vision_frames
+
+	return numpy.concatenate([ forward(temp_vision_frame[numpy.newaxis]) for temp_vision_frame in temp_vision_frames ])
+
+
 def prepare_temp_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = get_model_options().get('size')
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
 
 	temp_vision_frame = cv2.resize(temp_vision_frame, model_size)
-	temp_vision_frame = temp_vision_frame[:, :, ::-1] / 255.0
-	temp_vision_frame = (temp_vision_frame - model_mean) / model_standard_deviation
-	temp_vision_frame = temp_vision_frame.transpose(2, 0, 1)
-	temp_vision_frame = numpy.expand_dims(temp_vision_frame, axis = 0).astype(numpy.float32)
-	return temp_vision_frame
+	return prepare_vision_tensor(temp_vision_frame, model_mean, model_standard_deviation)
 
 
 def normalize_vision_mask(temp_vision_mask : Mask) -> Mask:
@@ -535,3 +563,14 @@ def process_frame(inputs : BackgroundRemoverInputs) -> ProcessorOutputs:
 	temp_vision_frame, temp_vision_mask = remove_background(temp_vision_frame)
 	temp_vision_mask = numpy.minimum.reduce([ temp_vision_mask, inputs.get('temp_vision_mask') ])
 	return temp_vision_frame, temp_vision_mask
+
+
+def process_frames(inputs_batch : List[BackgroundRemoverInputs]) -> List[ProcessorOutputs]:
+	temp_vision_frames = [ inputs.get('temp_vision_frame') for inputs in inputs_batch ]
+	outputs_batch = []
+
+	for inputs, (temp_vision_frame, temp_vision_mask) in zip(inputs_batch, remove_backgrounds(temp_vision_frames)):
+		temp_vision_mask = numpy.minimum.reduce([ temp_vision_mask, inputs.get('temp_vision_mask') ])
+		outputs_batch.append((temp_vision_frame, temp_vision_mask))
+
+	return outputs_batch
@@ -12,16 +12,16 @@ from facefusion import config, content_analyser, face_classifier, face_detector,
 from facefusion.common_helper import create_int_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url_by_provider
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_area_mask, create_box_mask, create_occlusion_mask, create_region_mask
+from facefusion.face_helper import blend_paste_area, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_area_mask, create_box_mask, resolve_occlusion_mask, resolve_region_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import get_file_name, in_directory, is_image, is_video, resolve_file_paths, resolve_relative_path
 from facefusion.processors.modules.deep_swapper import choices as deep_swapper_choices
 from facefusion.processors.modules.deep_swapper.types import DeepSwapperInputs, DeepSwapperMorph
 from facefusion.processors.types import ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
-from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import conditional_match_frame_color, read_static_image, read_static_video_frame
 
 
@@ -337,7 +337,7 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def swap_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def swap_face(target_face : Face, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_size()
 	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, model_size)
@@ -349,7 +349,7 @@ def swap_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFram
 	]
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
+		occlusion_mask = resolve_occlusion_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, model_size, analysis_context)
 		crop_masks.append(occlusion_mask)
 
 	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
@@ -365,12 +365,12 @@ def swap_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFram
 		crop_masks.append(area_mask)
 
 	if 'region' in state_manager.get_item('face_mask_types'):
-		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
+		region_mask = resolve_region_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, model_size, state_manager.get_item('face_mask_regions'), analysis_context)
 		crop_masks.append(region_mask)
 
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_area(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMorph) -> Tuple[VisionFrame, Mask, Mask]:
@@ -383,7 +383,7 @@ def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMor
 		if deep_swapper_input.name == 'morph_value:0':
 			deep_swapper_inputs[deep_swapper_input.name] = deep_swapper_morph
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(deep_swapper):
 		crop_target_mask, crop_vision_frame, crop_source_mask = deep_swapper.run(None, deep_swapper_inputs)
 
 	return crop_vision_frame[0], crop_source_mask[0], crop_target_mask[0]
@@ -399,6 +399,7 @@ def has_morph_input() -> bool:
 	return False
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	crop_vision_frame = cv2.addWeighted(crop_vision_frame, 1.75, cv2.GaussianBlur(crop_vision_frame, (0, 0), 2), -0.75, 0)
 	crop_vision_frame = crop_vision_frame / 255.0
@@ -428,11 +429,14 @@ def process_frame(inputs : DeepSwapperInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = swap_face(target_face, temp_vision_frame)
+			temp_vision_frame = swap_face(target_face, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
@@ -11,17 +11,19 @@ from facefusion import config, content_analyser, face_classifier, face_detector,
 from facefusion.common_helper import create_int_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_box_mask, create_occlusion_mask
+from facefusion.face_helper import blend_paste_area, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_box_mask, resolve_occlusion_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path
 from facefusion.processors.live_portrait import create_rotation, limit_expression
 from facefusion.processors.modules.expression_restorer import choices as expression_restorer_choices
 from facefusion.processors.modules.expression_restorer.types import ExpressionRestorerInputs
 from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw, ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
-from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.tensor_helper import normalize_vision_tensor, prepare_vision_tensor
+from facefusion.thread_helper import conditional_thread_semaphore
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import read_static_image, read_static_video_frame
 
 
@@ -170,7 +172,7 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def restore_expression(target_face : Face, target_vision_frame : VisionFrame, temp_vision_frame : VisionFrame) -> VisionFrame:
+def restore_expression(target_face : Face, target_vision_frame : VisionFrame, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	expression_restorer_factor = float(numpy.interp(float(state_manager.get_item('expression_restorer_factor')), [ 0, 100 ], [ 0, 1.2 ]))
@@ -183,7 +185,7 @@ def restore_expression(target_face : Face, target_vision_frame : VisionFrame, te
 	]
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(temp_crop_vision_frame)
+		occlusion_mask = resolve_occlusion_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, model_size, analysis_context)
 		crop_masks.append(occlusion_mask)
 
 	target_crop_vision_frame = prepare_crop_frame(target_crop_vision_frame)
@@ -191,8 +193,8 @@ def restore_expression(target_face : Face, target_vision_frame : VisionFrame, te
 	temp_crop_vision_frame = apply_restore(target_crop_vision_frame, temp_crop_vision_frame, expression_restorer_factor)
 	temp_crop_vision_frame = normalize_crop_frame(temp_crop_vision_frame)
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_area(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def apply_restore(target_crop_vision_frame : VisionFrame, temp_crop_vision_frame : VisionFrame, expression_restorer_factor : float) -> VisionFrame:
@@ -249,7 +251,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, target_motion_points : LivePortraitMotionPoints, temp_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(generator):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -260,20 +262,16 @@ def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, target_mo
 	return crop_vision_frame
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = get_model_options().get('size')
 	prepare_size = (model_size[0] // 2, model_size[1] // 2)
 	crop_vision_frame = cv2.resize(crop_vision_frame, prepare_size, interpolation = cv2.INTER_AREA)
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return crop_vision_frame
+	return prepare_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame.transpose(1, 2, 0).clip(0, 1)
-	crop_vision_frame = crop_vision_frame * 255.0
-	crop_vision_frame = crop_vision_frame.astype(numpy.uint8)[:, :, ::-1]
-	return crop_vision_frame
+	return normalize_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 
 def process_frame(inputs : ExpressionRestorerInputs) -> ProcessorOutputs:
@@ -281,11 +279,14 @@ def process_frame(inputs : ExpressionRestorerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = restore_expression(target_face, target_vision_frame, temp_vision_frame)
+			temp_vision_frame = restore_expression(target_face, target_vision_frame, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
@@ -1,6 +1,6 @@
 from typing import List, Literal, TypedDict
 
-from facefusion.types import Mask, VisionFrame
+from facefusion.types import AnalysisContext, Mask, VisionFrame
 
 ExpressionRestorerInputs = TypedDict('ExpressionRestorerInputs',
 {
@@ -8,7 +8,8 @@ ExpressionRestorerInputs = TypedDict('ExpressionRestorerInputs',
 	'source_vision_frames' : List[VisionFrame],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
-	'temp_vision_mask' : Mask
+	'temp_vision_mask' : Mask,
+	'analysis_context' : AnalysisContext
 })
 
 ExpressionRestorerModel = Literal['live_portrait']
@@ -232,7 +232,8 @@ def process_frame(inputs : FaceDebuggerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
 		for target_face in target_faces:
@@ -11,7 +11,7 @@ from facefusion import config, content_analyser, face_classifier, face_detector,
 from facefusion.common_helper import create_float_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
+from facefusion.face_helper import blend_paste_area, scale_face_landmark_5, warp_face_by_face_landmark_5
 from facefusion.face_masker import create_box_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path
@@ -19,8 +19,10 @@ from facefusion.processors.live_portrait import create_rotation, limit_angle, li
 from facefusion.processors.modules.face_editor import choices as face_editor_choices
 from facefusion.processors.modules.face_editor.types import FaceEditorInputs
 from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitRotation, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw, ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
+from facefusion.tensor_helper import normalize_vision_tensor, prepare_vision_tensor
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, FaceLandmark68, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import read_static_image, read_static_video_frame
 
@@ -314,8 +316,8 @@ def edit_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFram
 	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
 	crop_vision_frame = apply_edit(crop_vision_frame, target_face.landmark_set.get('68'))
 	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_area(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def apply_edit(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark68) -> VisionFrame:
@@ -394,7 +396,7 @@ def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePo
 def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	stitcher = get_inference_pool().get('stitcher')
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(stitcher):
 		motion_points = stitcher.run(None,
 		{
 			'source': source_motion_points,
@@ -407,7 +409,7 @@ def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(generator):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -573,20 +575,16 @@ def calculate_distance_ratio(face_landmark_68 : FaceLandmark68, top_index : int,
 	return distance_ratio
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = get_model_options().get('size')
 	prepare_size = (model_size[0] // 2, model_size[1] // 2)
 	crop_vision_frame = cv2.resize(crop_vision_frame, prepare_size, interpolation = cv2.INTER_AREA)
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return crop_vision_frame
+	return prepare_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame.transpose(1, 2, 0).clip(0, 1)
-	crop_vision_frame = (crop_vision_frame * 255.0)
-	crop_vision_frame = crop_vision_frame.astype(numpy.uint8)[:, :, ::-1]
-	return crop_vision_frame
+	return normalize_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 
 def process_frame(inputs : FaceEditorInputs) -> ProcessorOutputs:
@@ -594,9 +592,12 @@ def process_frame(inputs : FaceEditorInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = edit_face(target_face, temp_vision_frame)
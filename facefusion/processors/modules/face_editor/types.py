@@ -1,13 +1,14 @@
 from typing import Literal, TypedDict
 
-from facefusion.types import Mask, VisionFrame
+from facefusion.types import AnalysisContext, Mask, VisionFrame
 
 FaceEditorInputs = TypedDict('FaceEditorInputs',
 {
 	'reference_vision_frame' : VisionFrame,
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
-	'temp_vision_mask' : Mask
+	'temp_vision_mask' : Mask,
+	'analysis_context' : AnalysisContext
 })
 
 FaceEditorModel = Literal['live_portrait']
@@ -9,17 +9,18 @@ from facefusion import config, content_analyser, face_classifier, face_detector,
 from facefusion.common_helper import create_float_metavar, create_int_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_box_mask, create_occlusion_mask
+from facefusion.face_helper import blend_paste_area, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_box_mask, resolve_occlusion_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path
 from facefusion.processors.modules.face_enhancer import choices as face_enhancer_choices
 from facefusion.processors.modules.face_enhancer.types import FaceEnhancerInputs, FaceEnhancerWeight
 from facefusion.processors.types import ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
-from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import blend_frame, read_static_image, read_static_video_frame
+from facefusion.tensor_helper import prepare_vision_tensor
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.vision import read_static_image, read_static_video_frame
 
 
 @lru_cache()
@@ -360,7 +361,7 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def enhance_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def enhance_face(target_face : Face, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, model_size)
@@ -371,16 +372,15 @@ def enhance_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionF
 	]
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
+		occlusion_mask = resolve_occlusion_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, model_size, analysis_context)
 		crop_masks.append(occlusion_mask)
 
 	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
 	face_enhancer_weight = numpy.array([ state_manager.get_item('face_enhancer_weight') ]).astype(numpy.double)
 	crop_vision_frame = forward(crop_vision_frame, face_enhancer_weight)
 	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	temp_vision_frame = blend_paste_frame(temp_vision_frame, paste_vision_frame)
+	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1) * state_manager.get_item('face_enhancer_blend') / 100
+	blend_paste_area(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
 	return temp_vision_frame
 
 
@@ -394,7 +394,7 @@ def forward(crop_vision_frame : VisionFrame, face_enhancer_weight : FaceEnhancer
 		if face_enhancer_input.name == 'weight':
 			face_enhancer_inputs[face_enhancer_input.name] = face_enhancer_weight
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(face_enhancer):
 		crop_vision_frame = face_enhancer.run(None, face_enhancer_inputs)[0][0]
 
 	return crop_vision_frame
@@ -410,11 +410,9 @@ def has_weight_input() -> bool:
 	return False
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = (crop_vision_frame - 0.5) / 0.5
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return crop_vision_frame
+	return prepare_vision_tensor(crop_vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ], 'face_enhancer')
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
@@ -426,22 +424,19 @@ def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	return crop_vision_frame
 
 
-def blend_paste_frame(temp_vision_frame : VisionFrame, paste_vision_frame : VisionFrame) -> VisionFrame:
-	face_enhancer_blend = 1 - (state_manager.get_item('face_enhancer_blend') / 100)
-	temp_vision_frame = blend_frame(temp_vision_frame, paste_vision_frame, 1 - face_enhancer_blend)
-	return temp_vision_frame
-
-
 def process_frame(inputs : FaceEnhancerInputs) -> ProcessorOutputs:
 	reference_vision_frame = inputs.get('reference_vision_frame')
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = enhance_face(target_face, temp_vision_frame)
+			temp_vision_frame = enhance_face(target_face, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
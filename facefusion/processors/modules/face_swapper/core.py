@@ -11,20 +11,25 @@ import facefusion.jobs.job_manager
 from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, translator, video_manager
 from facefusion.common_helper import get_first, is_macos
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
+from facefusion.embedding_store import get_static_embedding, read_static_embedding, set_static_embedding, write_static_embedding
 from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import get_average_face, get_many_faces, get_one_face, scale_face
-from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_area_mask, create_box_mask, create_occlusion_mask, create_region_mask
+from facefusion.face_helper import paste_back_faces, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_area_mask, create_box_mask, resolve_occlusion_mask, resolve_region_mask
 from facefusion.face_selector import select_faces, sort_faces_by_order
+from facefusion.face_store import get_source_face, set_source_face
 from facefusion.filesystem import filter_image_paths, has_image, in_directory, is_image, is_video, resolve_relative_path
+from facefusion.hash_helper import create_hash
 from facefusion.model_helper import get_static_model_initializer
 from facefusion.processors.modules.face_swapper import choices as face_swapper_choices
 from facefusion.processors.modules.face_swapper.types import FaceSwapperInputs
 from facefusion.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
 from facefusion.processors.types import ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
+from facefusion.tensor_helper import normalize_vision_tensor, prepare_vision_tensor
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.types import ApplyStateItem, Args, DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import read_static_image, read_static_images, read_static_video_frame, unpack_resolution
 
 
@@ -540,6 +545,12 @@ def register_args(program : ArgumentParser) -> None:
 					type = float,
 					default = config.get_float_value('processors', 'face_swapper_weight', '0.5'),
 					choices = face_swapper_choices.face_swapper_weight_range
+				),
+				group_processors.add_argument(
+					'--face-swapper-embedding-cache',
+					help = translator.get('help.embedding_cache', __package__),
+					action = 'store_true',
+					default = config.get_bool_value('processors', 'face_swapper_embedding_cache')
 				)
 			],
 			scopes = [ 'api', 'cli' ]
@@ -550,6 +561,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_swapper_model', args.get('face_swapper_model'))
 	apply_state_item('face_swapper_pixel_boost', args.get('face_swapper_pixel_boost'))
 	apply_state_item('face_swapper_weight', args.get('face_swapper_weight'))
+	apply_state_item('face_swapper_embedding_cache', args.get('face_swapper_embedding_cache'))
 
 
 def pre_check() -> bool:
@@ -600,43 +612,70 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
+	return get_first(swap_faces(source_face, [ target_face ], [ temp_vision_frame ], [ analysis_context ]))
+
+
+def swap_faces(source_face : Face, target_faces : List[Face], temp_vision_frames : List[VisionFrame], analysis_contexts : List[AnalysisContext]) -> List[VisionFrame]:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
 	pixel_boost_total = pixel_boost_size[0] // model_size[0]
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
-	temp_vision_frames = []
-	crop_masks = []
+	affine_matrices = []
+	crop_mask_sets = []
+	pixel_boost_target_faces = []
+	pixel_boost_vision_frames = []
+	crop_vision_frames = []
+	crop_vision_masks = []
+	paste_vision_frames = []
+
+	for target_face, temp_vision_frame, analysis_context in zip(target_faces, temp_vision_frames, analysis_contexts):
+		crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
+		crop_masks = []
+
+		if 'box' in state_manager.get_item('face_mask_types'):
+			box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
+			crop_masks.append(box_mask)
+
+		if 'occlusion' in state_manager.get_item('face_mask_types'):
+			occlusion_mask = resolve_occlusion_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, pixel_boost_size, analysis_context)
+			crop_masks.append(occlusion_mask)
 
-	if 'box' in state_manager.get_item('face_mask_types'):
-		box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
-		crop_masks.append(box_mask)
+		for pixel_boost_vision_frame in implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size):
+			pixel_boost_vision_frames.append(prepare_crop_frame(pixel_boost_vision_frame))
+			pixel_boost_target_faces.append(target_face)
 
-	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
-		crop_masks.append(occlusion_mask)
+		affine_matrices.append(affine_matrix)
+		crop_mask_sets.append(crop_masks)
 
-	pixel_boost_vision_frames = implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size)
-	for pixel_boost_vision_frame in pixel_boost_vision_frames:
-		pixel_boost_vision_frame = prepare_crop_frame(pixel_boost_vision_frame)
-		pixel_boost_vision_frame = forward_swap_face(source_face, target_face, pixel_boost_vision_frame)
-		pixel_boost_vision_frame = normalize_crop_frame(pixel_boost_vision_frame)
-		temp_vision_frames.append(pixel_boost_vision_frame)
-	crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
+	swap_vision_frames = forward_swap_faces(source_face, pixel_boost_target_faces, numpy.concatenate(pixel_boost_vision_frames))
+	pixel_boost_vision_frames = [ normalize_crop_frame(swap_vision_frame) for swap_vision_frame in swap_vision_frames ]
 
-	if 'area' in state_manager.get_item('face_mask_types'):
-		face_landmark_68 = cv2.transform(target_face.landmark_set.get('68').reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
-		area_mask = create_area_mask(crop_vision_frame, face_landmark_68, state_manager.get_item('face_mask_areas'))
-		crop_masks.append(area_mask)
+	for index, (target_face, temp_vision_frame, analysis_context, affine_matrix, crop_masks) in enumerate(zip(target_faces, temp_vision_frames, analysis_contexts, affine_matrices, crop_mask_sets)):
+		temp_crop_frames = pixel_boost_vision_frames[index * pixel_boost_total ** 2:(index + 1) * pixel_boost_total ** 2]
+		crop_vision_frame = explode_pixel_boost(temp_crop_frames, pixel_boost_total, model_size, pixel_boost_size)
 
-	if 'region' in state_manager.get_item('face_mask_types'):
-		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
-		crop_masks.append(region_mask)
+		if 'area' in state_manager.get_item('face_mask_types'):
+			face_landmark_68 = cv2.transform(target_face.landmark_set.get('68').reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
+			area_mask = create_area_mask(crop_vision_frame, face_landmark_68, state_manager.get_item('face_mask_areas'))
+			crop_masks.append(area_mask)
 
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+		if 'region' in state_manager.get_item('face_mask_types'):
+			region_mask = resolve_region_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, pixel_boost_size, state_manager.get_item('face_mask_regions'), analysis_context)
+			crop_masks.append(region_mask)
+
+		crop_vision_frames.append(crop_vision_frame)
+		crop_vision_masks.append(numpy.minimum.reduce(crop_masks).clip(0, 1))
+
+	for index, temp_vision_frame in enumerate(temp_vision_frames):
+		frame_indices = [ frame_index for frame_index, vision_frame in enumerate(temp_vision_frames) if vision_frame is temp_vision_frame ]
+
+		if frame_indices[0] == index:
+			paste_vision_frames.append(paste_back_faces(temp_vision_frame, [ crop_vision_frames[frame_index] for frame_index in frame_indices ], [ crop_vision_masks[frame_index] for frame_index in frame_indices ], [ affine_matrices[frame_index] for frame_index in frame_indices ]))
+		else:
+			paste_vision_frames.append(paste_vision_frames[frame_indices[0]])
+
+	return paste_vision_frames
 
 
 def forward_swap_face(source_face : Face, target_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
@@ -664,6 +703,33 @@ def forward_swap_face(source_face : Face, target_face : Face, crop_vision_frame
 	return crop_vision_frame
 
 
+def forward_swap_faces(source_face : Face, target_faces : List[Face], crop_vision_frames : VisionFrame) -> VisionFrame:
+	face_swapper = get_inference_pool().get('face_swapper')
+	model_type = get_model_options().get('type')
+	face_swapper_inputs = {}
+
+	if len(target_faces) == 1 or not inference_manager.has_batch_support(face_swapper):
+		return numpy.stack([ forward_swap_face(source_face, target_face, crop_vision_frame[numpy.newaxis]) for target_face, crop_vision_frame in zip(target_faces, crop_vision_frames) ])
+
+	if is_macos() and has_execution_provider('coreml') and model_type in [ 'ghost', 'uniface' ]:
+		face_swapper.set_providers([ facefusion.choices.execution_provider_set.get('cpu') ])
+
+	for face_swapper_input in face_swapper.get_inputs():
+		if face_swapper_input.name == 'source':
+			if model_type in [ 'blendswap', 'uniface' ]:
+				face_swapper_inputs[face_swapper_input.name] = numpy.concatenate([ prepare_source_frame(source_face) ] * len(target_faces))
+			else:
+				source_embedding = prepare_source_embedding(source_face)
+				face_swapper_inputs[face_swapper_input.name] = numpy.concatenate([ balance_source_embedding(source_embedding, target_face.embedding) for target_face in target_faces ])
+		if face_swapper_input.name == 'target':
+			face_swapper_inputs[face_swapper_input.name] = crop_vision_frames
+
+	with conditional_thread_semaphore():
+		crop_vision_frames = face_swapper.run(None, face_swapper_inputs)[0]
+
+	return crop_vision_frames
+
+
 def forward_convert_embedding(face_embedding : Embedding) -> Embedding:
 	embedding_converter = get_inference_pool().get('embedding_converter')
 
@@ -693,6 +759,23 @@ def prepare_source_frame(source_face : Face) -> VisionFrame:
 
 
 def prepare_source_embedding(source_face : Face) -> Embedding:
+	embedding_key = create_hash(source_face.embedding.tobytes()) + '_' + state_manager.get_item('face_swapper_model')
+	source_embedding = get_static_embedding(embedding_key)
+
+	if source_embedding is None and state_manager.get_item('face_swapper_embedding_cache'):
+		source_embedding = read_static_embedding(embedding_key)
+
+	if source_embedding is None:
+		source_embedding = calculate_source_embedding(source_face)
+
+		if state_manager.get_item('face_swapper_embedding_cache'):
+			write_static_embedding(embedding_key, source_embedding)
+
+	set_static_embedding(embedding_key, source_embedding)
+	return source_embedding
+
+
+def calculate_source_embedding(source_face : Face) -> Embedding:
 	model_type = get_model_options().get('type')
 
 	if model_type == 'ghost':
@@ -739,15 +822,11 @@ def convert_source_embedding(source_embedding : Embedding) -> Tuple[Embedding, E
 	return source_embedding, source_embedding_norm
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
-
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-	crop_vision_frame = (crop_vision_frame - model_mean) / model_standard_deviation
-	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0).astype(numpy.float32)
-	return crop_vision_frame
+	return prepare_vision_tensor(crop_vision_frame, model_mean, model_standard_deviation)
 
 
 def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
@@ -755,14 +834,22 @@ def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
 
-	crop_vision_frame = crop_vision_frame.transpose(1, 2, 0)
-
 	if model_type in [ 'ghost', 'hififace', 'hyperswap', 'uniface' ]:
-		crop_vision_frame = crop_vision_frame * model_standard_deviation + model_mean
+		return normalize_vision_tensor(crop_vision_frame, model_mean, model_standard_deviation)
+	return normalize_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
-	crop_vision_frame = crop_vision_frame.clip(0, 1)
-	crop_vision_frame = crop_vision_frame[:, :, ::-1] * 255
-	return crop_vision_frame
+
+def conditional_extract_source_face(source_vision_frames : List[VisionFrame]) -> Optional[Face]:
+	source_paths = filter_image_paths(state_manager.get_item('source_paths'))
+	source_face = get_source_face(source_paths)
+
+	if not source_face:
+		source_face = extract_source_face(source_vision_frames)
+
+		if source_face:
+			set_source_face(source_paths, source_face)
+
+	return source_face
 
 
 def extract_source_face(source_vision_frames : List[VisionFrame]) -> Optional[Face]:
@@ -785,12 +872,42 @@ def process_frame(inputs : FaceSwapperInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	source_face = extract_source_face(source_vision_frames)
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	source_face = conditional_extract_source_face(source_vision_frames)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if source_face and target_faces:
-		for target_face in target_faces:
-			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = swap_face(source_face, target_face, temp_vision_frame)
+		target_faces = [ scale_face(target_face, target_vision_frame, temp_vision_frame) for target_face in target_faces ]
+
+		if state_manager.get_item('execution_batch_size') > 1:
+			temp_vision_frame = get_first(swap_faces(source_face, target_faces, [ temp_vision_frame ] * len(target_faces), [ analysis_context ] * len(target_faces)))
+		else:
+			for target_face in target_faces:
+				temp_vision_frame = swap_face(source_face, target_face, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
+
+
+def process_frames(inputs_batch : List[FaceSwapperInputs]) -> List[ProcessorOutputs]:
+	source_face = conditional_extract_source_face(get_first(inputs_batch).get('source_vision_frames'))
+	temp_vision_frames = [ inputs.get('temp_vision_frame') for inputs in inputs_batch ]
+	temp_vision_masks = [ inputs.get('temp_vision_mask') for inputs in inputs_batch ]
+	target_face_sets = []
+
+	for inputs in inputs_batch:
+		target_faces = select_faces(inputs.get('reference_vision_frame'), inputs.get('target_vision_frame'), inputs.get('analysis_context'))
+		target_faces = [ scale_face(target_face, inputs.get('target_vision_frame'), inputs.get('temp_vision_frame')) for target_face in target_faces ]
+		target_face_sets.append(target_faces)
+
+	if source_face:
+		face_total = max(len(target_faces) for target_faces in target_face_sets)
+
+		for face_index in range(face_total):
+			frame_indices = [ frame_index for frame_index, target_faces in enumerate(target_face_sets) if face_index < len(target_faces) ]
+			target_faces = [ target_face_sets[frame_index][face_index] for frame_index in frame_indices ]
+			swap_vision_frames = swap_faces(source_face, target_faces, [ temp_vision_frames[frame_index] for frame_index in frame_indices ], [ inputs_batch[frame_index].get('analysis_context') for frame_index in frame_indices ])
+
+			for frame_index, swap_vision_frame in zip(frame_indices, swap_vision_frames):
+				temp_vision_frames[frame_index] = swap_vision_frame
+
+	return list(zip(temp_vision_frames, temp_vision_masks))
@@ -8,7 +8,8 @@ LOCALES : Locales =\
 		{
 			'model': 'choose the model responsible for swapping the face',
 			'pixel_boost': 'choose the pixel boost resolution for the face swapper',
-			'weight': 'specify the degree of weight applied to the face'
+			'weight': 'specify the degree of weight applied to the face',
+			'embedding_cache': 'persist the source face embedding to reuse it across runs'
 		},
 		'uis':
 		{
@@ -16,7 +16,6 @@ from facefusion.processors.modules.frame_colorizer import choices as frame_color
 from facefusion.processors.modules.frame_colorizer.types import FrameColorizerInputs
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, ExecutionProvider, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import blend_frame, read_static_image, read_static_video_frame, unpack_resolution
 
@@ -254,10 +253,17 @@ def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	return color_vision_frame
 
 
+def colorize_frames(temp_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	color_vision_frames = numpy.concatenate([ prepare_temp_frame(temp_vision_frame) for temp_vision_frame in temp_vision_frames ])
+	color_vision_frames = forward_batch(color_vision_frames)
+	temp_vision_frames = [ blend_color_frame(temp_vision_frame, merge_color_frame(temp_vision_frame, color_vision_frame)) for temp_vision_frame, color_vision_frame in zip(temp_vision_frames, color_vision_frames) ]
+	return temp_vision_frames
+
+
 def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	frame_colorizer = get_inference_pool().get('frame_colorizer')
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(frame_colorizer):
 		color_vision_frame = frame_colorizer.run(None,
 		{
 			'input': color_vision_frame
@@ -266,6 +272,21 @@ def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	return color_vision_frame
 
 
+def forward_batch(color_vision_frames : VisionFrame) -> VisionFrame:
+	frame_colorizer = get_inference_pool().get('frame_colorizer')
+
+	if inference_manager.has_batch_support(frame_colorizer):
+		with inference_manager.session_semaphore(frame_colorizer):
+			color_vision_frames = frame_colorizer.run(None,
+			{
+				'input': color_vision_frames
+			})[0]
+
+		return color_vision_frames
+
+	return numpy.stack([ forward(color_vision_frame[numpy.newaxis]) for color_vision_frame in color_vision_frames ])
+
+
 def prepare_temp_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = unpack_resolution(state_manager.get_item('frame_colorizer_size'))
 	model_type = get_model_options().get('type')
@@ -317,3 +338,10 @@ def process_frame(inputs : FrameColorizerInputs) -> ProcessorOutputs:
 	temp_vision_mask = inputs.get('temp_vision_mask')
 	temp_vision_frame = colorize_frame(temp_vision_frame)
 	return temp_vision_frame, temp_vision_mask
+
+
+def process_frames(inputs_batch : List[FrameColorizerInputs]) -> List[ProcessorOutputs]:
+	temp_vision_frames = [ inputs.get('temp_vision_frame') for inputs in inputs_batch ]
+	temp_vision_masks = [ inputs.get('temp_vision_mask') for inputs in inputs_batch ]
+	temp_vision_frames = colorize_frames(temp_vision_frames)
+	return list(zip(temp_vision_frames, temp_vision_masks))
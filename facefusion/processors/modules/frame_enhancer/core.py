@@ -1,5 +1,7 @@
 from argparse import ArgumentParser
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Optional
 
 import cv2
 import numpy
@@ -15,10 +17,13 @@ from facefusion.processors.modules.frame_enhancer import choices as frame_enhanc
 from facefusion.processors.modules.frame_enhancer.types import FrameEnhancerInputs
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
-from facefusion.thread_helper import conditional_thread_semaphore
+from facefusion.tensor_helper import normalize_vision_tensors, prepare_vision_tensors
+from facefusion.thread_helper import conditional_thread_semaphore, thread_lock
 from facefusion.types import ApplyStateItem, Args, DownloadScope, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import blend_frame, create_tile_frames, merge_tile_frames, read_static_image, read_static_video_frame
 
+TILE_EXECUTOR : Optional[ThreadPoolExecutor] = None
+
 
 @lru_cache()
 def create_static_model_set(download_scope : DownloadScope) -> ModelSet:
@@ -588,6 +593,14 @@ def register_args(program : ArgumentParser) -> None:
 					default = config.get_int_value('processors', 'frame_enhancer_blend', '80'),
 					choices = frame_enhancer_choices.frame_enhancer_blend_range,
 					metavar = create_int_metavar(frame_enhancer_choices.frame_enhancer_blend_range)
+				),
+				group_processors.add_argument(
+					'--frame-enhancer-tile-batch',
+					help = translator.get('help.tile_batch', __package__),
+					type = int,
+					default = config.get_int_value('processors', 'frame_enhancer_tile_batch', '4'),
+					choices = frame_enhancer_choices.frame_enhancer_tile_batch_range,
+					metavar = create_int_metavar(frame_enhancer_choices.frame_enhancer_tile_batch_range)
 				)
 			],
 			scopes = [ 'api', 'cli' ]
@@ -597,6 +610,7 @@ def register_args(program : ArgumentParser) -> None:
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('frame_enhancer_model', args.get('frame_enhancer_model'))
 	apply_state_item('frame_enhancer_blend', args.get('frame_enhancer_blend'))
+	apply_state_item('frame_enhancer_tile_batch', args.get('frame_enhancer_tile_batch'))
 
 
 def pre_check() -> bool:
@@ -618,6 +632,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
+	clear_tile_executor()
 	read_static_image.cache_clear()
 	read_static_video_frame.cache_clear()
 	video_manager.clear_video_pool()
@@ -628,19 +643,60 @@ def post_process() -> None:
 
 
 def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
+	return enhance_frames([ temp_vision_frame ])[0]
+
+
+def enhance_frames(temp_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
 	model_size = get_model_options().get('size')
 	model_scale = get_model_options().get('scale')
-	temp_height, temp_width = temp_vision_frame.shape[:2]
-	tile_vision_frames, pad_width, pad_height = create_tile_frames(temp_vision_frame, model_size)
+	tile_sets = [ create_tile_frames(temp_vision_frame, model_size) for temp_vision_frame in temp_vision_frames ]
+	enhance_vision_frames = enhance_tile_frames([ tile_vision_frame for tile_set in tile_sets for tile_vision_frame in tile_set[0] ])
+	merge_vision_frames = []
 
-	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		tile_vision_frame = prepare_tile_frame(tile_vision_frame)
-		tile_vision_frame = forward(tile_vision_frame)
-		tile_vision_frames[index] = normalize_tile_frame(tile_vision_frame)
+	for temp_vision_frame, (tile_vision_frames, pad_width, pad_height) in zip(temp_vision_frames, tile_sets):
+		temp_height, temp_width = temp_vision_frame.shape[:2]
+		tile_vision_frames = enhance_vision_frames[:len(tile_vision_frames)]
+		enhance_vision_frames = enhance_vision_frames[len(tile_vision_frames):]
+		merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * model_scale, temp_height * model_scale, pad_width * model_scale, pad_height * model_scale, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
+		merge_vision_frames.append(blend_merge_frame(temp_vision_frame, merge_vision_frame))
+
+	return merge_vision_frames
+
+
+def enhance_tile_frames(tile_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	frame_enhancer_tile_batch = state_manager.get_item('frame_enhancer_tile_batch')
+	tile_batch_frames = [ tile_vision_frames[index:index + frame_enhancer_tile_batch] for index in range(0, len(tile_vision_frames), frame_enhancer_tile_batch) ]
+	execution_device_id = inference_manager.get_execution_device_id(state_manager.get_item('execution_device_ids'))
+	enhance_vision_frames : List[VisionFrame] = []
+
+	for enhance_batch_frames in get_tile_executor().map(partial(forward_tile_batch, execution_device_id), tile_batch_frames):
+		enhance_vision_frames.extend(enhance_batch_frames)
+
+	return enhance_vision_frames
+
+
+def get_tile_executor() -> ThreadPoolExecutor:
+	global TILE_EXECUTOR
+
+	with thread_lock():
+		if not TILE_EXECUTOR:
+			TILE_EXECUTOR = ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'))
+	return TILE_EXECUTOR
 
-	merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * model_scale, temp_height * model_scale, pad_width * model_scale, pad_height * model_scale, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
-	temp_vision_frame = blend_merge_frame(temp_vision_frame, merge_vision_frame)
-	return temp_vision_frame
+
+def clear_tile_executor() -> None:
+	global TILE_EXECUTOR
+
+	with thread_lock():
+		if TILE_EXECUTOR:
+			TILE_EXECUTOR.shutdown()
+			TILE_EXECUTOR = None
+
+
+def forward_tile_batch(execution_device_id : int, tile_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	with inference_manager.pin_execution_device(execution_device_id):
+		tile_batch_frame = forward_batch(prepare_tile_frames(tile_vision_frames))
+	return normalize_tile_frames(tile_batch_frame)
 
 
 def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
@@ -655,17 +711,21 @@ def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
 	return tile_vision_frame
 
 
-def prepare_tile_frame(tile_vision_frame : VisionFrame) -> VisionFrame:
-	tile_vision_frame = numpy.expand_dims(tile_vision_frame[:, :, ::-1], axis = 0)
-	tile_vision_frame = tile_vision_frame.transpose(0, 3, 1, 2)
-	tile_vision_frame = tile_vision_frame.astype(numpy.float32) / 255.0
-	return tile_vision_frame
+def forward_batch(tile_vision_frames : VisionFrame) -> VisionFrame:
+	frame_enhancer = get_inference_pool().get('frame_enhancer')
 
+	if len(tile_vision_frames) == 1 or inference_manager.has_batch_support(frame_enhancer):
+		return forward(tile_vision_frames)
+
+	return numpy.concatenate([ forward(tile_vision_frame[numpy.newaxis]) for tile_vision_frame in tile_vision_frames ])
 
-def normalize_tile_frame(tile_vision_frame : VisionFrame) -> VisionFrame:
-	tile_vision_frame = tile_vision_frame.transpose(0, 2, 3, 1).squeeze(0) * 255
-	tile_vision_frame = tile_vision_frame.clip(0, 255).astype(numpy.uint8)[:, :, ::-1]
-	return tile_vision_frame
+
+def prepare_tile_frames(tile_vision_frames : List[VisionFrame]) -> VisionFrame:
+	return prepare_vision_tensors(tile_vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], 'frame_enhancer')
+
+
+def normalize_tile_frames(tile_batch_frame : VisionFrame) -> List[VisionFrame]:
+	return normalize_vision_tensors(tile_batch_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 
 def blend_merge_frame(temp_vision_frame : VisionFrame, merge_vision_frame : VisionFrame) -> VisionFrame:
@@ -681,3 +741,14 @@ def process_frame(inputs : FrameEnhancerInputs) -> ProcessorOutputs:
 	temp_vision_frame = enhance_frame(temp_vision_frame)
 	temp_vision_mask = cv2.resize(temp_vision_mask, temp_vision_frame.shape[:2][::-1])
 	return temp_vision_frame, temp_vision_mask
+
+
+def process_frames(inputs_batch : List[FrameEnhancerInputs]) -> List[ProcessorOutputs]:
+	temp_vision_frames = enhance_frames([ inputs.get('temp_vision_frame') for inputs in inputs_batch ])
+	outputs_batch = []
+
+	for inputs, temp_vision_frame in zip(inputs_batch, temp_vision_frames):
+		temp_vision_mask = cv2.resize(inputs.get('temp_vision_mask'), temp_vision_frame.shape[:2][::-1])
+		outputs_batch.append((temp_vision_frame, temp_vision_mask))
+
+	return outputs_batch
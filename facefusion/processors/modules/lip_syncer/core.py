@@ -11,16 +11,18 @@ from facefusion.audio import read_static_voice
 from facefusion.common_helper import create_float_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import create_bounding_box, paste_back, warp_face_by_bounding_box, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_area_mask, create_box_mask, create_occlusion_mask
+from facefusion.face_helper import blend_paste_area, create_bounding_box, warp_face_by_bounding_box, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_area_mask, create_box_mask, resolve_occlusion_mask
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import has_audio, resolve_relative_path
 from facefusion.processors.modules.lip_syncer import choices as lip_syncer_choices
 from facefusion.processors.modules.lip_syncer.types import LipSyncerInputs, LipSyncerWeight
 from facefusion.processors.types import ProcessorOutputs
+from facefusion.profiler import profile_function
 from facefusion.program_helper import find_argument_group
+from facefusion.tensor_helper import prepare_vision_tensor
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.types import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from facefusion.types import AnalysisContext, ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from facefusion.vision import read_static_image, read_static_video_frame
 
 
@@ -189,7 +191,7 @@ def post_process() -> None:
 		voice_extractor.clear_inference_pool()
 
 
-def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_frame : VisionFrame) -> VisionFrame:
+def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
 	model_type = get_model_options().get('type')
 	model_size = get_model_options().get('size')
 	source_voice_frame = prepare_audio_frame(source_voice_frame)
@@ -197,7 +199,7 @@ def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_fr
 	crop_masks = []
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
+		occlusion_mask = resolve_occlusion_mask(temp_vision_frame, target_face.landmark_set.get('5/68'), affine_matrix, (512, 512), analysis_context)
 		crop_masks.append(occlusion_mask)
 
 	if model_type == 'edtalk':
@@ -220,8 +222,8 @@ def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_fr
 		crop_vision_frame = cv2.warpAffine(area_vision_frame, cv2.invertAffineTransform(area_matrix), (512, 512), borderMode = cv2.BORDER_REPLICATE)
 
 	crop_mask = numpy.minimum.reduce(crop_masks)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_area(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def forward_edtalk(temp_audio_frame : AudioFrame, crop_vision_frame : VisionFrame, lip_syncer_weight : LipSyncerWeight) -> VisionFrame:
@@ -264,14 +266,14 @@ def prepare_audio_frame(temp_audio_frame : AudioFrame) -> AudioFrame:
 	return temp_audio_frame
 
 
+@profile_function
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_type = get_model_options().get('type')
 	model_size = get_model_options().get('size')
 
 	if model_type == 'edtalk':
 		crop_vision_frame = cv2.resize(crop_vision_frame, model_size, interpolation = cv2.INTER_AREA)
-		crop_vision_frame = crop_vision_frame[:, :, ::-1] / 255.0
-		crop_vision_frame = numpy.expand_dims(crop_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
+		crop_vision_frame = prepare_vision_tensor(crop_vision_frame, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
 
 	if model_type == 'wav2lip':
 		crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
@@ -302,11 +304,14 @@ def process_frame(inputs : LipSyncerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	analysis_context = inputs.get('analysis_context')
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, analysis_context)
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = sync_lip(target_face, source_voice_frame, temp_vision_frame)
+			temp_vision_frame = sync_lip(target_face, source_voice_frame, temp_vision_frame, analysis_context)
 
 	return temp_vision_frame, temp_vision_mask
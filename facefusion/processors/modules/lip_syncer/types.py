@@ -2,7 +2,7 @@ from typing import Any, Literal, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from facefusion.types import AudioFrame, Mask, VisionFrame
+from facefusion.types import AnalysisContext, AudioFrame, Mask, VisionFrame
 
 LipSyncerInputs = TypedDict('LipSyncerInputs',
 {
@@ -10,7 +10,8 @@ LipSyncerInputs = TypedDict('LipSyncerInputs',
 	'source_voice_frame' : AudioFrame,
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
-	'temp_vision_mask' : Mask
+	'temp_vision_mask' : Mask,
+	'analysis_context' : AnalysisContext
 })
 
 LipSyncerModel = Literal['edtalk_256', 'wav2lip_96', 'wav2lip_gan_96']
@@ -0,0 +1,130 @@
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Iterator, List, Optional
+
+from facefusion import logger, state_manager, translator
+from facefusion.cli_helper import render_table
+from facefusion.json import write_json
+from facefusion.thread_helper import thread_lock
+from facefusion.types import Profiler, TableContent
+
+PROFILER : Profiler =\
+{
+	'profile_stages': {},
+	'trace_events': []
+}
+PROFILER_START_TIME = perf_counter()
+
+
+def is_profiling() -> bool:
+	return bool(state_manager.get_item('profile')) or os.getenv('FACEFUSION_PROFILE') == '1'
+
+
+def profile(stage_name : str) -> ContextManager[None]:
+	if is_profiling():
+		return profile_stage(stage_name)
+	return nullcontext()
+
+
+@contextmanager
+def profile_stage(stage_name : str) -> Iterator[None]:
+	start_time = perf_counter()
+
+	try:
+		yield
+	finally:
+		end_time = perf_counter()
+
+		with thread_lock():
+			profile_stage = PROFILER.get('profile_stages').setdefault(stage_name,
+			{
+				'call_total': 0,
+				'wall_time': 0.0
+			})
+			profile_stage['call_total'] += 1
+			profile_stage['wall_time'] += end_time - start_time
+			PROFILER['trace_events'].append(
+			{
+				'name': stage_name,
+				'ph': 'X',
+				'ts': round((start_time - PROFILER_START_TIME) * 1000000),
+				'dur': round((end_time - start_time) * 1000000),
+				'pid': os.getpid(),
+				'tid': threading.get_ident()
+			})
+
+
+def profile_function(function : Callable[..., Any]) -> Callable[..., Any]:
+	module_names = [ module_name for module_name in function.__module__.split('.') if module_name not in [ 'facefusion', 'processors', 'modules', 'core' ] ]
+	stage_name = '.'.join(module_names + [ function.__name__ ])
+	return create_profile_wrapper(stage_name, function)
+
+
+def create_profile_wrapper(stage_name : str, function : Callable[..., Any]) -> Callable[..., Any]:
+	@wraps(function)
+	def profile_wrapper(*args : Any, **kwargs : Any) -> Any:
+		with profile(stage_name):
+			return function(*args, **kwargs)
+
+	return profile_wrapper
+
+
+def conditional_report(output_path : Optional[str]) -> None:
+	if is_profiling():
+		render_profile_table()
+
+		if output_path:
+			trace_path = os.path.splitext(output_path)[0] + '.trace.json'
+
+			if write_profile_trace(trace_path):
+				logger.info(translator.get('writing_profile_trace_succeeded').format(trace_path = trace_path), __name__)
+		clear_profiler()
+
+
+def render_profile_table() -> None:
+	headers =\
+	[
+		'stage',
+		'call_total',
+		'wall_time',
+		'average_time',
+		'share'
+	]
+	contents : List[List[TableContent]] = []
+
+	with thread_lock():
+		profile_stages = sorted(PROFILER.get('profile_stages').items(), key = lambda profile_item: profile_item[1].get('wall_time'), reverse = True)
+	wall_time_total = sum(profile_stage.get('wall_time') for _, profile_stage in profile_stages)
+
+	for stage_name, profile_stage in profile_stages:
+		contents.append(
+		[
+			stage_name,
+			profile_stage.get('call_total'),
+			round(profile_stage.get('wall_time'), 2),
+			round(profile_stage.get('wall_time') / profile_stage.get('call_total') * 1000, 2),
+			round(profile_stage.get('wall_time') / max(wall_time_total, 1e-9) * 100, 1)
+		])
+
+	if contents:
+		render_table(headers, contents)
+
+
+def write_profile_trace(trace_path : str) -> bool:
+	with thread_lock():
+		trace_content =\
+		{
+			'traceEvents': list(PROFILER.get('trace_events')),
+			'displayTimeUnit': 'ms'
+		}
+
+	return write_json(trace_path, trace_content)
+
+
+def clear_profiler() -> None:
+	with thread_lock():
+		PROFILER['profile_stages'].clear()
+		PROFILER['trace_events'].clear()
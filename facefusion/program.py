@@ -1,12 +1,13 @@
+import importlib
 import tempfile
 from argparse import ArgumentParser, HelpFormatter
 from functools import partial
+from typing import List, Optional
 
 import facefusion.choices
 from facefusion import args_store, config, metadata, state_manager, translator
 from facefusion.common_helper import create_float_metavar, create_int_metavar, get_first, get_last
 from facefusion.execution import get_available_execution_providers
-from facefusion.ffmpeg import get_available_encoder_set
 from facefusion.filesystem import get_file_name, resolve_file_paths
 from facefusion.processors.core import get_processors_modules
 from facefusion.sanitizer import sanitize_int_range
@@ -35,7 +36,6 @@ def create_config_path_program() -> ArgumentParser:
 		scopes = [ 'cli' ]
 	)
 
-	apply_config_path(program)
 	return program
 
 
@@ -79,6 +79,7 @@ def create_temp_path_program() -> ArgumentParser:
 def create_jobs_path_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 	group_paths = program.add_argument_group('paths')
+	group_jobs = program.add_argument_group('jobs')
 
 	args_store.register_argument_set(
 		[
@@ -90,6 +91,17 @@ def create_jobs_path_program() -> ArgumentParser:
 		],
 		scopes = [ 'cli' ]
 	)
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--job-store',
+				help = translator.get('help.job_store'),
+				default = config.get_str_value('jobs', 'job_store', 'json'),
+				choices = facefusion.choices.job_stores
+			)
+		],
+		scopes = [ 'cli' ]
+	)
 
 	return program
 
@@ -272,6 +284,25 @@ def create_face_detector_program() -> ArgumentParser:
 		],
 		scopes = [ 'api', 'cli' ]
 	)
+	args_store.register_argument_set(
+		[
+			group_face_detector.add_argument(
+				'--face-tracker',
+				help = translator.get('help.face_tracker'),
+				action = 'store_true',
+				default = config.get_bool_value('face_detector', 'face_tracker')
+			),
+			group_face_detector.add_argument(
+				'--face-tracker-interval',
+				help = translator.get('help.face_tracker_interval'),
+				type = int,
+				default = config.get_int_value('face_detector', 'face_tracker_interval', '5'),
+				choices = facefusion.choices.face_tracker_interval_range,
+				metavar = create_int_metavar(facefusion.choices.face_tracker_interval_range)
+			)
+		],
+		scopes = [ 'api', 'cli' ]
+	)
 
 	return program
 
@@ -571,13 +602,24 @@ def create_frame_extraction_program() -> ArgumentParser:
 		],
 		scopes = [ 'api', 'cli' ]
 	)
+	args_store.register_argument_set(
+		[
+			group_frame_extraction.add_argument(
+				'--temp-frame-mode',
+				help = translator.get('help.temp_frame_mode'),
+				default = config.get_str_value('frame_extraction', 'temp_frame_mode', 'disk'),
+				choices = facefusion.choices.temp_frame_modes
+			)
+		],
+		scopes = [ 'api', 'cli' ]
+	)
 
 	return program
 
 
 def create_output_creation_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
-	available_encoder_set = get_available_encoder_set()
+	available_encoder_set = importlib.import_module('facefusion.ffmpeg').get_available_encoder_set()
 	group_output_creation = program.add_argument_group('output creation')
 
 	args_store.register_argument_set(
@@ -846,6 +888,28 @@ def create_execution_program() -> ArgumentParser:
 		],
 		scopes = [ 'cli', 'sys' ]
 	)
+	args_store.register_argument_set(
+		[
+			group_execution.add_argument(
+				'--execution-device-scheduler',
+				help = translator.get('help.execution_device_scheduler'),
+				default = config.get_str_value('execution', 'execution_device_scheduler', 'least-outstanding'),
+				choices = facefusion.choices.execution_device_schedulers
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_execution.add_argument(
+				'--execution-worker-mode',
+				help = translator.get('help.execution_worker_mode'),
+				default = config.get_str_value('execution', 'execution_worker_mode', 'thread'),
+				choices = facefusion.choices.execution_worker_modes
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
 	args_store.register_argument_set(
 		[
 			group_execution.add_argument(
@@ -859,6 +923,32 @@ def create_execution_program() -> ArgumentParser:
 		],
 		scopes = [ 'cli', 'sys' ]
 	)
+	args_store.register_argument_set(
+		[
+			group_execution.add_argument(
+				'--execution-batch-size',
+				help = translator.get('help.execution_batch_size'),
+				type = int,
+				default = config.get_int_value('execution', 'execution_batch_size', '1'),
+				choices = facefusion.choices.execution_batch_size_range,
+				metavar = create_int_metavar(facefusion.choices.execution_batch_size_range)
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_execution.add_argument(
+				'--execution-session-concurrency',
+				help = translator.get('help.execution_session_concurrency'),
+				type = int,
+				default = config.get_int_value('execution', 'execution_session_concurrency', '1'),
+				choices = facefusion.choices.execution_session_concurrency_range,
+				metavar = create_int_metavar(facefusion.choices.execution_session_concurrency_range)
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
 
 	return program
 
@@ -920,6 +1010,116 @@ def create_halt_on_error_program() -> ArgumentParser:
 	return program
 
 
+def create_job_workers_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_jobs = program.add_argument_group('jobs')
+
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--job-workers',
+				help = translator.get('help.job_workers'),
+				type = int,
+				default = config.get_int_value('jobs', 'job_workers', '1'),
+				choices = facefusion.choices.job_workers_range,
+				metavar = create_int_metavar(facefusion.choices.job_workers_range)
+			)
+		],
+		scopes = [ 'cli' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--job-memory-budget',
+				help = translator.get('help.job_memory_budget'),
+				type = int,
+				default = config.get_int_value('jobs', 'job_memory_budget', '0'),
+				choices = facefusion.choices.job_memory_budget_range,
+				metavar = create_int_metavar(facefusion.choices.job_memory_budget_range)
+			)
+		],
+		scopes = [ 'cli' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--job-temp-budget',
+				help = translator.get('help.job_temp_budget'),
+				type = int,
+				default = config.get_int_value('jobs', 'job_temp_budget', '0'),
+				choices = facefusion.choices.job_temp_budget_range,
+				metavar = create_int_metavar(facefusion.choices.job_temp_budget_range)
+			)
+		],
+		scopes = [ 'cli' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--worker-id',
+				help = translator.get('help.worker_id'),
+				default = config.get_str_value('jobs', 'worker_id')
+			)
+		],
+		scopes = [ 'cli' ]
+	)
+
+	return program
+
+
+def create_segment_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_jobs = program.add_argument_group('jobs')
+
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--segment-duration',
+				help = translator.get('help.segment_duration'),
+				type = int,
+				default = config.get_int_value('jobs', 'segment_duration'),
+				choices = facefusion.choices.segment_duration_range,
+				metavar = create_int_metavar(facefusion.choices.segment_duration_range)
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
+	args_store.register_argument_set(
+		[
+			group_jobs.add_argument(
+				'--segment-count',
+				help = translator.get('help.segment_count'),
+				type = int,
+				default = config.get_int_value('jobs', 'segment_count'),
+				choices = facefusion.choices.segment_count_range,
+				metavar = create_int_metavar(facefusion.choices.segment_count_range)
+			)
+		],
+		scopes = [ 'cli', 'sys' ]
+	)
+
+	return program
+
+
+def create_profile_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_misc = program.add_argument_group('misc')
+
+	args_store.register_argument_set(
+		[
+			group_misc.add_argument(
+				'--profile',
+				help = translator.get('help.profile'),
+				action = 'store_true',
+				default = config.get_bool_value('misc', 'profile')
+			)
+		],
+		scopes = [ 'cli' ]
+	)
+
+	return program
+
+
 def create_job_id_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 
@@ -980,13 +1180,14 @@ def collect_job_program() -> ArgumentParser:
 			create_execution_program(),
 			create_download_providers_program(),
 			create_memory_program(),
-			create_log_level_program()
+			create_log_level_program(),
+			create_profile_program()
 		],
 		add_help = False
 	)
 
 
-def create_program() -> ArgumentParser:
+def create_program(command : Optional[str]) -> ArgumentParser:
 	program = ArgumentParser(formatter_class = create_help_formatter_large, add_help = False)
 	program._positionals.title = 'commands'
 
@@ -997,11 +1198,40 @@ def create_program() -> ArgumentParser:
 	)
 
 	sub_program = program.add_subparsers(dest = 'command')
+
+	for command_name in facefusion.choices.commands:
+		sub_program.add_parser(
+			command_name,
+			help = translator.get('help.' + command_name.replace('-', '_')),
+			parents = collect_command_programs(command_name) if command_name == command else [],
+			formatter_class = create_help_formatter_large
+		)
+
+	if command in facefusion.choices.job_runner_commands:
+		register_step_programs()
+
+	return ArgumentParser(parents = [ program ], formatter_class = create_help_formatter_small)
+
+
+def detect_command(args : List[str]) -> Optional[str]:
+	for arg in args:
+		if not arg.startswith('-'):
+			return arg
+	return None
+
+
+def register_step_programs() -> None:
+	create_source_paths_program()
+	create_target_path_program()
+	create_output_path_program()
+	collect_step_program()
+	create_segment_program()
+
+
+def collect_command_programs(command : str) -> List[ArgumentParser]:
 	# general
-	sub_program.add_parser(
-		'run',
-		help = translator.get('help.run'),
-		parents =
+	if command == 'run':
+		return\
 		[
 			create_config_path_program(),
 			create_temp_path_program(),
@@ -1011,13 +1241,9 @@ def create_program() -> ArgumentParser:
 			create_output_path_program(),
 			collect_step_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'batch-run',
-		help = translator.get('help.batch_run'),
-		parents =
+		]
+	if command == 'batch-run':
+		return\
 		[
 			create_config_path_program(),
 			create_temp_path_program(),
@@ -1026,37 +1252,26 @@ def create_program() -> ArgumentParser:
 			create_target_pattern_program(),
 			create_output_pattern_program(),
 			collect_step_program(),
+			create_segment_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'force-download',
-		help = translator.get('help.force_download'),
-		parents =
+		]
+	if command == 'force-download':
+		return\
 		[
 			create_download_providers_program(),
 			create_download_scope_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'benchmark',
-		help = translator.get('help.benchmark'),
-		parents =
+		]
+	if command == 'benchmark':
+		return\
 		[
 			create_temp_path_program(),
 			collect_step_program(),
 			create_benchmark_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'api',
-		help = translator.get('help.api'),
-		parents =
+		]
+	if command == 'api':
+		return\
 		[
 			create_config_path_program(),
 			create_temp_path_program(),
@@ -1064,80 +1279,58 @@ def create_program() -> ArgumentParser:
 			create_api_program(),
 			collect_step_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
+		]
 	# job manager
-	sub_program.add_parser(
-		'job-list',
-		help = translator.get('help.job_list'),
-		parents =
+	if command == 'job-list':
+		return\
 		[
 			create_job_status_program(),
 			create_jobs_path_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-create',
-		help = translator.get('help.job_create'),
-		parents =
+		]
+	if command == 'job-create':
+		return\
 		[
 			create_job_id_program(),
 			create_jobs_path_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-submit',
-		help = translator.get('help.job_submit'),
-		parents =
+		]
+	if command == 'job-submit':
+		return\
 		[
 			create_job_id_program(),
 			create_jobs_path_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-submit-all',
-		help = translator.get('help.job_submit_all'),
-		parents =
+		]
+	if command == 'job-submit-all':
+		return\
 		[
 			create_jobs_path_program(),
 			create_log_level_program(),
 			create_halt_on_error_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-delete',
-		help = translator.get('help.job_delete'),
-		parents =
+		]
+	if command == 'job-delete':
+		return\
 		[
 			create_job_id_program(),
 			create_jobs_path_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-delete-all',
-		help = translator.get('help.job_delete_all'),
-		parents =
+		]
+	if command == 'job-delete-all':
+		return\
 		[
 			create_jobs_path_program(),
 			create_log_level_program(),
 			create_halt_on_error_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-add-step',
-		help = translator.get('help.job_add_step'),
-		parents =
+		]
+	if command == 'job-migrate':
+		return\
+		[
+			create_jobs_path_program(),
+			create_log_level_program()
+		]
+	if command == 'job-add-step':
+		return\
 		[
 			create_job_id_program(),
 			create_workflow_program(),
@@ -1147,14 +1340,11 @@ def create_program() -> ArgumentParser:
 			create_target_path_program(),
 			create_output_path_program(),
 			collect_step_program(),
+			create_segment_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-remix-step',
-		help = translator.get('help.job_remix_step'),
-		parents =
+		]
+	if command == 'job-remix-step':
+		return\
 		[
 			create_job_id_program(),
 			create_workflow_program(),
@@ -1165,13 +1355,9 @@ def create_program() -> ArgumentParser:
 			create_output_path_program(),
 			collect_step_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-insert-step',
-		help = translator.get('help.job_insert_step'),
-		parents =
+		]
+	if command == 'job-insert-step':
+		return\
 		[
 			create_job_id_program(),
 			create_workflow_program(),
@@ -1183,78 +1369,58 @@ def create_program() -> ArgumentParser:
 			create_output_path_program(),
 			collect_step_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-remove-step',
-		help = translator.get('help.job_remove_step'),
-		parents =
+		]
+	if command == 'job-remove-step':
+		return\
 		[
 			create_job_id_program(),
 			create_step_index_program(),
 			create_jobs_path_program(),
 			create_log_level_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
+		]
 	# job runner
-	sub_program.add_parser(
-		'job-run',
-		help = translator.get('help.job_run'),
-		parents =
+	if command == 'job-run':
+		return\
 		[
 			create_job_id_program(),
 			create_config_path_program(),
 			create_temp_path_program(),
 			create_jobs_path_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-run-all',
-		help = translator.get('help.job_run_all'),
-		parents =
+		]
+	if command == 'job-run-all':
+		return\
 		[
 			create_config_path_program(),
 			create_temp_path_program(),
 			create_jobs_path_program(),
 			collect_job_program(),
+			create_job_workers_program(),
 			create_halt_on_error_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-retry',
-		help = translator.get('help.job_retry'),
-		parents =
+		]
+	if command == 'job-retry':
+		return\
 		[
 			create_job_id_program(),
 			create_config_path_program(),
 			create_temp_path_program(),
 			create_jobs_path_program(),
 			collect_job_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-	sub_program.add_parser(
-		'job-retry-all',
-		help = translator.get('help.job_retry_all'),
-		parents =
+		]
+	if command == 'job-retry-all':
+		return\
 		[
 			create_config_path_program(),
 			create_temp_path_program(),
 			create_jobs_path_program(),
 			collect_job_program(),
+			create_job_workers_program(),
 			create_halt_on_error_program()
-		],
-		formatter_class = create_help_formatter_large
-	)
-
-	return ArgumentParser(parents = [ program ], formatter_class = create_help_formatter_small)
+		]
+	return []
 
 
-def apply_config_path(program : ArgumentParser) -> None:
-	known_args, _ = program.parse_known_args()
+def apply_config_path(args : List[str]) -> None:
+	program = create_config_path_program()
+	known_args, _ = program.parse_known_args(args)
 	state_manager.init_item('config_path', known_args.config_path)
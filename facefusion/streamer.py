@@ -1,18 +1,19 @@
 import os
 import subprocess
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
-from typing import Deque, Iterator
+from typing import Deque, Iterator, List
 
 import cv2
 import numpy
 from tqdm import tqdm
 
-from facefusion import ffmpeg_builder, logger, state_manager, translator
+from facefusion import ffmpeg_builder, inference_manager, logger, state_manager, translator
 from facefusion.audio import create_empty_audio_frame
 from facefusion.content_analyser import analyse_stream
+from facefusion.face_store import create_analysis_context
 from facefusion.ffmpeg import open_ffmpeg
 from facefusion.filesystem import is_directory
+from facefusion.frame_pool import open_frame_pool, submit_frames
 from facefusion.processors.core import get_processors_modules
 from facefusion.types import Fps, StreamMode, VisionFrame
 from facefusion.vision import extract_vision_mask, read_static_images
@@ -22,7 +23,7 @@ def multi_process_capture(camera_capture : cv2.VideoCapture, camera_fps : Fps) -
 	capture_deque : Deque[VisionFrame] = deque()
 
 	with tqdm(desc = translator.get('streaming'), unit = 'frame', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+		with open_frame_pool(state_manager.get_item('execution_worker_mode'), state_manager.get_item('execution_thread_count')) as frame_pool:
 			futures = []
 
 			while camera_capture and camera_capture.isOpened():
@@ -31,12 +32,11 @@ def multi_process_capture(camera_capture : cv2.VideoCapture, camera_fps : Fps) -
 					camera_capture.release()
 
 				if numpy.any(capture_frame):
-					future = executor.submit(process_stream_frame, capture_frame)
+					future = submit_frames(frame_pool, process_stream_frames, [ capture_frame ])
 					futures.append(future)
 
 				for future_done in [ future for future in futures if future.done() ]:
-					capture_frame = future_done.result()
-					capture_deque.append(capture_frame)
+					capture_deque.extend(future_done.result())
 					futures.remove(future_done)
 
 				while capture_deque:
@@ -44,27 +44,34 @@ def multi_process_capture(camera_capture : cv2.VideoCapture, camera_fps : Fps) -
 					yield capture_deque.popleft()
 
 
+def process_stream_frames(target_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	return [ process_stream_frame(target_vision_frame) for target_vision_frame in target_vision_frames ]
+
+
 def process_stream_frame(target_vision_frame : VisionFrame) -> VisionFrame:
 	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
 	source_audio_frame = create_empty_audio_frame()
 	source_voice_frame = create_empty_audio_frame()
 	temp_vision_frame = target_vision_frame.copy()
 	temp_vision_mask = extract_vision_mask(temp_vision_frame)
-
-	for processor_module in get_processors_modules(state_manager.get_item('processors')):
-		logger.disable()
-		if processor_module.pre_process('stream'):
+	analysis_context = create_analysis_context()
+
+	with inference_manager.bind_execution_device():
+		for processor_module in get_processors_modules(state_manager.get_item('processors')):
+			logger.disable()
+			if processor_module.pre_process('stream'):
+				logger.enable()
+				temp_vision_frame, temp_vision_mask = processor_module.process_frame(
+				{
+					'source_vision_frames': source_vision_frames,
+					'source_audio_frame': source_audio_frame,
+					'source_voice_frame': source_voice_frame,
+					'target_vision_frame': target_vision_frame,
+					'temp_vision_frame': temp_vision_frame,
+					'temp_vision_mask': temp_vision_mask,
+					'analysis_context': analysis_context
+				})
 			logger.enable()
-			temp_vision_frame, temp_vision_mask = processor_module.process_frame(
-			{
-				'source_vision_frames': source_vision_frames,
-				'source_audio_frame': source_audio_frame,
-				'source_voice_frame': source_voice_frame,
-				'target_vision_frame': target_vision_frame,
-				'temp_vision_frame': temp_vision_frame,
-				'temp_vision_mask': temp_vision_mask
-			})
-		logger.enable()
 
 	return temp_vision_frame
 
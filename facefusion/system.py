@@ -227,6 +227,16 @@ def detect_memory_metrics() -> MemoryMetrics:
 	}
 
 
+def limit_job_workers(job_workers : int, execution_thread_count : int, job_memory_budget : int, job_temp_budget : int, temp_path : str) -> int:
+	job_worker_limits = [ job_workers, psutil.cpu_count(logical = True) // execution_thread_count ]
+
+	if job_memory_budget > 0:
+		job_worker_limits.append(psutil.virtual_memory().available // (job_memory_budget * 1024 * 1024 * 1024))
+	if job_temp_budget > 0:
+		job_worker_limits.append(shutil.disk_usage(temp_path).free // (job_temp_budget * 1024 * 1024 * 1024))
+	return max(1, min(job_worker_limits))
+
+
 def detect_network_metrics() -> NetworkMetrics:
 	network_io = psutil.net_io_counters()
 
@@ -1,7 +1,9 @@
 import os
-from typing import List
+from typing import List, Optional, Set
 
-from facefusion.filesystem import create_directory, get_file_extension, get_file_name, move_file, remove_directory, resolve_file_pattern
+from facefusion.filesystem import create_directory, get_file_extension, get_file_name, is_file, move_file, remove_directory, remove_file, resolve_file_pattern
+from facefusion.json import read_json, write_json
+from facefusion.types import TempCheckpoint
 
 
 def get_temp_file_path(temp_path : str, output_path : str) -> str:
@@ -25,6 +27,20 @@ def get_temp_frames_pattern(temp_path : str, output_path : str, temp_frame_forma
 	return os.path.join(temp_directory_path, temp_frame_prefix + '.' + temp_frame_format)
 
 
+def get_temp_partial_frame_path(temp_frame_path : str) -> str:
+	temp_directory_path, temp_frame_name = os.path.split(temp_frame_path)
+	return os.path.join(temp_directory_path, 'partial', temp_frame_name)
+
+
+def restore_temp_frames(temp_frame_paths : List[str], frame_numbers : Set[int]) -> bool:
+	for frame_number, temp_frame_path in enumerate(temp_frame_paths):
+		temp_partial_frame_path = get_temp_partial_frame_path(temp_frame_path)
+
+		if frame_number in frame_numbers and is_file(temp_partial_frame_path) and not move_file(temp_partial_frame_path, temp_frame_path):
+			return False
+	return True
+
+
 def get_temp_directory_path(temp_path : str, output_path : str) -> str:
 	temp_file_name = get_file_name(output_path)
 	return os.path.join(temp_path, 'facefusion', temp_file_name)
@@ -32,9 +48,58 @@ def get_temp_directory_path(temp_path : str, output_path : str) -> str:
 
 def create_temp_directory(temp_path : str, output_path : str) -> bool:
 	temp_directory_path = get_temp_directory_path(temp_path, output_path)
-	return create_directory(temp_directory_path)
+	return create_directory(temp_directory_path) and create_directory(os.path.join(temp_directory_path, 'partial'))
 
 
 def clear_temp_directory(temp_path : str, output_path : str) -> bool:
 	temp_directory_path = get_temp_directory_path(temp_path, output_path)
 	return remove_directory(temp_directory_path)
+
+
+def get_temp_checkpoint_path(temp_path : str, output_path : str) -> str:
+	temp_directory_path = get_temp_directory_path(temp_path, output_path)
+	return os.path.join(temp_directory_path, 'checkpoint.json')
+
+
+def get_temp_checkpoint_log_path(temp_path : str, output_path : str) -> str:
+	temp_directory_path = get_temp_directory_path(temp_path, output_path)
+	return os.path.join(temp_directory_path, 'checkpoint.log')
+
+
+def read_temp_checkpoint(temp_path : str, output_path : str) -> Optional[TempCheckpoint]:
+	temp_checkpoint_path = get_temp_checkpoint_path(temp_path, output_path)
+	return read_json(temp_checkpoint_path) #type:ignore[return-value]
+
+
+def write_temp_checkpoint(temp_path : str, output_path : str, temp_checkpoint : TempCheckpoint) -> bool:
+	temp_checkpoint_path = get_temp_checkpoint_path(temp_path, output_path)
+	return write_json(temp_checkpoint_path, temp_checkpoint) #type:ignore[arg-type]
+
+
+def read_processed_frame_numbers(temp_path : str, output_path : str) -> Set[int]:
+	temp_checkpoint_log_path = get_temp_checkpoint_log_path(temp_path, output_path)
+	frame_numbers = set()
+
+	if is_file(temp_checkpoint_log_path):
+		with open(temp_checkpoint_log_path) as temp_checkpoint_log_file:
+			for temp_checkpoint_line in temp_checkpoint_log_file:
+				if temp_checkpoint_line.endswith('\n') and temp_checkpoint_line.strip().isdigit():
+					frame_numbers.add(int(temp_checkpoint_line))
+
+	return frame_numbers
+
+
+def append_processed_frame_numbers(temp_path : str, output_path : str, frame_numbers : List[int]) -> bool:
+	temp_checkpoint_log_path = get_temp_checkpoint_log_path(temp_path, output_path)
+
+	with open(temp_checkpoint_log_path, 'a') as temp_checkpoint_log_file:
+		temp_checkpoint_log_file.writelines(str(frame_number) + '\n' for frame_number in frame_numbers)
+	return is_file(temp_checkpoint_log_path)
+
+
+def clear_processed_frame_numbers(temp_path : str, output_path : str) -> bool:
+	temp_checkpoint_log_path = get_temp_checkpoint_log_path(temp_path, output_path)
+
+	if is_file(temp_checkpoint_log_path):
+		return remove_file(temp_checkpoint_log_path)
+	return True
@@ -0,0 +1,59 @@
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy
+
+from facefusion.types import VisionFrame, VisionTensor
+
+TENSOR_BUFFER = threading.local()
+
+
+def prepare_vision_tensor(vision_frame : VisionFrame, vision_mean : Sequence[float], vision_standard_deviation : Sequence[float], buffer_name : Optional[str] = None) -> VisionTensor:
+	return prepare_vision_tensors([ vision_frame ], vision_mean, vision_standard_deviation, buffer_name)
+
+
+def prepare_vision_tensors(vision_frames : List[VisionFrame], vision_mean : Sequence[float], vision_standard_deviation : Sequence[float], buffer_name : Optional[str] = None) -> VisionTensor:
+	vision_height, vision_width = vision_frames[0].shape[:2]
+	vision_shape = (len(vision_frames), 3, vision_height, vision_width)
+
+	if buffer_name:
+		vision_tensors = get_tensor_buffer(buffer_name, vision_shape)
+	else:
+		vision_tensors = numpy.empty(vision_shape, dtype = numpy.float32)
+
+	for vision_index, vision_frame in enumerate(vision_frames):
+		for channel_index in range(3):
+			vision_channel = vision_tensors[vision_index, channel_index]
+			numpy.multiply(vision_frame[:, :, 2 - channel_index], 1 / (vision_standard_deviation[channel_index] * 255.0), out = vision_channel, dtype = numpy.float32)
+			numpy.subtract(vision_channel, vision_mean[channel_index] / vision_standard_deviation[channel_index], out = vision_channel)
+
+	return vision_tensors
+
+
+def normalize_vision_tensor(vision_tensor : VisionTensor, vision_mean : Sequence[float], vision_standard_deviation : Sequence[float]) -> VisionFrame:
+	vision_height, vision_width = vision_tensor.shape[-2:]
+	vision_tensor = vision_tensor.reshape(3, vision_height, vision_width)
+	vision_frame = numpy.empty((vision_height, vision_width, 3), dtype = numpy.uint8)
+	vision_channel = get_tensor_buffer('normalize', (vision_height, vision_width))
+
+	for channel_index in range(3):
+		numpy.multiply(vision_tensor[channel_index], vision_standard_deviation[channel_index] * 255.0, out = vision_channel)
+		numpy.add(vision_channel, vision_mean[channel_index] * 255.0, out = vision_channel)
+		numpy.clip(vision_channel, 0, 255, out = vision_channel)
+		numpy.copyto(vision_frame[:, :, 2 - channel_index], vision_channel, casting = 'unsafe')
+
+	return vision_frame
+
+
+def normalize_vision_tensors(vision_tensors : VisionTensor, vision_mean : Sequence[float], vision_standard_deviation : Sequence[float]) -> List[VisionFrame]:
+	return [ normalize_vision_tensor(vision_tensor, vision_mean, vision_standard_deviation) for vision_tensor in vision_tensors ]
+
+
+def get_tensor_buffer(buffer_name : str, buffer_shape : Tuple[int, ...]) -> VisionTensor:
+	buffer_size = int(numpy.prod(buffer_shape))
+	tensor_buffer = getattr(TENSOR_BUFFER, buffer_name, None)
+
+	if tensor_buffer is None or tensor_buffer.size < buffer_size:
+		tensor_buffer = numpy.empty(buffer_size, dtype = numpy.float32)
+		setattr(TENSOR_BUFFER, buffer_name, tensor_buffer)
+	return tensor_buffer[:buffer_size].reshape(buffer_shape)
@@ -1,11 +1,19 @@
+import threading
 from collections import namedtuple
+from concurrent.futures import Executor, Future
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Literal, NotRequired, Optional, Tuple, TypeAlias, TypedDict, Union
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue
+from typing import Any, Callable, Dict, List, Literal, NotRequired, Optional, OrderedDict, TYPE_CHECKING, Tuple, TypeAlias, TypedDict, Union
 
-import cv2
 import numpy
 from numpy.typing import NDArray
-from onnxruntime import InferenceSession
+
+if TYPE_CHECKING:
+	from multiprocessing.queues import Queue as ProcessQueue
+
+	import cv2
+	from onnxruntime import InferenceSession
 
 Scale : TypeAlias = float
 Score : TypeAlias = float
@@ -43,12 +51,27 @@ Face = namedtuple('Face',
 	'embedding_norm',
 	'gender',
 	'age',
-	'race'
-])
+	'race',
+	'track_id'
+], defaults = [ None ])
 FaceSet : TypeAlias = Dict[str, List[Face]]
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet
+	'static_faces' : OrderedDict[str, List[Face]],
+	'source_faces' : OrderedDict[str, Face],
+	'hit_total' : int,
+	'miss_total' : int
+})
+FaceStoreStats = TypedDict('FaceStoreStats',
+{
+	'size' : int,
+	'hit_total' : int,
+	'miss_total' : int,
+	'hit_rate' : float
+})
+EmbeddingStore = TypedDict('EmbeddingStore',
+{
+	'static_embeddings' : Dict[str, Embedding]
 })
 
 Language = Literal['en']
@@ -57,9 +80,9 @@ LocalePoolSet : TypeAlias = Dict[str, Locales]
 
 WorkFlow = Literal['auto', 'audio-to-image:frames', 'audio-to-image:video', 'image-to-image', 'image-to-video', 'image-to-video:frames']
 
-VideoCaptureSet : TypeAlias = Dict[str, cv2.VideoCapture]
-VideoWriterSet : TypeAlias = Dict[str, cv2.VideoWriter]
-CameraCaptureSet : TypeAlias = Dict[str, cv2.VideoCapture]
+VideoCaptureSet : TypeAlias = Dict[str, 'cv2.VideoCapture']
+VideoWriterSet : TypeAlias = Dict[str, 'cv2.VideoWriter']
+CameraCaptureSet : TypeAlias = Dict[str, 'cv2.VideoCapture']
 VideoPoolSet = TypedDict('VideoPoolSet',
 {
 	'capture' : VideoCaptureSet,
@@ -72,18 +95,50 @@ CameraPoolSet = TypedDict('CameraPoolSet',
 
 ColorMode = Literal['rgb', 'rgba']
 VisionFrame : TypeAlias = NDArray[Any]
+VisionTensor : TypeAlias = NDArray[Any]
 Mask : TypeAlias = NDArray[Any]
 Points : TypeAlias = NDArray[Any]
 Distance : TypeAlias = NDArray[Any]
 Matrix : TypeAlias = NDArray[Any]
+FaceMask = TypedDict('FaceMask',
+{
+	'mask' : Mask,
+	'affine_matrix' : Matrix
+})
 Anchors : TypeAlias = NDArray[Any]
 Translation : TypeAlias = NDArray[Any]
 
+AnalysisContext = TypedDict('AnalysisContext',
+{
+	'frame_number' : Optional[int],
+	'reference_faces' : Optional[List[Face]],
+	'target_faces' : Optional[List[Face]],
+	'face_masks' : Dict[str, FaceMask]
+})
+FaceTrack = TypedDict('FaceTrack',
+{
+	'faces' : List[Face],
+	'vision_frame' : Optional[VisionFrame],
+	'event' : threading.Event
+})
+FaceTrackMatchKey : TypeAlias = Tuple[int, int]
+FaceTracker = TypedDict('FaceTracker',
+{
+	'face_tracks' : Dict[int, FaceTrack],
+	'match_set' : Dict[FaceTrackMatchKey, bool],
+	'track_total' : int
+})
+
 AudioBuffer : TypeAlias = bytes
 Audio : TypeAlias = NDArray[Any]
 AudioChunk : TypeAlias = NDArray[Any]
 AudioFrame : TypeAlias = NDArray[Any]
 Spectrogram : TypeAlias = NDArray[Any]
+AudioFrameSet = TypedDict('AudioFrameSet',
+{
+	'spectrogram' : Spectrogram,
+	'frame_indices' : NDArray[Any]
+})
 Mel : TypeAlias = NDArray[Any]
 MelFilterBank : TypeAlias = NDArray[Any]
 Voice : TypeAlias = NDArray[Any]
@@ -114,6 +169,24 @@ ArgumentStore = TypedDict('ArgumentStore',
 
 ProcessState = Literal['checking', 'processing', 'stopping', 'pending']
 UpdateProgress : TypeAlias = Callable[[int], None]
+TempFrameQueue : TypeAlias = Queue[Optional[Future[List[VisionFrame]]]]
+FrameBuffer = TypedDict('FrameBuffer',
+{
+	'shared_memory' : SharedMemory,
+	'slot_size' : int,
+	'slot_queue' : Queue[int]
+})
+FramePool = TypedDict('FramePool',
+{
+	'executor' : Executor,
+	'frame_buffer' : Optional[FrameBuffer],
+	'slot_total' : int
+})
+SharedFrameSet = TypedDict('SharedFrameSet',
+{
+	'frame_shapes' : List[Tuple[int, ...]],
+	'vision_frames' : List[VisionFrame]
+})
 ProcessStep : TypeAlias = Callable[[str, int, Args], bool]
 
 Content : TypeAlias = Dict[str, Any]
@@ -142,6 +215,26 @@ LogLevelSet : TypeAlias = Dict[LogLevel, int]
 TableHeader : TypeAlias = str
 TableContent : TypeAlias = Any
 
+ProfileStage = TypedDict('ProfileStage',
+{
+	'call_total' : int,
+	'wall_time' : float
+})
+ProfileTraceEvent = TypedDict('ProfileTraceEvent',
+{
+	'name' : str,
+	'ph' : str,
+	'ts' : int,
+	'dur' : int,
+	'pid' : int,
+	'tid' : int
+})
+Profiler = TypedDict('Profiler',
+{
+	'profile_stages' : Dict[str, ProfileStage],
+	'trace_events' : List[ProfileTraceEvent]
+})
+
 FaceDetectorModel = Literal['many', 'retinaface', 'scrfd', 'yolo_face', 'yunet']
 FaceLandmarkerModel = Literal['many', '2dfan4', 'peppa_wutz']
 FaceDetectorSet : TypeAlias = Dict[FaceDetectorModel, List[str]]
@@ -161,6 +254,12 @@ AudioFormat = Literal['flac', 'm4a', 'mp3', 'ogg', 'opus', 'wav']
 ImageFormat = Literal['bmp', 'jpeg', 'png', 'tiff', 'webp']
 VideoFormat = Literal['avi', 'm4v', 'mkv', 'mov', 'mp4', 'mpeg', 'mxf', 'webm', 'wmv']
 TempFrameFormat = Literal['bmp', 'jpeg', 'png', 'tiff']
+TempFrameMode = Literal['disk', 'pipe']
+TempCheckpoint = TypedDict('TempCheckpoint',
+{
+	'checkpoint_key' : str,
+	'frame_total' : int
+})
 AudioTypeSet : TypeAlias = Dict[AudioFormat, str]
 ImageTypeSet : TypeAlias = Dict[ImageFormat, str]
 VideoTypeSet : TypeAlias = Dict[VideoFormat, str]
@@ -175,8 +274,19 @@ EncoderSet = TypedDict('EncoderSet',
 VideoPreset = Literal['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
 
 AssetId : TypeAlias = str
-AssetType = Literal['source', 'target']
+AssetType = Literal['source', 'target', 'output']
 MediaType = Literal['image', 'video', 'audio']
+MediaProbe = TypedDict('MediaProbe',
+{
+	'streams' : List[str],
+	'duration' : Duration,
+	'fps' : Optional[Fps],
+	'frame_total' : int,
+	'resolution' : Optional[Resolution],
+	'sample_rate' : Optional[int],
+	'sample_total' : Optional[int],
+	'channels' : Optional[int]
+})
 AudioMetadata = TypedDict('AudioMetadata',
 {
 	'duration' : Duration,
@@ -239,6 +349,30 @@ AssetMetadata : TypeAlias = AudioMetadata | ImageMetadata | VideoMetadata
 AssetSet : TypeAlias = Dict[AssetId, AudioAsset | ImageAsset | VideoAsset]
 AssetStore : TypeAlias = Dict[SessionId, AssetSet]
 
+ApiJobId : TypeAlias = str
+ApiJobStatus = Literal['queued', 'processing', 'completed', 'failed']
+ApiJobProgress = TypedDict('ApiJobProgress',
+{
+	'stage' : str,
+	'frame_done' : int,
+	'frame_total' : int,
+	'fps' : float,
+	'eta' : float
+})
+ApiJob = TypedDict('ApiJob',
+{
+	'id' : ApiJobId,
+	'created_at' : datetime,
+	'status' : ApiJobStatus,
+	'progress' : Optional[ApiJobProgress],
+	'output_path' : str,
+	'asset_id' : Optional[AssetId]
+})
+ApiJobSet : TypeAlias = Dict[ApiJobId, ApiJob]
+ApiJobStore : TypeAlias = Dict[SessionId, ApiJobSet]
+ApiJobReport : TypeAlias = Tuple[SessionId, ApiJobId, Optional[ApiJobProgress]]
+ApiJobReportQueue : TypeAlias = 'ProcessQueue[ApiJobReport]'
+
 BenchmarkMode = Literal['warm', 'cold']
 BenchmarkResolution = Literal['240p', '360p', '540p', '720p', '1080p', '1440p', '2160p']
 BenchmarkSet : TypeAlias = Dict[BenchmarkResolution, str]
@@ -348,12 +482,38 @@ Download = TypedDict('Download',
 	'path' : str
 })
 DownloadSet : TypeAlias = Dict[str, Download]
+HashValidation = TypedDict('HashValidation',
+{
+	'file_size' : int,
+	'file_mtime' : int,
+	'file_inode' : int,
+	'file_hash' : str
+})
+ContentAnalysisSet : TypeAlias = Dict[str, bool]
 
 VideoMemoryStrategy = Literal['strict', 'moderate', 'tolerant']
 AppContext = Literal['cli', 'api']
 
-InferencePool : TypeAlias = Dict[str, InferenceSession]
+InferencePool : TypeAlias = Dict[str, 'InferenceSession']
 InferencePoolSet : TypeAlias = Dict[AppContext, Dict[str, InferencePool]]
+ExecutionDeviceScheduler = Literal['least-outstanding', 'round-robin']
+ExecutionWorkerMode = Literal['thread', 'process']
+InferenceSessionLimiter = TypedDict('InferenceSessionLimiter',
+{
+	'model_name' : str,
+	'semaphore' : threading.Semaphore
+})
+InferenceSessionMetric = TypedDict('InferenceSessionMetric',
+{
+	'wait_time' : float,
+	'run_time' : float,
+	'run_total' : int
+})
+ExecutionDeviceLoad = TypedDict('ExecutionDeviceLoad',
+{
+	'in_flight_loads' : Dict[int, int],
+	'request_total' : int
+})
 
 JobOutputSet : TypeAlias = Dict[str, List[str]]
 JobStatus = Literal['drafted', 'queued', 'completed', 'failed']
@@ -371,6 +531,7 @@ Job = TypedDict('Job',
 	'steps' : List[JobStep]
 })
 JobSet : TypeAlias = Dict[str, Job]
+JobStore = Literal['json', 'sqlite']
 
 StateKey = Literal\
 [
@@ -378,6 +539,7 @@ StateKey = Literal\
 	'config_path',
 	'temp_path',
 	'jobs_path',
+	'job_store',
 	'source_paths',
 	'target_path',
 	'output_path',
@@ -394,6 +556,8 @@ StateKey = Literal\
 	'face_detector_margin',
 	'face_detector_angles',
 	'face_detector_score',
+	'face_tracker',
+	'face_tracker_interval',
 	'face_landmarker_model',
 	'face_landmarker_score',
 	'face_selector_mode',
@@ -416,6 +580,7 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'temp_frame_mode',
 	'keep_temp',
 	'output_image_quality',
 	'output_image_scale',
@@ -431,11 +596,22 @@ StateKey = Literal\
 	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_batch_size',
+	'execution_session_concurrency',
+	'execution_device_scheduler',
+	'execution_worker_mode',
 	'video_memory_strategy',
 	'log_level',
 	'halt_on_error',
+	'profile',
 	'job_id',
 	'job_status',
+	'job_workers',
+	'job_memory_budget',
+	'job_temp_budget',
+	'worker_id',
+	'segment_duration',
+	'segment_count',
 	'step_index'
 ]
 State = TypedDict('State',
@@ -444,6 +620,7 @@ State = TypedDict('State',
 	'config_path' : str,
 	'temp_path' : str,
 	'jobs_path' : str,
+	'job_store' : JobStore,
 	'source_paths' : List[str],
 	'target_path' : str,
 	'output_path' : str,
@@ -460,6 +637,8 @@ State = TypedDict('State',
 	'face_detector_margin' : Margin,
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
+	'face_tracker' : bool,
+	'face_tracker_interval' : int,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
 	'face_selector_mode' : FaceSelectorMode,
@@ -482,6 +661,7 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'temp_frame_mode' : TempFrameMode,
 	'keep_temp' : bool,
 	'output_image_quality' : int,
 	'output_image_scale' : Scale,
@@ -497,11 +677,22 @@ State = TypedDict('State',
 	'execution_device_ids' : List[int],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
+	'execution_batch_size' : int,
+	'execution_session_concurrency' : int,
+	'execution_device_scheduler' : ExecutionDeviceScheduler,
+	'execution_worker_mode' : ExecutionWorkerMode,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'log_level' : LogLevel,
 	'halt_on_error' : bool,
+	'profile' : bool,
 	'job_id' : str,
 	'job_status' : JobStatus,
+	'job_workers' : int,
+	'job_memory_budget' : int,
+	'job_temp_budget' : int,
+	'worker_id' : Optional[str],
+	'segment_duration' : Optional[int],
+	'segment_count' : Optional[int],
 	'step_index' : int
 })
 ApplyStateItem : TypeAlias = Callable[[Any, Any], None]
@@ -9,6 +9,7 @@ from cv2.typing import Size
 from facefusion.common_helper import is_windows
 from facefusion.filesystem import get_file_extension, is_image, is_video
 from facefusion.media_helper import restrict_trim_frame
+from facefusion.media_probe import probe_media
 from facefusion.thread_helper import thread_semaphore
 from facefusion.types import ColorMode, Duration, Fps, Mask, Orientation, Resolution, Scale, VisionFrame
 from facefusion.video_manager import get_video_capture
@@ -55,11 +56,10 @@ def write_image(image_path : str, vision_frame : VisionFrame) -> bool:
 
 def detect_image_resolution(image_path : str) -> Optional[Resolution]:
 	if is_image(image_path):
-		image = read_image(image_path)
-		height, width = image.shape[:2]
+		media_probe = probe_media(image_path)
 
-		if width > 0 and height > 0:
-			return width, height
+		if media_probe:
+			return media_probe.get('resolution')
 	return None
 
 
@@ -95,13 +95,10 @@ def read_video_frame(video_path : str, frame_number : int = 0) -> Optional[Visio
 
 def count_video_frame_total(video_path : str) -> int:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-				return video_frame_total
+		media_probe = probe_media(video_path)
 
+		if media_probe:
+			return media_probe.get('frame_total')
 	return 0
 
 
@@ -116,13 +113,10 @@ def predict_video_frame_total(video_path : str, fps : Fps, trim_frame_start : in
 
 def detect_video_fps(video_path : str) -> Optional[Fps]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-				return video_fps
+		media_probe = probe_media(video_path)
 
+		if media_probe:
+			return media_probe.get('fps')
 	return None
 
 
@@ -150,14 +144,10 @@ def restrict_trim_video_frame(video_path : str, trim_frame_start : Optional[int]
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-				height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-				return int(width), int(height)
+		media_probe = probe_media(video_path)
 
+		if media_probe:
+			return media_probe.get('resolution')
 	return None
 
 
@@ -314,7 +304,7 @@ def create_tile_frames(vision_frame : VisionFrame, size : Size) -> Tuple[List[Vi
 
 
 def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size) -> VisionFrame:
-	merge_vision_frame = numpy.zeros((pad_height, pad_width, 3)).astype(numpy.uint8)
+	merge_vision_frame = numpy.zeros((temp_height, temp_width, 3), dtype = numpy.uint8)
 	tile_width = tile_vision_frames[0].shape[1] - 2 * size[2]
 	tiles_per_row = min(pad_width // tile_width, len(tile_vision_frames))
 
@@ -322,13 +312,18 @@ def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int,
 		tile_vision_frame = tile_vision_frame[size[2]:-size[2], size[2]:-size[2]]
 		row_index = index // tiles_per_row
 		col_index = index % tiles_per_row
-		top = row_index * tile_vision_frame.shape[0]
-		bottom = top + tile_vision_frame.shape[0]
-		left = col_index * tile_vision_frame.shape[1]
-		right = left + tile_vision_frame.shape[1]
-		merge_vision_frame[top:bottom, left:right, :] = tile_vision_frame
+		top = row_index * tile_vision_frame.shape[0] - size[1]
+		left = col_index * tile_vision_frame.shape[1] - size[1]
+		bottom = min(top + tile_vision_frame.shape[0], temp_height)
+		right = min(left + tile_vision_frame.shape[1], temp_width)
+		tile_top = max(-top, 0)
+		tile_left = max(-left, 0)
+		top = max(top, 0)
+		left = max(left, 0)
+
+		if top < bottom and left < right:
+			merge_vision_frame[top:bottom, left:right, :] = tile_vision_frame[tile_top:tile_top + bottom - top, tile_left:tile_left + right - left, :]
 
-	merge_vision_frame = merge_vision_frame[size[1] : size[1] + temp_height, size[1]: size[1] + temp_width, :]
 	return merge_vision_frame
 
 
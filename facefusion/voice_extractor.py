@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Tuple
+from typing import Iterator, List, Tuple
 
 import numpy
 import scipy
@@ -7,7 +7,6 @@ import scipy
 from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.filesystem import resolve_relative_path
-from facefusion.thread_helper import thread_semaphore
 from facefusion.types import Audio, AudioChunk, DownloadScope, DownloadSet, InferencePool, ModelSet, Voice, VoiceChunk
 
 
@@ -124,35 +123,94 @@ def pre_check() -> bool:
 	return conditional_download_hashes(model_hash_set) and conditional_download_sources(model_source_set)
 
 
-def batch_extract_voice(audio : Audio, chunk_size : int, step_size : int) -> Voice:
+def batch_extract_voice(audio : Audio, chunk_size : int, step_size : int, batch_size : int) -> Voice:
 	temp_voice = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
 	temp_voice_chunk = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
+	chunk_starts = list(range(0, audio.shape[0], step_size))
 
-	for start in range(0, audio.shape[0], step_size):
-		end = min(start + chunk_size, audio.shape[0])
-		temp_voice[start:end, ...] += extract_voice(audio[start:end, ...])
-		temp_voice_chunk[start:end, ...] += 1
+	for index in range(0, len(chunk_starts), batch_size):
+		batch_starts = chunk_starts[index:index + batch_size]
+		temp_audio_chunks = [ audio[start:start + chunk_size, ...] for start in batch_starts ]
+
+		for start, temp_voice_frame in zip(batch_starts, extract_voices(temp_audio_chunks)):
+			end = start + temp_voice_frame.shape[0]
+			temp_voice[start:end, ...] += temp_voice_frame
+			temp_voice_chunk[start:end, ...] += 1
 
 	voice = temp_voice / temp_voice_chunk
 	return voice
 
 
+def stream_extract_voice(audio_chunks : Iterator[Audio], chunk_size : int, step_size : int, batch_size : int) -> Iterator[Voice]:
+	window_size = step_size * batch_size
+	temp_audio = numpy.zeros((0, 2), dtype = numpy.int16)
+	temp_voice = numpy.zeros((0, 2), dtype = numpy.float32)
+	temp_voice_chunk = numpy.zeros((0, 2), dtype = numpy.float32)
+
+	for audio in audio_chunks:
+		temp_audio = numpy.concatenate([ temp_audio, audio ])
+
+		while temp_audio.shape[0] >= window_size - step_size + chunk_size:
+			temp_voice, temp_voice_chunk = accumulate_voice(temp_audio, temp_voice, temp_voice_chunk, list(range(0, window_size, step_size)), chunk_size)
+			yield temp_voice[:window_size] / temp_voice_chunk[:window_size]
+			temp_audio = temp_audio[window_size:]
+			temp_voice = temp_voice[window_size:]
+			temp_voice_chunk = temp_voice_chunk[window_size:]
+
+	chunk_starts = list(range(0, temp_audio.shape[0], step_size))
+
+	for index in range(0, len(chunk_starts), batch_size):
+		temp_voice, temp_voice_chunk = accumulate_voice(temp_audio, temp_voice, temp_voice_chunk, chunk_starts[index:index + batch_size], chunk_size)
+
+	if chunk_starts:
+		yield temp_voice / temp_voice_chunk
+
+
+def accumulate_voice(audio : Audio, temp_voice : Voice, temp_voice_chunk : Voice, chunk_starts : List[int], chunk_size : int) -> Tuple[Voice, Voice]:
+	temp_voice = numpy.pad(temp_voice, ((0, audio.shape[0] - temp_voice.shape[0]), (0, 0)))
+	temp_voice_chunk = numpy.pad(temp_voice_chunk, ((0, audio.shape[0] - temp_voice_chunk.shape[0]), (0, 0)))
+	temp_audio_chunks = [ audio[start:start + chunk_size, ...] for start in chunk_starts ]
+
+	for start, temp_voice_frame in zip(chunk_starts, extract_voices(temp_audio_chunks)):
+		end = start + temp_voice_frame.shape[0]
+		temp_voice[start:end, ...] += temp_voice_frame
+		temp_voice_chunk[start:end, ...] += 1
+
+	return temp_voice, temp_voice_chunk
+
+
 def extract_voice(temp_audio_chunk : AudioChunk) -> VoiceChunk:
+	return extract_voices([ temp_audio_chunk ])[0]
+
+
+def extract_voices(temp_audio_chunks : List[AudioChunk]) -> List[VoiceChunk]:
 	voice_extractor = get_inference_pool().get(state_manager.get_item('voice_extractor_model'))
 	voice_trim_size = 3840
 	voice_chunk_size = (voice_extractor.get_inputs()[0].shape[3] - 1) * 1024
-	temp_audio_chunk, audio_pad_size = prepare_audio_chunk(temp_audio_chunk.T, voice_chunk_size, voice_trim_size)
-	temp_audio_chunk = decompose_audio_chunk(temp_audio_chunk, voice_trim_size)
+	prepare_audio_chunks = []
+	audio_pad_sizes = []
+	voice_chunks = []
+
+	for temp_audio_chunk in temp_audio_chunks:
+		temp_audio_chunk, audio_pad_size = prepare_audio_chunk(temp_audio_chunk.T, voice_chunk_size, voice_trim_size)
+		prepare_audio_chunks.append(temp_audio_chunk)
+		audio_pad_sizes.append(audio_pad_size)
+
+	temp_audio_chunk = decompose_audio_chunk(numpy.concatenate(prepare_audio_chunks), voice_trim_size)
 	temp_audio_chunk = forward(temp_audio_chunk)
 	temp_audio_chunk = compose_audio_chunk(temp_audio_chunk, voice_trim_size)
-	temp_audio_chunk = normalize_audio_chunk(temp_audio_chunk, voice_chunk_size, voice_trim_size, audio_pad_size)
-	return temp_audio_chunk
+	chunk_indices = numpy.cumsum([ prepare_audio_chunk.shape[0] for prepare_audio_chunk in prepare_audio_chunks ])[:-1]
+
+	for temp_audio_chunk, audio_pad_size in zip(numpy.split(temp_audio_chunk, chunk_indices), audio_pad_sizes):
+		voice_chunks.append(normalize_audio_chunk(temp_audio_chunk, voice_chunk_size, voice_trim_size, audio_pad_size))
+
+	return voice_chunks
 
 
 def forward(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	voice_extractor = get_inference_pool().get(state_manager.get_item('voice_extractor_model'))
 
-	with thread_semaphore():
+	with inference_manager.session_semaphore(voice_extractor):
 		temp_audio_chunk = voice_extractor.run(None,
 		{
 			'input': temp_audio_chunk
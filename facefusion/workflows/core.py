@@ -1,16 +1,26 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import as_completed
+from queue import Queue
+from typing import List
 
 import numpy
 from tqdm import tqdm
 
-from facefusion import content_analyser, logger, process_manager, state_manager, translator
+from facefusion import content_analyser, inference_manager, logger, process_manager, profiler, state_manager, translator
 from facefusion.audio import create_empty_audio_frame, get_audio_frame, get_voice_frame
 from facefusion.common_helper import get_first
-from facefusion.filesystem import filter_audio_paths
+from facefusion.face_store import create_analysis_context, get_face_store_stats
+from facefusion.face_tracker import clear_face_tracker
+from facefusion.filesystem import create_directory, filter_audio_paths, move_file
+from facefusion.frame_pool import open_frame_pool, submit_frames
+from facefusion.hash_helper import create_file_signature, create_hash
 from facefusion.processors.core import get_processors_modules
-from facefusion.temp_helper import clear_temp_directory, create_temp_directory, resolve_temp_frame_paths
-from facefusion.types import AudioFrame, ErrorCode, VisionFrame
-from facefusion.vision import conditional_merge_vision_mask, extract_vision_mask, read_static_image, read_static_images, read_static_video_frame, restrict_video_fps, write_image
+from facefusion.temp_helper import append_processed_frame_numbers, clear_temp_directory, create_temp_directory, get_temp_partial_frame_path, read_processed_frame_numbers, read_temp_checkpoint, resolve_temp_frame_paths, restore_temp_frames
+from facefusion.types import Args, AudioFrame, ErrorCode, FramePool, Resolution, TempFrameQueue, VisionFrame
+from facefusion.vision import conditional_merge_vision_mask, extract_vision_mask, merge_vision_mask, read_static_image, read_static_images, read_static_video_frame, restrict_video_fps, write_image
 
 
 def is_process_stopping() -> bool:
@@ -28,16 +38,95 @@ def setup() -> ErrorCode:
 
 def clear() -> ErrorCode:
 	clear_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	clear_face_tracker()
+	inference_manager.clear_inference_session_metrics()
 	logger.debug(translator.get('clearing_temp'), __name__)
 	return 0
 
 
+def conditional_clear() -> ErrorCode:
+	temp_checkpoint = read_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+
+	if temp_checkpoint and temp_checkpoint.get('checkpoint_key') == create_checkpoint_key():
+		clear_face_tracker()
+		inference_manager.clear_inference_session_metrics()
+		logger.debug(translator.get('keeping_temp'), __name__)
+		return 0
+	return clear()
+
+
+def create_checkpoint_key() -> str:
+	checkpoint_args = collect_checkpoint_args()
+	checkpoint_args['source_signatures'] = [ create_file_signature(source_path) for source_path in state_manager.get_item('source_paths') or [] ]
+	checkpoint_args['target_signature'] = create_file_signature(state_manager.get_item('target_path'))
+	return create_hash(json.dumps(checkpoint_args, sort_keys = True).encode())
+
+
+def collect_checkpoint_args() -> Args:
+	checkpoint_args : Args =\
+	{
+		key: state_manager.get_item(key) for key in
+		[
+			'workflow',
+			'source_paths',
+			'target_path',
+			'output_path',
+			'face_detector_model',
+			'face_detector_size',
+			'face_detector_margin',
+			'face_detector_angles',
+			'face_detector_score',
+			'face_tracker',
+			'face_tracker_interval',
+			'face_landmarker_model',
+			'face_landmarker_score',
+			'face_selector_mode',
+			'face_selector_order',
+			'face_selector_age_start',
+			'face_selector_age_end',
+			'face_selector_gender',
+			'face_selector_race',
+			'reference_face_position',
+			'reference_face_distance',
+			'reference_frame_number',
+			'face_occluder_model',
+			'face_parser_model',
+			'face_mask_types',
+			'face_mask_areas',
+			'face_mask_regions',
+			'face_mask_blur',
+			'face_mask_padding',
+			'voice_extractor_model',
+			'trim_frame_start',
+			'trim_frame_end',
+			'temp_frame_format',
+			'output_video_scale',
+			'output_video_fps',
+			'processors'
+		]
+	}
+
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_module.apply_args(state_manager.get_state(), checkpoint_args.__setitem__) #type:ignore[arg-type]
+	return checkpoint_args
+
+
 def analyse_image() -> ErrorCode:
 	if content_analyser.analyse_image(state_manager.get_item('target_path')):
 		return 3
 	return 0
 
 
+def log_face_store() -> None:
+	face_store_stats = get_face_store_stats()
+	logger.debug(translator.get('face_store_stats').format(size = face_store_stats.get('size'), hit_rate = face_store_stats.get('hit_rate')), __name__)
+
+
+def log_inference_sessions() -> None:
+	for model_name, inference_session_metric in inference_manager.get_inference_session_metrics().items():
+		logger.debug(translator.get('inference_session_stats').format(model_name = model_name, run_total = inference_session_metric.get('run_total'), wait_time = round(inference_session_metric.get('wait_time'), 2), run_time = round(inference_session_metric.get('run_time'), 2)), __name__)
+
+
 def conditional_get_source_audio_frame(frame_number : int) -> AudioFrame:
 	if state_manager.get_item('workflow') in [ 'audio-to-image:frames', 'audio-to-image:video', 'image-to-video' ]:
 		source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
@@ -75,42 +164,176 @@ def conditional_get_reference_vision_frame() -> VisionFrame:
 
 
 def process_temp_frame(temp_frame_path : str, frame_number : int) -> bool:
+	return all(process_temp_frames([ temp_frame_path ], [ frame_number ]))
+
+
+def process_temp_frames(temp_frame_paths : List[str], frame_numbers : List[int]) -> List[bool]:
+	with profiler.profile('frame_decode'):
+		target_vision_frames = [ read_static_image(temp_frame_path, 'rgba') for temp_frame_path in temp_frame_paths ]
+
+	temp_vision_frames = process_vision_frames(target_vision_frames, frame_numbers)
+
+	with profiler.profile('frame_encode'):
+		return [ write_temp_frame(temp_frame_path, frame_number, temp_vision_frame) for temp_frame_path, frame_number, temp_vision_frame in zip(temp_frame_paths, frame_numbers, temp_vision_frames) ]
+
+
+def write_temp_frame(temp_frame_path : str, frame_number : int, temp_vision_frame : VisionFrame) -> bool:
+	temp_partial_frame_path = get_temp_partial_frame_path(temp_frame_path)
+	return create_directory(os.path.dirname(temp_partial_frame_path)) and write_image(temp_partial_frame_path, temp_vision_frame) and append_processed_frame_numbers(state_manager.get_temp_path(), state_manager.get_item('output_path'), [ frame_number ]) and move_file(temp_partial_frame_path, temp_frame_path)
+
+
+def process_vision_frames(target_vision_frames : List[VisionFrame], frame_numbers : List[int]) -> List[VisionFrame]:
 	reference_vision_frame = conditional_get_reference_vision_frame()
 	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
-	target_vision_frame = read_static_image(temp_frame_path, 'rgba')
-	source_audio_frame = conditional_get_source_audio_frame(frame_number)
-	source_voice_frame = conditional_get_source_voice_frame(frame_number)
-	temp_vision_frame = target_vision_frame.copy()
+	temp_vision_frames = [ target_vision_frame.copy() for target_vision_frame in target_vision_frames ]
+	temp_vision_masks = [ extract_vision_mask(temp_vision_frame) for temp_vision_frame in temp_vision_frames ]
+	source_audio_frames = [ conditional_get_source_audio_frame(frame_number) for frame_number in frame_numbers ]
+	source_voice_frames = [ conditional_get_source_voice_frame(frame_number) for frame_number in frame_numbers ]
+	analysis_contexts = [ create_analysis_context(frame_number) for frame_number in frame_numbers ]
+
+	with inference_manager.bind_execution_device():
+		for processor_module in get_processors_modules(state_manager.get_item('processors')):
+			inputs_batch = []
+
+			for target_vision_frame, temp_vision_frame, temp_vision_mask, source_audio_frame, source_voice_frame, analysis_context in zip(target_vision_frames, temp_vision_frames, temp_vision_masks, source_audio_frames, source_voice_frames, analysis_contexts):
+				inputs_batch.append(
+				{
+					'reference_vision_frame': reference_vision_frame,
+					'source_vision_frames': source_vision_frames,
+					'source_audio_frame': source_audio_frame,
+					'source_voice_frame': source_voice_frame,
+					'target_vision_frame': target_vision_frame[:, :, :3],
+					'temp_vision_frame': temp_vision_frame[:, :, :3],
+					'temp_vision_mask': temp_vision_mask,
+					'analysis_context': analysis_context
+				})
+
+			if len(inputs_batch) > 1 and hasattr(processor_module, 'process_frames'):
+				outputs_batch = processor_module.process_frames(inputs_batch)
+			else:
+				outputs_batch = [ processor_module.process_frame(inputs) for inputs in inputs_batch ]
+
+			temp_vision_frames = [ temp_vision_frame for temp_vision_frame, _ in outputs_batch ]
+			temp_vision_masks = [ temp_vision_mask for _, temp_vision_mask in outputs_batch ]
+
+	return [ conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask) for temp_vision_frame, temp_vision_mask in zip(temp_vision_frames, temp_vision_masks) ]
+
+
+def read_pipe_frames(read_process : subprocess.Popen[bytes], temp_video_resolution : Resolution, frame_pool : FramePool, temp_frame_queue : TempFrameQueue) -> None:
+	execution_batch_size = state_manager.get_item('execution_batch_size')
+	temp_video_width, temp_video_height = temp_video_resolution
+	target_vision_frames = []
+	frame_numbers = []
+	frame_number = 0
+
+	try:
+		while process_manager.is_processing():
+			target_vision_frame = numpy.empty((temp_video_height, temp_video_width, 3), dtype = numpy.uint8)
+
+			with profiler.profile('frame_decode'):
+				read_total = read_process.stdout.readinto(target_vision_frame.data) #type:ignore[attr-defined]
+
+			if read_total < target_vision_frame.nbytes:
+				break
+
+			target_vision_frames.append(target_vision_frame)
+			frame_numbers.append(frame_number)
+			frame_number += 1
+
+			if len(target_vision_frames) == execution_batch_size:
+				temp_frame_queue.put(submit_frames(frame_pool, process_vision_frames, target_vision_frames, frame_numbers))
+				target_vision_frames = []
+				frame_numbers = []
+
+		if target_vision_frames:
+			temp_frame_queue.put(submit_frames(frame_pool, process_vision_frames, target_vision_frames, frame_numbers))
+	finally:
+		temp_frame_queue.put(None)
+
+
+def cancel_pipe_frames(temp_frame_queue : TempFrameQueue) -> None:
+	while future := temp_frame_queue.get():
+		future.cancel()
+
+
+def write_pipe_frame(write_process : subprocess.Popen[bytes], temp_vision_frame : VisionFrame) -> bool:
 	temp_vision_mask = extract_vision_mask(temp_vision_frame)
+	temp_vision_frame = merge_vision_mask(temp_vision_frame, temp_vision_mask)
+
+	try:
+		with profiler.profile('frame_encode'):
+			write_process.stdin.write(temp_vision_frame.tobytes())
+	except (BrokenPipeError, OSError):
+		return False
+	return True
+
+
+def process_pipe_frames(read_process : subprocess.Popen[bytes], write_process : subprocess.Popen[bytes], temp_video_resolution : Resolution, frame_total : int) -> ErrorCode:
+	execution_thread_count = state_manager.get_item('execution_thread_count')
+	temp_frame_queue : TempFrameQueue = Queue(maxsize = execution_thread_count * 2)
+	is_writable = True
+
+	with tqdm(total = frame_total, desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
+
+		with open_frame_pool(state_manager.get_item('execution_worker_mode'), execution_thread_count) as frame_pool:
+			read_thread = threading.Thread(target = read_pipe_frames, args = (read_process, temp_video_resolution, frame_pool, temp_frame_queue))
+			read_thread.start()
+
+			try:
+				while future := temp_frame_queue.get():
+					if is_process_stopping() or not is_writable:
+						read_process.terminate()
+						future.cancel()
+
+					if not future.cancelled():
+						for temp_vision_frame in future.result():
+							is_writable = write_pipe_frame(write_process, temp_vision_frame)
+							progress.update()
+			except Exception:
+				read_process.terminate()
+				write_process.terminate()
+				cancel_pipe_frames(temp_frame_queue)
+				raise
+			finally:
+				read_thread.join()
+
+	read_process.wait()
+	write_process.stdin.close()
+	write_process.wait()
+
+	log_face_store()
+	log_inference_sessions()
 
 	for processor_module in get_processors_modules(state_manager.get_item('processors')):
-		temp_vision_frame, temp_vision_mask = processor_module.process_frame(
-		{
-			'reference_vision_frame': reference_vision_frame,
-			'source_vision_frames': source_vision_frames,
-			'source_audio_frame': source_audio_frame,
-			'source_voice_frame': source_voice_frame,
-			'target_vision_frame': target_vision_frame[:, :, :3],
-			'temp_vision_frame': temp_vision_frame[:, :, :3],
-			'temp_vision_mask': temp_vision_mask
-		})
+		processor_module.post_process()
 
-	temp_vision_frame = conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
-	return write_image(temp_frame_path, temp_vision_frame)
+	if is_process_stopping():
+		return 4
+	if read_process.returncode != 0 or write_process.returncode != 0:
+		logger.error(translator.get('piping_frames_failed'), __name__)
+		return 1
+	return 0
 
 
 def process_frames() -> ErrorCode:
 	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format'))
 
 	if temp_frame_paths:
-		with tqdm(total = len(temp_frame_paths), desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		processed_frame_numbers = read_processed_frame_numbers(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+		restore_temp_frames(temp_frame_paths, processed_frame_numbers)
+		frame_numbers = [ frame_number for frame_number in range(len(temp_frame_paths)) if frame_number not in processed_frame_numbers ]
+
+		with tqdm(total = len(temp_frame_paths), initial = len(temp_frame_paths) - len(frame_numbers), desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 			progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
 
-			with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+			with open_frame_pool(state_manager.get_item('execution_worker_mode'), state_manager.get_item('execution_thread_count')) as frame_pool:
+				execution_batch_size = state_manager.get_item('execution_batch_size')
 				futures = []
 
-				for frame_number, temp_frame_path in enumerate(temp_frame_paths):
-					future = executor.submit(process_temp_frame, temp_frame_path, frame_number)
+				for index in range(0, len(frame_numbers), execution_batch_size):
+					batch_frame_numbers = frame_numbers[index:index + execution_batch_size]
+					future = frame_pool.get('executor').submit(process_temp_frames, [ temp_frame_paths[frame_number] for frame_number in batch_frame_numbers ], batch_frame_numbers)
 					futures.append(future)
 
 				for future in as_completed(futures):
@@ -119,8 +342,10 @@ def process_frames() -> ErrorCode:
 							__future__.cancel()
 
 					if not future.cancelled():
-						future.result()
-						progress.update()
+						progress.update(len(future.result()))
+
+		log_face_store()
+		log_inference_sessions()
 
 		for processor_module in get_processors_modules(state_manager.get_item('processors')):
 			processor_module.post_process()
@@ -1,16 +1,16 @@
 from functools import partial
 
-from facefusion import process_manager
+from facefusion import process_manager, state_manager
 from facefusion.types import ErrorCode
-from facefusion.workflows.core import clear, process_frames, setup
-from facefusion.workflows.to_video import analyse_video, create_temp_frames, finalize_video, merge_frames, restore_audio
+from facefusion.workflows.core import clear, conditional_clear, process_frames, setup
+from facefusion.workflows.to_video import analyse_video, create_temp_frames, finalize_video, merge_frames, pipe_frames, restore_audio
 
 
 def process(start_time : float) -> ErrorCode:
 	tasks =\
 	[
 		analyse_video,
-		clear,
+		conditional_clear,
 		setup,
 		create_temp_frames,
 		process_frames,
@@ -20,6 +20,18 @@ def process(start_time : float) -> ErrorCode:
 		clear
 	]
 
+	if state_manager.get_item('temp_frame_mode') == 'pipe':
+		tasks =\
+		[
+			analyse_video,
+			clear,
+			setup,
+			pipe_frames,
+			restore_audio,
+			partial(finalize_video, start_time),
+			clear
+		]
+
 	process_manager.start()
 
 	for task in tasks:
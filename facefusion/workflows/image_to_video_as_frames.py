@@ -3,7 +3,7 @@ from functools import partial
 from facefusion import process_manager
 from facefusion.types import ErrorCode
 from facefusion.workflows.as_frames import copy_temp_frames, finalize_frames
-from facefusion.workflows.core import clear, process_frames, setup
+from facefusion.workflows.core import clear, conditional_clear, process_frames, setup
 from facefusion.workflows.to_video import analyse_video, create_temp_frames
 
 
@@ -11,7 +11,7 @@ def process(start_time : float) -> ErrorCode:
 	tasks =\
 	[
 		analyse_video,
-		clear,
+		conditional_clear,
 		setup,
 		create_temp_frames,
 		process_frames,
@@ -1,12 +1,14 @@
+from typing import Tuple
+
 from facefusion import content_analyser, ffmpeg, logger, state_manager, translator, video_manager
 from facefusion.common_helper import get_first
 from facefusion.filesystem import filter_audio_paths, is_video
 from facefusion.media_helper import restrict_trim_frame
-from facefusion.temp_helper import move_temp_file, resolve_temp_frame_paths
+from facefusion.temp_helper import clear_processed_frame_numbers, clear_temp_directory, create_temp_directory, move_temp_file, read_temp_checkpoint, resolve_temp_frame_paths, write_temp_checkpoint
 from facefusion.time_helper import calculate_end_time
 from facefusion.types import ErrorCode, Fps, Resolution
-from facefusion.vision import detect_image_resolution, detect_video_resolution, pack_resolution, restrict_trim_video_frame, restrict_video_fps, restrict_video_resolution, scale_resolution
-from facefusion.workflows.core import is_process_stopping
+from facefusion.vision import detect_image_resolution, detect_video_resolution, pack_resolution, predict_video_frame_total, restrict_trim_video_frame, restrict_video_fps, restrict_video_resolution, scale_resolution
+from facefusion.workflows.core import create_checkpoint_key, is_process_stopping, process_pipe_frames
 
 
 def analyse_video() -> ErrorCode:
@@ -22,9 +24,24 @@ def create_temp_frames() -> ErrorCode:
 	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
 	temp_video_resolution = restrict_video_resolution(state_manager.get_item('target_path'), output_video_resolution)
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	temp_checkpoint = read_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	checkpoint_key = create_checkpoint_key()
+
+	if temp_checkpoint and temp_checkpoint.get('checkpoint_key') == checkpoint_key and temp_checkpoint.get('frame_total') == len(resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format'))):
+		logger.info(translator.get('reusing_frames').format(frame_total = temp_checkpoint.get('frame_total')), __name__)
+		return 0
+
+	clear_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	create_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
 	logger.info(translator.get('extracting_frames').format(resolution=pack_resolution(temp_video_resolution), fps=temp_video_fps), __name__)
 
 	if ffmpeg.extract_frames(state_manager.get_item('target_path'), state_manager.get_item('output_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end):
+		clear_processed_frame_numbers(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+		write_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path'),
+		{
+			'checkpoint_key': checkpoint_key,
+			'frame_total': len(resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format')))
+		})
 		logger.debug(translator.get('extracting_frames_succeeded'), __name__)
 	else:
 		if is_process_stopping():
@@ -34,9 +51,25 @@ def create_temp_frames() -> ErrorCode:
 	return 0
 
 
+def pipe_frames() -> ErrorCode:
+	trim_frame_start, trim_frame_end = restrict_trim_video_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
+	temp_video_resolution = restrict_video_resolution(state_manager.get_item('target_path'), output_video_resolution)
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	pipe_frame_total = predict_video_frame_total(state_manager.get_item('target_path'), temp_video_fps, trim_frame_start, trim_frame_end)
+	logger.info(translator.get('piping_frames').format(resolution = pack_resolution(temp_video_resolution), fps = temp_video_fps), __name__)
+
+	read_process = ffmpeg.pipe_extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
+	write_process = ffmpeg.pipe_merge_video(state_manager.get_item('output_path'), temp_video_fps, temp_video_resolution, output_video_resolution)
+	error_code = process_pipe_frames(read_process, write_process, temp_video_resolution, pipe_frame_total)
+
+	if error_code == 0:
+		logger.debug(translator.get('piping_frames_succeeded'), __name__)
+	return error_code
+
+
 def merge_frames() -> ErrorCode:
-	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format'))
-	trim_frame_start, trim_frame_end = restrict_trim_frame(len(temp_frame_paths), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	trim_frame_start, trim_frame_end = conditional_restrict_trim_frame()
 	output_video_resolution = conditional_scale_resolution()
 	temp_video_fps = conditional_restrict_video_fps()
 
@@ -52,8 +85,7 @@ def merge_frames() -> ErrorCode:
 
 
 def restore_audio() -> ErrorCode:
-	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format'))
-	trim_frame_start, trim_frame_end = restrict_trim_frame(len(temp_frame_paths), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	trim_frame_start, trim_frame_end = conditional_restrict_trim_frame()
 
 	if state_manager.get_item('output_audio_volume') == 0:
 		logger.info(translator.get('skipping_audio'), __name__)
@@ -97,6 +129,13 @@ def conditional_clear_video_pool() -> None:
 		video_manager.clear_video_pool()
 
 
+def conditional_restrict_trim_frame() -> Tuple[int, int]:
+	if state_manager.get_item('workflow') == 'image-to-video' and state_manager.get_item('temp_frame_mode') == 'pipe':
+		return restrict_trim_video_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format'))
+	return restrict_trim_frame(len(temp_frame_paths), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+
+
 def conditional_restrict_video_fps() -> Fps:
 	if state_manager.get_item('workflow') == 'image-to-video':
 		return restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
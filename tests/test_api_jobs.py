@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import tempfile
+from time import sleep
+from typing import Iterator
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+from starlette.testclient import TestClient
+from tqdm import tqdm
+
+from facefusion import metadata, session_manager, state_manager
+from facefusion.apis import asset_store, job_executor, job_store
+from facefusion.apis.core import create_api
+from facefusion.apis.job_executor import collect_job_progress, submit_job
+from facefusion.types import ApiJobStatus
+from facefusion.vision import write_image
+
+
+@pytest.fixture(scope = 'module')
+def test_client() -> Iterator[TestClient]:
+	with TestClient(create_api()) as test_client:
+		yield test_client
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each(mocker : MockerFixture) -> None:
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+	state_manager.init_item('target_path', None)
+	session_manager.SESSIONS.clear()
+	asset_store.clear()
+	job_store.clear()
+	mocker.patch('facefusion.apis.job_executor.submit_job')
+
+
+def create_access_token(test_client : TestClient) -> str:
+	create_session_response = test_client.post('/session', json =
+	{
+		'client_version': metadata.get('version')
+	})
+	return create_session_response.json().get('access_token')
+
+
+def test_create_job(test_client : TestClient) -> None:
+	create_job_response = test_client.post('/jobs')
+
+	assert create_job_response.status_code == 401
+
+	access_token = create_access_token(test_client)
+	create_job_response = test_client.post('/jobs', headers =
+	{
+		'Authorization': 'Bearer ' + access_token
+	})
+
+	assert create_job_response.status_code == 400
+
+	with tempfile.NamedTemporaryFile(suffix = '.jpg') as target_file:
+		state_manager.init_item('target_path', target_file.name)
+		create_job_response = test_client.post('/jobs', headers =
+		{
+			'Authorization': 'Bearer ' + access_token
+		})
+
+	assert create_job_response.status_code == 201
+	assert create_job_response.json().get('job_id')
+
+
+def test_get_job(test_client : TestClient) -> None:
+	access_token = create_access_token(test_client)
+
+	with tempfile.NamedTemporaryFile(suffix = '.jpg') as target_file:
+		state_manager.init_item('target_path', target_file.name)
+		create_job_response = test_client.post('/jobs', headers =
+		{
+			'Authorization': 'Bearer ' + access_token
+		})
+	job_id = create_job_response.json().get('job_id')
+
+	get_job_response = test_client.get('/jobs/' + job_id, headers =
+	{
+		'Authorization': 'Bearer ' + access_token
+	})
+
+	assert get_job_response.status_code == 200
+	assert get_job_response.json().get('status') == 'queued'
+	assert get_job_response.json().get('progress') is None
+
+	get_job_response = test_client.get('/jobs/invalid', headers =
+	{
+		'Authorization': 'Bearer ' + access_token
+	})
+
+	assert get_job_response.status_code == 404
+
+
+def test_websocket_job(test_client : TestClient) -> None:
+	access_token = create_access_token(test_client)
+
+	with tempfile.NamedTemporaryFile(suffix = '.jpg') as target_file:
+		state_manager.init_item('target_path', target_file.name)
+		create_job_response = test_client.post('/jobs', headers =
+		{
+			'Authorization': 'Bearer ' + access_token
+		})
+	job_id = create_job_response.json().get('job_id')
+	session_id = session_manager.find_session_id(access_token)
+	job_store.set_job_progress(session_id, job_id,
+	{
+		'stage': 'processing',
+		'frame_done': 25,
+		'frame_total': 100,
+		'fps': 12.5,
+		'eta': 6.0
+	})
+
+	with test_client.websocket_connect('/jobs/' + job_id, subprotocols =
+	[
+		'access_token.' + access_token
+	]) as websocket:
+		job_content = websocket.receive_json()
+
+		assert job_content.get('status') == 'processing'
+		assert job_content.get('progress').get('frame_done') == 25
+
+		job_store.set_job_status(session_id, job_id, 'failed', None)
+
+		assert websocket.receive_json().get('status') == 'failed'
+
+
+def wait_for_job_status(session_id : str, job_id : str) -> ApiJobStatus:
+	for _ in range(100):
+		job_status = job_store.get_job(session_id, job_id).get('status')
+
+		if job_status in [ 'completed', 'failed' ]:
+			return job_status
+		sleep(0.1)
+	return job_status
+
+
+def test_submit_job(mocker : MockerFixture) -> None:
+	mocker.patch('facefusion.apis.job_executor.multiprocessing.get_context', return_value = multiprocessing.get_context('fork'))
+	mocker.patch('facefusion.core.common_pre_check', return_value = True)
+	mocker.patch('facefusion.core.processors_pre_check', return_value = True)
+	mocker.patch('facefusion.core.conditional_process', side_effect = lambda: os._exit(1))
+	state =\
+	{
+		'log_level': 'error'
+	}
+
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		output_path = os.path.join(temp_directory_path, 'output.jpg')
+		write_image(output_path, numpy.zeros((64, 64, 3), dtype = numpy.uint8))
+		job_store.create_job('test-session', 'test-job-1', output_path)
+		job_store.create_job('test-session', 'test-job-2', output_path)
+		submit_job('test-session', 'test-job-1', state)
+
+		assert wait_for_job_status('test-session', 'test-job-1') == 'failed'
+		assert job_executor.JOB_EXECUTOR is None
+
+		mocker.patch('facefusion.core.conditional_process', return_value = 0)
+		submit_job('test-session', 'test-job-2', state)
+
+		assert wait_for_job_status('test-session', 'test-job-2') == 'completed'
+		assert job_store.get_job('test-session', 'test-job-2').get('asset_id')
+
+		job_executor.reset_job_executor(job_executor.get_job_executor())
+
+
+def test_collect_job_progress() -> None:
+	with tqdm(total = 100, desc = 'processing') as progress:
+		progress.update(25)
+		job_progress = collect_job_progress(progress)
+
+	assert job_progress.get('stage') == 'processing'
+	assert job_progress.get('frame_done') == 25
+	assert job_progress.get('frame_total') == 100
+	assert job_progress.get('fps') > 0
@@ -6,6 +6,7 @@ import pytest
 from starlette.testclient import TestClient
 
 from facefusion import metadata, session_manager
+from facefusion.apis import job_store
 from facefusion.apis.core import create_api
 from facefusion.types import Session
 
@@ -145,11 +146,14 @@ def test_destroy_session(test_client : TestClient) -> None:
 
 	assert delete_session_response.status_code == 401
 
+	session_id = session_manager.find_session_id(create_session_body.get('access_token'))
+	job_store.create_job(session_id, 'test-job', 'test.jpg')
 	delete_session_response = test_client.delete('/session', headers =
 	{
 		'Authorization': 'Bearer ' + create_session_body.get('access_token')
 	})
 
 	assert session_manager.find_session_id(create_session_body.get('access_token')) is None
+	assert job_store.get_job(session_id, 'test-job') is None
 
 	assert delete_session_response.status_code == 200
@@ -1,9 +1,15 @@
+import os
 import subprocess
+import tempfile
+from unittest.mock import Mock
 
+import numpy
 import pytest
+import scipy
 from pytest import approx
 
-from facefusion.audio import detect_audio_duration, get_audio_frame, read_static_audio, restrict_trim_audio_frame
+from facefusion import state_manager
+from facefusion.audio import create_spectrogram, detect_audio_duration, extract_audio_frames, get_audio_frame, get_voice_spectrogram_path, prepare_audio, read_static_audio, resample_audio_chunks, restrict_trim_audio_frame, select_audio_frame, stream_spectrogram, write_spectrogram
 from facefusion.download import conditional_download
 from .helper import get_test_example_file, get_test_examples_directory
 
@@ -15,6 +21,7 @@ def before_all() -> None:
 		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/source.mp3'
 	])
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('source.mp3'), get_test_example_file('source.wav') ])
+	state_manager.init_item('voice_extractor_model', 'kim_vocal_2')
 
 
 def test_get_audio_frame() -> None:
@@ -24,8 +31,8 @@ def test_get_audio_frame() -> None:
 
 
 def test_read_static_audio() -> None:
-	assert len(read_static_audio(get_test_example_file('source.mp3'), 25)) == 280
-	assert len(read_static_audio(get_test_example_file('source.wav'), 25)) == 280
+	assert len(read_static_audio(get_test_example_file('source.mp3'), 25).get('frame_indices')) == 280
+	assert len(read_static_audio(get_test_example_file('source.wav'), 25).get('frame_indices')) == 280
 	assert read_static_audio('invalid', 25) is None
 
 
@@ -43,3 +50,71 @@ def test_restrict_trim_audio_frame() -> None:
 	assert restrict_trim_audio_frame(get_test_example_file('source.mp3'), 25, 100, None) == (95, 95)
 	assert restrict_trim_audio_frame(get_test_example_file('source.mp3'), 25, None, 100) == (0, 95)
 	assert restrict_trim_audio_frame(get_test_example_file('source.mp3'), 25, None, None) == (0, 95)
+
+
+def test_get_voice_spectrogram_path() -> None:
+	voice_spectrogram_path = get_voice_spectrogram_path(get_test_example_file('source.mp3'))
+
+	assert voice_spectrogram_path.endswith('.npy')
+	assert get_voice_spectrogram_path(get_test_example_file('source.wav')) != voice_spectrogram_path
+
+	state_manager.set_item('voice_extractor_model', 'uvr_mdxnet')
+
+	assert get_voice_spectrogram_path(get_test_example_file('source.mp3')) != voice_spectrogram_path
+
+	state_manager.set_item('voice_extractor_model', 'kim_vocal_2')
+
+
+def test_write_spectrogram() -> None:
+	spectrogram = numpy.random.rand(80, 100)
+
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		spectrogram_path = os.path.join(temp_directory_path, 'voices', 'test.npy')
+
+		assert write_spectrogram(spectrogram_path, spectrogram) is True
+		assert numpy.array_equal(numpy.load(spectrogram_path), spectrogram)
+		assert os.listdir(os.path.dirname(spectrogram_path)) == [ 'test.npy' ]
+
+
+def test_create_spectrogram() -> None:
+	audio = numpy.random.rand(48000).astype(numpy.float32)
+	spectrogram = create_spectrogram(audio)
+
+	assert spectrogram.shape == (80, 241)
+	assert spectrogram.dtype == numpy.float32
+
+
+def test_resample_audio_chunks() -> None:
+	audio = numpy.random.rand(100001)
+	audio_chunks = [ audio[index:index + 18432] for index in range(0, len(audio), 18432) ]
+
+	assert numpy.allclose(numpy.concatenate(list(resample_audio_chunks(iter(audio_chunks), 3))), scipy.signal.resample_poly(audio, 1, 3))
+
+
+def test_stream_spectrogram() -> None:
+	audio = numpy.random.rand(100001).astype(numpy.float32)
+	audio_chunks = [ audio[index:index + 10000] for index in range(0, len(audio), 10000) ]
+	process = Mock()
+
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		spectrogram_path = os.path.join(temp_directory_path, 'audios', 'test.npy')
+		process.wait.return_value = 1
+
+		assert stream_spectrogram(process, iter(audio_chunks), len(audio), spectrogram_path) is False
+		assert os.listdir(os.path.dirname(spectrogram_path)) == []
+
+		process.wait.return_value = 0
+
+		assert stream_spectrogram(process, iter(audio_chunks), 1000, spectrogram_path) is True
+		assert numpy.allclose(numpy.load(spectrogram_path), create_spectrogram(prepare_audio(audio)), atol = 1e-6)
+		assert os.listdir(os.path.dirname(spectrogram_path)) == [ 'test.npy' ]
+
+
+def test_select_audio_frame() -> None:
+	spectrogram = numpy.random.rand(80, 30000).astype(numpy.float32)
+	audio_frame_set = extract_audio_frames(spectrogram, 25)
+
+	assert len(audio_frame_set.get('frame_indices')) == 9370
+	assert select_audio_frame(audio_frame_set, 9369).shape == (80, 16)
+	assert numpy.array_equal(select_audio_frame(audio_frame_set, 9369), spectrogram[:, 29980:29996])
+	assert select_audio_frame(audio_frame_set, 9370) is None
@@ -39,6 +39,13 @@ def test_swap_face_to_video() -> None:
 	assert is_test_output_file('test-swap-face-to-video.mp4') is True
 
 
+def test_swap_face_to_video_as_pipe() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'run', '--workflow', 'image-to-video', '--jobs-path', get_test_jobs_directory(), '--processors', 'face_swapper', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_path('test-swap-face-to-video-as-pipe.mp4'), '--trim-frame-end', '1', '--temp-frame-mode', 'pipe' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-swap-face-to-video-as-pipe.mp4') is True
+
+
 def test_swap_face_to_video_as_frames() -> None:
 	commands = [ sys.executable, 'facefusion.py', 'run', '--workflow', 'image-to-video:frames', '--jobs-path', get_test_jobs_directory(), '--processors', 'face_swapper', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_path('test-swap-face-to-video-as-frames'), '--trim-frame-end', '1' ]
 
@@ -39,6 +39,13 @@ def test_enhance_frame_to_video() -> None:
 	assert is_test_output_file('test-enhance-frame-to-video.mp4') is True
 
 
+def test_enhance_frame_to_video_as_batch() -> None:
+	commands = [ sys.executable, 'facefusion.py', 'run', '--workflow', 'image-to-video', '--jobs-path', get_test_jobs_directory(), '--processors', 'frame_enhancer', '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_path('test-enhance-frame-to-video-as-batch.mp4'), '--trim-frame-end', '4', '--execution-batch-size', '2' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-enhance-frame-to-video-as-batch.mp4') is True
+
+
 def test_enhance_frame_to_video_as_frames() -> None:
 	commands = [ sys.executable, 'facefusion.py', 'run', '--workflow', 'image-to-video:frames', '--jobs-path', get_test_jobs_directory(), '--processors', 'frame_enhancer', '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_path('test-enhance-frame-to-video-as-frames'), '--trim-frame-end', '1' ]
 
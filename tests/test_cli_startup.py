@@ -0,0 +1,74 @@
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+from facefusion.jobs.job_manager import clear_jobs, init_jobs
+from .helper import get_test_jobs_directory
+
+HEAVY_MODULES = [ 'cv2', 'onnxruntime', 'scipy', 'uvicorn', 'starlette' ]
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory())
+
+
+def get_startup_modules(args : List[str]) -> List[str]:
+	startup_code = '\n'.join(
+	[
+		'import atexit, sys',
+		'atexit.register(lambda: print(" ".join(sys.modules)))',
+		'sys.argv = [ "facefusion.py" ] + sys.argv[1:]',
+		'from facefusion import core, state_manager',
+		'core.apply_config_path(sys.argv[1:])',
+		'program = core.create_program(core.detect_command(sys.argv[1:]))',
+		'core.apply_args(vars(program.parse_args()), state_manager.init_item)'
+	])
+	commands = [ sys.executable, '-c', startup_code ] + args
+	return subprocess.run(commands, stdout = subprocess.PIPE).stdout.decode().split()
+
+
+def get_startup_step_arguments(args : List[str]) -> List[str]:
+	startup_code = '\n'.join(
+	[
+		'import sys',
+		'sys.argv = [ "facefusion.py" ] + sys.argv[1:]',
+		'from facefusion import args_store, core',
+		'core.apply_config_path(sys.argv[1:])',
+		'core.create_program(core.detect_command(sys.argv[1:]))',
+		'print(" ".join(set(args_store.get_cli_arguments()) - set(args_store.get_sys_arguments())))'
+	])
+	commands = [ sys.executable, '-c', startup_code ] + args
+	return subprocess.run(commands, stdout = subprocess.PIPE).stdout.decode().split()
+
+
+def test_startup_version() -> None:
+	startup_modules = get_startup_modules([ '--version' ])
+
+	assert 'facefusion.core' in startup_modules
+	assert not set(HEAVY_MODULES).intersection(startup_modules)
+
+
+def test_startup_job_manager() -> None:
+	startup_modules = get_startup_modules([ 'job-list', 'drafted', '--jobs-path', get_test_jobs_directory() ])
+
+	assert 'facefusion.core' in startup_modules
+	assert not set(HEAVY_MODULES).intersection(startup_modules)
+
+	startup_modules = get_startup_modules([ 'job-create', 'test-startup-job-create', '--jobs-path', get_test_jobs_directory() ])
+
+	assert not set(HEAVY_MODULES).intersection(startup_modules)
+
+	startup_modules = get_startup_modules([ 'job-submit-all', '--jobs-path', get_test_jobs_directory() ])
+
+	assert not set(HEAVY_MODULES).intersection(startup_modules)
+
+
+def test_startup_job_runner() -> None:
+	for command in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]:
+		step_arguments = get_startup_step_arguments([ command ])
+
+		assert { 'target_path', 'output_path', 'processors', 'face_swapper_model', 'trim_frame_start', 'trim_frame_end' }.issubset(step_arguments)
@@ -0,0 +1,20 @@
+from pytest_mock import MockerFixture
+
+from facefusion.content_analyser import analyse_video
+
+
+def test_analyse_video(mocker : MockerFixture) -> None:
+	mocker.patch('facefusion.content_analyser.create_file_hash', return_value = 'test')
+	mocker.patch('facefusion.content_analyser.get_content_analysis', return_value = None)
+	set_content_analysis_mock = mocker.patch('facefusion.content_analyser.set_content_analysis')
+	mocker.patch('facefusion.content_analyser.detect_video_content', return_value = False)
+	analyse_video.cache_clear()
+
+	assert analyse_video('test.mp4', 0, 10) is False
+	set_content_analysis_mock.assert_called_once_with('test.0.10', False)
+
+	mocker.patch('facefusion.content_analyser.detect_video_content', return_value = None)
+	analyse_video.cache_clear()
+
+	assert analyse_video('test.mp4', 0, 10) is True
+	set_content_analysis_mock.assert_called_once()
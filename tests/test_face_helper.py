@@ -0,0 +1,31 @@
+import numpy
+
+from facefusion.face_helper import paste_back, paste_back_faces
+
+
+def test_paste_back() -> None:
+	temp_vision_frame = numpy.zeros((64, 64, 3), dtype = numpy.uint8)
+	crop_vision_frame = numpy.full((16, 16, 3), 200, dtype = numpy.uint8)
+	crop_vision_mask = numpy.ones((16, 16), dtype = numpy.float32)
+	affine_matrix = numpy.array([ [ 1, 0, -8 ], [ 0, 1, -8 ] ], dtype = numpy.float64)
+	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+
+	assert numpy.all(paste_vision_frame[8:24, 8:24] == 200)
+	assert numpy.all(paste_vision_frame[24:, 24:] == 0)
+	assert numpy.all(temp_vision_frame == 0)
+
+	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask * 0.5, affine_matrix)
+
+	assert numpy.all(paste_vision_frame[8:24, 8:24] == 100)
+
+
+def test_paste_back_faces() -> None:
+	temp_vision_frame = numpy.zeros((64, 64, 3), dtype = numpy.uint8)
+	crop_vision_frames = [ numpy.full((16, 16, 3), 100, dtype = numpy.uint8), numpy.full((16, 16, 3), 200, dtype = numpy.uint8) ]
+	crop_vision_masks = [ numpy.ones((16, 16), dtype = numpy.float32), numpy.ones((16, 16), dtype = numpy.float32) ]
+	affine_matrices = [ numpy.array([ [ 1, 0, 0 ], [ 0, 1, 0 ] ], dtype = numpy.float64), numpy.array([ [ 1, 0, -40 ], [ 0, 1, -40 ] ], dtype = numpy.float64) ]
+	paste_vision_frame = paste_back_faces(temp_vision_frame, crop_vision_frames, crop_vision_masks, affine_matrices)
+
+	assert numpy.all(paste_vision_frame[0:16, 0:16] == 100)
+	assert numpy.all(paste_vision_frame[40:56, 40:56] == 200)
+	assert numpy.all(paste_vision_frame[20:36, 20:36] == 0)
@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from facefusion import face_masker, state_manager
+from facefusion.face_helper import WARP_TEMPLATE_SET, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_face_mask, resolve_occlusion_mask, warp_face_mask
+from facefusion.face_store import create_analysis_context
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('face_occluder_model', 'xseg_1')
+
+
+def test_warp_face_mask() -> None:
+	mask = numpy.zeros((64, 64), dtype = numpy.float32)
+	mask[16:48, 16:48] = 1
+	affine_matrix = numpy.array([ [ 2, 0, -32 ], [ 0, 2, -32 ] ], dtype = numpy.float64)
+	face_mask = create_face_mask(mask, affine_matrix, (128, 128))
+	warp_mask = warp_face_mask(face_mask.get('mask'), face_mask.get('affine_matrix'), affine_matrix, (128, 128))
+
+	assert warp_mask.shape == (128, 128)
+	assert numpy.all(warp_mask[40:88, 40:88] == 1)
+	assert numpy.all(warp_mask[:24, :24] == 0)
+
+	warp_mask = warp_face_mask(face_mask.get('mask'), face_mask.get('affine_matrix'), affine_matrix / 2, (64, 64))
+
+	assert numpy.all(warp_mask[20:44, 20:44] == 1)
+	assert numpy.all(warp_mask[:12, :12] == 0)
+
+
+def test_resolve_occlusion_mask() -> None:
+	temp_vision_frame = numpy.zeros((1024, 1024, 3), dtype = numpy.uint8)
+	face_landmark_5 = WARP_TEMPLATE_SET.get('ffhq_512') * 512 + 256
+	occlusion_mask = numpy.zeros((256, 256), dtype = numpy.float32)
+	occlusion_mask[8:-8, 8:-8] = 1
+	analysis_context = create_analysis_context(0)
+
+	with patch.object(face_masker, 'detect_occlusion_mask', return_value = occlusion_mask) as detect_occlusion_mask:
+		_, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'arcface_128', (128, 128))
+
+		assert numpy.all(resolve_occlusion_mask(temp_vision_frame, face_landmark_5, affine_matrix, (128, 128), analysis_context) == 1)
+
+		_, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, 'ffhq_512', (512, 512))
+
+		assert numpy.all(resolve_occlusion_mask(temp_vision_frame, face_landmark_5, affine_matrix, (512, 512), analysis_context) == 1)
+		assert detect_occlusion_mask.call_count == 1
+
+		resolve_occlusion_mask(temp_vision_frame, face_landmark_5 + 1, affine_matrix, (512, 512), analysis_context)
+
+		assert detect_occlusion_mask.call_count == 2
+
+		resolve_occlusion_mask(temp_vision_frame, face_landmark_5, affine_matrix, (512, 512), create_analysis_context(1))
+
+		assert detect_occlusion_mask.call_count == 3
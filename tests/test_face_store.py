@@ -0,0 +1,116 @@
+import tempfile
+
+import numpy
+import pytest
+
+from facefusion import face_store, state_manager
+from facefusion.face_store import clear_source_faces, clear_static_faces, create_analysis_context, create_source_key, get_face_store_stats, get_source_face, get_static_faces, set_source_face, set_static_faces
+from facefusion.types import Face
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('face_detector_model', 'yolo_face')
+	state_manager.init_item('face_detector_size', '640x640')
+	state_manager.init_item('face_landmarker_model', '2dfan4')
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_static_faces()
+	clear_source_faces()
+
+
+def test_get_static_faces() -> None:
+	vision_frame = numpy.zeros((8, 8, 3), dtype = numpy.uint8)
+
+	assert get_static_faces(vision_frame) is None
+
+	set_static_faces(vision_frame, [])
+
+	assert get_static_faces(vision_frame) == []
+
+
+def test_set_static_faces_evicts() -> None:
+	vision_frames = [ numpy.full((8, 8, 3), index, dtype = numpy.uint8) for index in range(face_store.FACE_STORE_SIZE + 1) ]
+
+	for vision_frame in vision_frames:
+		set_static_faces(vision_frame, [])
+
+	assert get_static_faces(vision_frames[0]) is None
+	assert get_static_faces(vision_frames[-1]) == []
+	assert get_face_store_stats().get('size') == face_store.FACE_STORE_SIZE
+
+
+def test_get_face_store_stats() -> None:
+	vision_frame = numpy.zeros((8, 8, 3), dtype = numpy.uint8)
+	set_static_faces(vision_frame, [])
+	get_static_faces(vision_frame)
+	get_static_faces(vision_frame)
+	get_static_faces(numpy.ones((8, 8, 3), dtype = numpy.uint8))
+
+	assert get_face_store_stats() ==\
+	{
+		'size': 1,
+		'hit_total': 2,
+		'miss_total': 1,
+		'hit_rate': 0.67
+	}
+
+
+def test_get_source_face() -> None:
+	with tempfile.NamedTemporaryFile(suffix = '.jpg') as source_file:
+		source_file.write(b'source')
+		source_file.flush()
+		source_face = Face(None, None, None, None, None, None, None, None, None)
+
+		assert get_source_face([ source_file.name ]) is None
+
+		set_source_face([ source_file.name ], source_face)
+
+		assert get_source_face([ source_file.name ]) == source_face
+
+		for key, value in [ ('face_detector_model', 'retinaface'), ('face_detector_score', 0.7), ('face_detector_angles', [ 90 ]), ('face_landmarker_score', 0.7), ('face_selector_order', 'small-large'), ('face_selector_gender', 'female') ]:
+			previous_value = state_manager.get_item(key)
+			state_manager.set_item(key, value)
+
+			assert get_source_face([ source_file.name ]) is None
+
+			state_manager.set_item(key, previous_value)
+
+		assert get_source_face([ source_file.name ]) == source_face
+
+
+def test_set_source_face_evicts() -> None:
+	source_face = Face(None, None, None, None, None, None, None, None, None)
+
+	for index in range(face_store.FACE_STORE_SIZE + 1):
+		set_source_face([ 'source-' + str(index) + '.jpg' ], source_face)
+
+	assert get_source_face([ 'source-0.jpg' ]) is None
+	assert get_source_face([ 'source-' + str(face_store.FACE_STORE_SIZE) + '.jpg' ]) == source_face
+	assert len(face_store.FACE_STORE.get('source_faces')) == face_store.FACE_STORE_SIZE
+
+
+def test_create_source_key() -> None:
+	with tempfile.NamedTemporaryFile() as source_file:
+		source_file.write(b'source')
+		source_file.flush()
+		source_key = create_source_key([ source_file.name ])
+
+		assert create_source_key([ source_file.name ]) == source_key
+
+		source_file.write(b'changed')
+		source_file.flush()
+
+		assert create_source_key([ source_file.name ]) != source_key
+
+
+def test_create_analysis_context() -> None:
+	assert create_analysis_context() ==\
+	{
+		'frame_number': None,
+		'reference_faces': None,
+		'target_faces': None,
+		'face_masks': {}
+	}
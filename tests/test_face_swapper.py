@@ -0,0 +1,88 @@
+import tempfile
+from typing import List
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+
+from facefusion import state_manager
+from facefusion.face_store import clear_source_faces, create_analysis_context, get_source_face
+from facefusion.processors.modules.face_swapper.core import process_frame
+from facefusion.types import AnalysisContext, Face, VisionFrame
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('face_detector_model', 'yolo_face')
+	state_manager.init_item('face_detector_size', '640x640')
+	state_manager.init_item('face_landmarker_model', '2dfan4')
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_source_faces()
+
+
+def test_process_frame_with_empty_source_face_store(mocker : MockerFixture) -> None:
+	source_face = Face(numpy.array([ 0, 0, 4, 4 ]), None, None, None, numpy.ones(512), numpy.ones(512), None, None, None)
+	get_many_faces_mock = mocker.patch('facefusion.processors.modules.face_swapper.core.get_many_faces', return_value = [ source_face ])
+	mocker.patch('facefusion.processors.modules.face_swapper.core.select_faces', return_value = [])
+	vision_frame = numpy.zeros((8, 8, 3), dtype = numpy.uint8)
+	vision_mask = numpy.ones((8, 8), dtype = numpy.float32)
+
+	with tempfile.NamedTemporaryFile(suffix = '.jpg') as source_file:
+		source_file.write(b'source')
+		source_file.flush()
+		state_manager.init_item('source_paths', [ source_file.name ])
+
+		for _ in range(2):
+			temp_vision_frame, temp_vision_mask = process_frame(
+			{
+				'reference_vision_frame': vision_frame,
+				'source_vision_frames': [ vision_frame ],
+				'target_vision_frame': vision_frame,
+				'temp_vision_frame': vision_frame,
+				'temp_vision_mask': vision_mask,
+				'analysis_context': create_analysis_context()
+			})
+
+			assert temp_vision_frame is vision_frame
+			assert temp_vision_mask is vision_mask
+
+		assert get_many_faces_mock.call_count == 1
+		assert numpy.array_equal(get_source_face([ source_file.name ]).embedding, source_face.embedding)
+
+
+@pytest.mark.parametrize('execution_batch_size, swap_frame_values', [ (1, [ 0, 1 ]), (2, [ 0, 0 ]) ])
+def test_process_frame_with_many_target_faces(mocker : MockerFixture, execution_batch_size : int, swap_frame_values : List[int]) -> None:
+	target_face = Face(numpy.array([ 0, 0, 4, 4 ]), None, None, None, numpy.ones(512), numpy.ones(512), None, None, None)
+	swap_vision_frames = []
+
+	def swap_test_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame, analysis_context : AnalysisContext) -> VisionFrame:
+		swap_vision_frames.append(temp_vision_frame)
+		return temp_vision_frame + 1
+
+	def swap_test_faces(source_face : Face, target_faces : List[Face], temp_vision_frames : List[VisionFrame], analysis_contexts : List[AnalysisContext]) -> List[VisionFrame]:
+		swap_vision_frames.extend(temp_vision_frames)
+		return [ temp_vision_frame + len(target_faces) for temp_vision_frame in temp_vision_frames ]
+
+	state_manager.init_item('execution_batch_size', execution_batch_size)
+	mocker.patch('facefusion.processors.modules.face_swapper.core.conditional_extract_source_face', return_value = target_face)
+	mocker.patch('facefusion.processors.modules.face_swapper.core.select_faces', return_value = [ target_face, target_face ])
+	mocker.patch('facefusion.processors.modules.face_swapper.core.scale_face', side_effect = lambda target_face, target_vision_frame, temp_vision_frame : target_face)
+	mocker.patch('facefusion.processors.modules.face_swapper.core.swap_face', side_effect = swap_test_face)
+	mocker.patch('facefusion.processors.modules.face_swapper.core.swap_faces', side_effect = swap_test_faces)
+	vision_frame = numpy.zeros((8, 8, 3), dtype = numpy.uint8)
+
+	temp_vision_frame, _ = process_frame(
+	{
+		'reference_vision_frame': vision_frame,
+		'source_vision_frames': [ vision_frame ],
+		'target_vision_frame': vision_frame,
+		'temp_vision_frame': vision_frame,
+		'temp_vision_mask': numpy.ones((8, 8), dtype = numpy.float32),
+		'analysis_context': create_analysis_context()
+	})
+
+	assert numpy.all(temp_vision_frame == 2)
+	assert [ swap_vision_frame[0, 0, 0] for swap_vision_frame in swap_vision_frames ] == swap_frame_values
@@ -0,0 +1,65 @@
+import numpy
+import pytest
+
+from facefusion.face_helper import calculate_bounding_box_iou
+from facefusion.face_tracker import assign_track_ids, claim_face_track, clear_face_tracker, detect_scene_cut, get_track_match, set_track_match
+from facefusion.types import Face
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_face_tracker()
+
+
+def create_face(bounding_box : numpy.ndarray) -> Face:
+	return Face(
+		bounding_box = bounding_box,
+		score_set = {},
+		landmark_set = {},
+		angle = 0,
+		embedding = None,
+		embedding_norm = None,
+		gender = None,
+		age = None,
+		race = None
+	)
+
+
+def test_calculate_bounding_box_iou() -> None:
+	assert calculate_bounding_box_iou(numpy.array([ 0, 0, 10, 10 ]), numpy.array([ 0, 0, 10, 10 ])) == 1.0
+	assert calculate_bounding_box_iou(numpy.array([ 0, 0, 10, 10 ]), numpy.array([ 5, 0, 15, 10 ])) == pytest.approx(0.33, abs = 0.01)
+	assert calculate_bounding_box_iou(numpy.array([ 0, 0, 10, 10 ]), numpy.array([ 20, 20, 30, 30 ])) == 0.0
+
+
+def test_assign_track_ids() -> None:
+	previous_faces = assign_track_ids([ create_face(numpy.array([ 0, 0, 10, 10 ])), create_face(numpy.array([ 50, 50, 60, 60 ])) ], [])
+
+	assert [ face.track_id for face in previous_faces ] == [ 1, 2 ]
+
+	faces = assign_track_ids([ create_face(numpy.array([ 51, 51, 61, 61 ])), create_face(numpy.array([ 100, 100, 110, 110 ])), create_face(numpy.array([ 1, 1, 11, 11 ])) ], previous_faces)
+
+	assert [ face.track_id for face in faces ] == [ 2, 3, 1 ]
+
+
+def test_claim_face_track() -> None:
+	face_track, is_claimed = claim_face_track(0)
+
+	assert is_claimed is True
+	assert claim_face_track(0) == (face_track, False)
+
+
+def test_detect_scene_cut() -> None:
+	vision_frame = numpy.zeros((72, 128, 3), dtype = numpy.uint8)
+	track_vision_frame = numpy.zeros((36, 64), dtype = numpy.uint8)
+
+	assert detect_scene_cut(vision_frame, None) is True
+	assert detect_scene_cut(vision_frame, track_vision_frame) is False
+	assert detect_scene_cut(vision_frame + 255, track_vision_frame) is True
+
+
+def test_track_match() -> None:
+	assert get_track_match(1, 0) is None
+
+	set_track_match(1, 0, True)
+
+	assert get_track_match(1, 0) is True
@@ -7,7 +7,7 @@ import pytest
 import facefusion.ffmpeg
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import concat_video, extract_frames, merge_video, read_audio_buffer, replace_audio, restore_audio, spawn_frames
+from facefusion.ffmpeg import concat_video, extract_frames, merge_video, pipe_extract_frames, pipe_sample_frames, read_audio_buffer, replace_audio, restore_audio, spawn_frames
 from facefusion.filesystem import copy_file
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, resolve_temp_frame_paths
 from facefusion.types import EncoderSet
@@ -90,6 +90,39 @@ def test_extract_frames() -> None:
 		clear_temp_directory(state_manager.get_temp_path(), output_path)
 
 
+def test_pipe_extract_frames() -> None:
+	test_set =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 0, 270, 324),
+		(get_test_example_file('target-240p-25fps.mp4'), 224, 270, 55),
+		(get_test_example_file('target-240p-30fps.mp4'), 124, 224, 100),
+		(get_test_example_file('target-240p-60fps.mp4'), 0, 100, 50)
+	]
+
+	for target_path, trim_frame_start, trim_frame_end, frame_total in test_set:
+		process = pipe_extract_frames(target_path, (452, 240), 30.0, trim_frame_start, trim_frame_end)
+		frame_buffer, _ = process.communicate()
+
+		assert process.returncode == 0
+		assert len(frame_buffer) == 452 * 240 * 3 * frame_total
+
+
+def test_pipe_sample_frames() -> None:
+	test_set =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 25.0, 0, 270, 25, 11),
+		(get_test_example_file('target-240p-25fps.mp4'), 25.0, 224, 270, 25, 2),
+		(get_test_example_file('target-240p-30fps.mp4'), 30.0, 124, 224, 30, 3)
+	]
+
+	for target_path, target_video_fps, trim_frame_start, trim_frame_end, sample_interval, frame_total in test_set:
+		process = pipe_sample_frames(target_path, (226, 120), target_video_fps, trim_frame_start, trim_frame_end, sample_interval)
+		frame_buffer, _ = process.communicate()
+
+		assert process.returncode == 0
+		assert len(frame_buffer) == 226 * 120 * 3 * frame_total
+
+
 def test_spawn_frames() -> None:
 	test_set =\
 	[
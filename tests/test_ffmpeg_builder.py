@@ -1,7 +1,7 @@
 from shutil import which
 
 from facefusion import ffmpeg_builder
-from facefusion.ffmpeg_builder import chain, concat, keep_video_alpha, run, select_frame_range, set_audio_quality, set_audio_sample_size, set_stream_mode, set_video_encoder, set_video_fps, set_video_quality
+from facefusion.ffmpeg_builder import chain, concat, keep_video_alpha, run, select_frame_interval, select_frame_range, set_audio_quality, set_audio_sample_size, set_input_start, set_stream_mode, set_video_encoder, set_video_fps, set_video_quality
 
 
 def test_run() -> None:
@@ -48,6 +48,16 @@ def test_select_frame_range() -> None:
 	assert select_frame_range(None, None, 30) == [ '-vf', 'fps=30' ]
 
 
+def test_select_frame_interval() -> None:
+	assert select_frame_interval(0, 100, 30) == [ '-vf', 'select=between(n\\,0\\,99)*not(mod(n+0\\,30))' ]
+	assert select_frame_interval(10, 20, 5) == [ '-vf', 'select=between(n\\,0\\,9)*not(mod(n+10\\,5))' ]
+
+
+def test_set_input_start() -> None:
+	assert set_input_start(0, 25.0) == [ '-ss', '0.0' ]
+	assert set_input_start(224, 25.0) == [ '-ss', '8.96' ]
+
+
 def test_set_audio_sample_size() -> None:
 	assert set_audio_sample_size(16) == [ '-f', 's16le' ]
 	assert set_audio_sample_size(32) == [ '-f', 's32le' ]
@@ -4,7 +4,7 @@ import pytest
 
 from facefusion import process_manager
 from facefusion.download import conditional_download
-from facefusion.ffprobe import detect_audio_channel_total, detect_audio_frame_total, detect_audio_sample_rate
+from facefusion.ffprobe import detect_audio_channel_total, detect_audio_frame_total, detect_audio_sample_rate, detect_video_keyframe_numbers
 from .helper import get_test_example_file, get_test_examples_directory
 
 
@@ -13,9 +13,11 @@ def before_all() -> None:
 	process_manager.start()
 	conditional_download(get_test_examples_directory(),
 	[
-		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/source.mp3'
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/source.mp3',
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
 	])
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('source.mp3'), '-t', '1.9', '-ar', '48000', '-ac', '2', get_test_example_file('test-audio-entries.wav') ])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-t', '4', '-r', '25', '-g', '25', '-sc_threshold', '0', '-c:v', 'libx264', '-an', get_test_example_file('target-240p-keyframes.mp4') ])
 
 
 def test_detect_audio_sample_rate() -> None:
@@ -34,3 +36,8 @@ def test_detect_audio_frame_total() -> None:
 	assert detect_audio_frame_total(get_test_example_file('source.mp3')) == 167039
 	assert detect_audio_frame_total(get_test_example_file('test-audio-entries.wav')) == 91200
 	assert detect_audio_frame_total(get_test_example_file('invalid.mp3')) is None
+
+
+def test_detect_video_keyframe_numbers() -> None:
+	assert detect_video_keyframe_numbers(get_test_example_file('target-240p-keyframes.mp4'), 25.0) == [ 0, 25, 50, 75 ]
+	assert detect_video_keyframe_numbers(get_test_example_file('invalid.mp4'), 25.0) == []
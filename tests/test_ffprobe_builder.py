@@ -1,7 +1,7 @@
 from shutil import which
 
 from facefusion import ffprobe_builder
-from facefusion.ffprobe_builder import chain, format_to_key_value, format_to_value, run, set_input, show_entries
+from facefusion.ffprobe_builder import chain, format_to_csv, format_to_json, format_to_key_value, format_to_value, run, select_video_stream, set_input, show_entries, show_format, show_packet_entries, show_streams
 
 
 def test_run() -> None:
@@ -21,6 +21,22 @@ def test_show_entries() -> None:
 	assert show_entries([ 'duration', 'sample_rate']) == [ '-show_entries', 'stream=duration,sample_rate' ]
 
 
+def test_show_packet_entries() -> None:
+	assert show_packet_entries([ 'pts_time', 'flags' ]) == [ '-show_entries', 'packet=pts_time,flags' ]
+
+
+def test_select_video_stream() -> None:
+	assert select_video_stream() == [ '-select_streams', 'v:0' ]
+
+
+def test_show_streams() -> None:
+	assert show_streams() == [ '-show_streams' ]
+
+
+def test_show_format() -> None:
+	assert show_format() == [ '-show_format' ]
+
+
 def test_format_to_value() -> None:
 	assert format_to_value() == [ '-of', 'default=noprint_wrappers=1:nokey=1' ]
 
@@ -29,6 +45,14 @@ def test_format_to_key_value() -> None:
 	assert format_to_key_value() == [ '-of', 'default=noprint_wrappers=1' ]
 
 
+def test_format_to_csv() -> None:
+	assert format_to_csv() == [ '-of', 'csv=p=0' ]
+
+
+def test_format_to_json() -> None:
+	assert format_to_json() == [ '-of', 'json' ]
+
+
 def test_set_input() -> None:
 	assert set_input('input.mp3') == [ 'input.mp3' ]
 	assert set_input('input.wav') == [ 'input.wav' ]
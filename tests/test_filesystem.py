@@ -1,9 +1,11 @@
 import os.path
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.filesystem import create_directory, filter_audio_paths, filter_image_paths, get_file_extension, get_file_format, get_file_size, has_audio, has_image, has_video, in_directory, is_audio, is_directory, is_file, is_image, is_video, remove_directory, resolve_file_paths
+from facefusion.filesystem import create_directory, filter_audio_paths, filter_image_paths, get_file_extension, get_file_format, get_file_size, has_audio, has_image, has_video, in_directory, is_audio, is_directory, is_file, is_image, is_network_directory, is_video, remove_directory, resolve_file_paths
 from .helper import get_test_example_file, get_test_examples_directory, get_test_outputs_directory
 
 
@@ -123,6 +125,21 @@ def test_is_directory() -> None:
 	assert is_directory('invalid') is False
 
 
+def test_is_network_directory() -> None:
+	examples_directory = os.path.realpath(get_test_examples_directory())
+	disk_partitions =\
+	[
+		SimpleNamespace(mountpoint = os.path.dirname(examples_directory), fstype = 'ext4', opts = 'rw'),
+		SimpleNamespace(mountpoint = examples_directory, fstype = 'nfs4', opts = 'rw')
+	]
+
+	with patch('facefusion.filesystem.psutil.disk_partitions', return_value = disk_partitions):
+		assert is_network_directory(get_test_examples_directory()) is True
+		assert is_network_directory(os.path.dirname(examples_directory)) is False
+
+	assert is_network_directory('invalid') is False
+
+
 def test_in_directory() -> None:
 	assert in_directory(get_test_example_file('source.jpg')) is True
 	assert in_directory('source.jpg') is False
@@ -0,0 +1,81 @@
+from typing import List
+
+import numpy
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+from onnxruntime import InferenceSession
+from pytest_mock import MockerFixture
+
+from facefusion import state_manager
+from facefusion.inference_manager import get_execution_device_id, pin_execution_device
+from facefusion.processors.modules.frame_enhancer.core import clear_tile_executor, enhance_tile_frames, get_tile_executor
+from facefusion.types import VisionFrame
+
+
+def create_stub_session() -> InferenceSession:
+	stub_weight = numpy_helper.from_array(numpy.full((3, 3, 3, 3), 1 / 27, dtype = numpy.float32), 'weight')
+	stub_scale = numpy_helper.from_array(numpy.array([ 1, 1, 4, 4 ], dtype = numpy.float32), 'scale')
+	stub_graph = helper.make_graph(
+	[
+		helper.make_node('Conv', [ 'input', 'weight' ], [ 'conv' ], pads = [ 1, 1, 1, 1 ]),
+		helper.make_node('Resize', [ 'conv', '', 'scale' ], [ 'output' ], mode = 'nearest')
+	], 'stub', [ helper.make_tensor_value_info('input', TensorProto.FLOAT, [ 'batch', 3, 'height', 'width' ]) ], [ helper.make_tensor_value_info('output', TensorProto.FLOAT, None) ], [ stub_weight, stub_scale ])
+	stub_model = helper.make_model(stub_graph, opset_imports = [ helper.make_opsetid('', 13) ])
+	return InferenceSession(stub_model.SerializeToString(), providers = [ 'CPUExecutionProvider' ])
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_device_ids', [ 0, 1 ])
+	state_manager.init_item('execution_device_scheduler', 'round-robin')
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('frame_enhancer_tile_batch', 1)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_tile_executor()
+
+
+def test_enhance_tile_frames(mocker : MockerFixture) -> None:
+	execution_device_ids : List[int] = []
+
+	def forward_test_batch(tile_vision_frames : VisionFrame) -> VisionFrame:
+		execution_device_ids.append(get_execution_device_id([ 0, 1 ]))
+		return tile_vision_frames
+
+	mocker.patch('facefusion.processors.modules.frame_enhancer.core.forward_batch', side_effect = forward_test_batch)
+	tile_vision_frames = [ numpy.full((8, 8, 3), index, dtype = numpy.uint8) for index in range(8) ]
+
+	with pin_execution_device(1):
+		enhance_vision_frames = enhance_tile_frames(tile_vision_frames)
+
+	assert execution_device_ids == [ 1 ] * 8
+	assert [ enhance_vision_frame[0, 0, 0] for enhance_vision_frame in enhance_vision_frames ] == list(range(8))
+	assert get_tile_executor() is get_tile_executor()
+
+
+def test_enhance_tile_frames_with_batch(mocker : MockerFixture) -> None:
+	state_manager.set_item('frame_enhancer_tile_batch', 3)
+	mocker.patch('facefusion.processors.modules.frame_enhancer.core.forward_batch', side_effect = lambda tile_vision_frames : tile_vision_frames)
+	tile_vision_frames = [ numpy.full((8, 8, 3), index, dtype = numpy.uint8) for index in range(8) ]
+	enhance_vision_frames = enhance_tile_frames(tile_vision_frames)
+
+	assert [ enhance_vision_frame[0, 0, 0] for enhance_vision_frame in enhance_vision_frames ] == list(range(8))
+	state_manager.set_item('frame_enhancer_tile_batch', 1)
+
+
+def test_enhance_tile_frames_with_stub_model(mocker : MockerFixture) -> None:
+	mocker.patch('facefusion.processors.modules.frame_enhancer.core.get_inference_pool', return_value = { 'frame_enhancer': create_stub_session() })
+	tile_vision_frames = [ numpy.random.randint(0, 255, (32, 32, 3), dtype = numpy.uint8) for _ in range(5) ]
+	enhance_vision_frame_sets = []
+
+	for frame_enhancer_tile_batch in [ 1, 2, 4 ]:
+		state_manager.set_item('frame_enhancer_tile_batch', frame_enhancer_tile_batch)
+		enhance_vision_frame_sets.append(enhance_tile_frames(tile_vision_frames))
+
+	state_manager.set_item('frame_enhancer_tile_batch', 1)
+
+	for enhance_vision_frames in enhance_vision_frame_sets:
+		assert [ enhance_vision_frame.shape for enhance_vision_frame in enhance_vision_frames ] == [ (128, 128, 3) ] * 5
+		assert all(numpy.array_equal(enhance_vision_frame, reference_frame) for enhance_vision_frame, reference_frame in zip(enhance_vision_frames, enhance_vision_frame_sets[0]))
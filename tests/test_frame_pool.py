@@ -0,0 +1,34 @@
+from typing import List
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.frame_pool import open_frame_pool, submit_frames
+from facefusion.types import ExecutionWorkerMode, VisionFrame
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('log_level', 'info')
+
+
+def invert_frames(vision_frames : List[VisionFrame], frame_offset : int) -> List[VisionFrame]:
+	return [ 255 - vision_frame - frame_offset for vision_frame in vision_frames ]
+
+
+def enlarge_frames(vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	return [ numpy.tile(vision_frame, (4, 4, 1)) for vision_frame in vision_frames ]
+
+
+@pytest.mark.parametrize('execution_worker_mode', [ 'thread', 'process' ])
+def test_submit_frames(execution_worker_mode : ExecutionWorkerMode) -> None:
+	vision_frames = [ numpy.full((32, 48, 3), index, dtype = numpy.uint8) for index in range(12) ]
+
+	with open_frame_pool(execution_worker_mode, 2) as frame_pool:
+		futures = [ submit_frames(frame_pool, invert_frames, vision_frames[index:index + 3], 1) for index in range(0, len(vision_frames), 3) ]
+		invert_vision_frames = [ vision_frame for future in futures for vision_frame in future.result() ]
+
+		assert [ int(vision_frame[0, 0, 0]) for vision_frame in invert_vision_frames ] == [ 254 - index for index in range(12) ]
+		assert enlarge_frames(vision_frames[:1])[0].shape == submit_frames(frame_pool, enlarge_frames, vision_frames[:1]).result()[0].shape
+		assert submit_frames(frame_pool, invert_frames, [ numpy.zeros((64, 96, 3), dtype = numpy.uint8) ], 0).result()[0].shape == (64, 96, 3)
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from facefusion.hash_helper import create_file_hash, create_hash, get_hash_validation, resolve_file_hash, validate_hash
+
+
+def test_create_file_hash() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		file_path = os.path.join(temp_directory_path, 'test.onnx')
+
+		with open(file_path, 'wb') as file:
+			file.write(b'test' * 1024 * 1024)
+
+		assert create_file_hash(file_path) == create_hash(b'test' * 1024 * 1024)
+		assert create_file_hash(os.path.join(temp_directory_path, 'invalid.onnx')) is None
+
+
+def test_validate_hash() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		file_path = os.path.join(temp_directory_path, 'test.onnx')
+		hash_path = os.path.join(temp_directory_path, 'test.hash')
+
+		with open(file_path, 'wb') as file:
+			file.write(b'test')
+		with open(hash_path, 'w') as hash_file:
+			hash_file.write(create_hash(b'test'))
+
+		assert get_hash_validation(file_path) is None
+		assert validate_hash(file_path) is True
+		assert get_hash_validation(file_path).get('file_hash') == create_hash(b'test')
+		assert validate_hash(file_path) is True
+
+		with open(file_path, 'wb') as file:
+			file.write(b'invalid')
+
+		assert validate_hash(file_path) is False
+		assert get_hash_validation(file_path).get('file_hash') == create_hash(b'invalid')
+
+
+def test_resolve_file_hash_with_processes() -> None:
+	with tempfile.TemporaryDirectory() as temp_directory_path:
+		file_paths = [ os.path.join(temp_directory_path, 'test-' + str(index) + '.onnx') for index in range(8) ]
+
+		for file_path in file_paths:
+			with open(file_path, 'wb') as file:
+				file.write(file_path.encode())
+
+		with ProcessPoolExecutor(max_workers = 4, mp_context = multiprocessing.get_context('spawn')) as executor:
+			file_hashes = list(executor.map(resolve_file_hash, file_paths))
+
+		for file_path, file_hash in zip(file_paths, file_hashes):
+			assert get_hash_validation(file_path).get('file_hash') == file_hash == create_hash(file_path.encode())
@@ -4,13 +4,16 @@ import pytest
 from onnxruntime import InferenceSession
 
 from facefusion import content_analyser, state_manager
-from facefusion.inference_manager import INFERENCE_POOL_SET, get_inference_pool
+from facefusion.inference_manager import INFERENCE_POOL_SET, INFERENCE_SESSION_LIMITER_SET, bind_execution_device, clear_inference_session_metrics, create_inference_session_limiter, get_execution_device_id, get_execution_device_loads, get_inference_pool, get_inference_session_metrics, pin_execution_device, select_execution_device_id, session_semaphore
+from facefusion.thread_helper import thread_semaphore
 
 
 @pytest.fixture(scope = 'module', autouse = True)
 def before_all() -> None:
 	state_manager.init_item('execution_device_ids', [ 0 ])
 	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_device_scheduler', 'least-outstanding')
+	state_manager.init_item('execution_session_concurrency', 2)
 	state_manager.init_item('download_providers', [ 'github' ])
 	content_analyser.pre_check()
 
@@ -30,3 +33,79 @@ def test_get_inference_pool() -> None:
 		assert isinstance(INFERENCE_POOL_SET.get('cli').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1'), InferenceSession)
 
 	assert INFERENCE_POOL_SET.get('cli').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1') == INFERENCE_POOL_SET.get('api').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1')
+
+
+def test_get_inference_pool_with_many_devices() -> None:
+	model_names = [ 'nsfw_1', 'nsfw_2', 'nsfw_3' ]
+	_, model_source_set = content_analyser.collect_model_downloads()
+	state_manager.set_item('execution_device_ids', [ 0, 1 ])
+
+	with patch('facefusion.inference_manager.detect_app_context', return_value = 'cli'):
+		with bind_execution_device() as execution_device_id:
+			inference_pool = get_inference_pool('facefusion.content_analyser', model_names, model_source_set)
+
+			assert inference_pool == INFERENCE_POOL_SET.get('cli').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.' + str(execution_device_id) + '.cpu')
+			assert get_inference_pool('facefusion.content_analyser', model_names, model_source_set) == inference_pool
+
+	state_manager.set_item('execution_device_ids', [ 0 ])
+
+
+def test_select_execution_device_id() -> None:
+	state_manager.set_item('execution_device_scheduler', 'round-robin')
+	execution_device_ids = [ select_execution_device_id([ 0, 1, 2 ]) for _ in range(6) ]
+
+	assert sorted(execution_device_ids) == [ 0, 0, 1, 1, 2, 2 ]
+
+	state_manager.set_item('execution_device_scheduler', 'least-outstanding')
+	state_manager.set_item('execution_device_ids', [ 0, 1 ])
+
+	with bind_execution_device() as execution_device_id:
+		assert get_execution_device_loads().get(execution_device_id) == 1
+		assert select_execution_device_id([ 0, 1 ]) != execution_device_id
+		assert get_execution_device_id([ 0, 1 ]) == execution_device_id
+
+	assert get_execution_device_loads().get(execution_device_id) == 0
+
+	with bind_execution_device() as execution_device_id:
+		with pin_execution_device(1 - execution_device_id):
+			assert get_execution_device_id([ 0, 1 ]) == 1 - execution_device_id
+
+		assert get_execution_device_id([ 0, 1 ]) == execution_device_id
+
+	state_manager.set_item('execution_device_ids', [ 0 ])
+
+
+def test_session_semaphore() -> None:
+	model_names = [ 'nsfw_1', 'nsfw_2', 'nsfw_3' ]
+	_, model_source_set = content_analyser.collect_model_downloads()
+	clear_inference_session_metrics()
+
+	with patch('facefusion.inference_manager.detect_app_context', return_value = 'cli'):
+		inference_session = get_inference_pool('facefusion.content_analyser', model_names, model_source_set).get('nsfw_1')
+
+	assert INFERENCE_SESSION_LIMITER_SET.get(id(inference_session)).get('model_name') == 'nsfw_1'
+
+	with session_semaphore(inference_session):
+		with session_semaphore(inference_session):
+			pass
+
+	assert get_inference_session_metrics().get('nsfw_1').get('run_total') == 2
+
+
+def test_session_semaphore_with_thread_semaphore() -> None:
+	inference_session = object()
+
+	with patch('facefusion.inference_manager.conditional_thread_semaphore', return_value = thread_semaphore()):
+		with session_semaphore(inference_session):
+			assert thread_semaphore().acquire(blocking = False) is False
+
+	assert thread_semaphore().acquire(blocking = False) is True
+	thread_semaphore().release()
+
+
+def test_create_inference_session_limiter() -> None:
+	inference_session_limiter = create_inference_session_limiter('test')
+
+	assert inference_session_limiter.get('semaphore').acquire(blocking = False) is True
+	assert inference_session_limiter.get('semaphore').acquire(blocking = False) is True
+	assert inference_session_limiter.get('semaphore').acquire(blocking = False) is False
@@ -1,9 +1,21 @@
 import os
 
-from facefusion.jobs.job_helper import get_step_output_path
+from facefusion.jobs.job_helper import create_segment_ranges, get_step_lease_id, get_step_output_path
 
 
 def test_get_step_output_path() -> None:
 	assert get_step_output_path('test-job', 0, 'test.mp4') == 'test-test-job-0.mp4'
 	assert get_step_output_path('test-job', 0, 'test/test.mp4') == os.path.join('test', 'test-test-job-0.mp4')
 	assert get_step_output_path('test-job', 0, 'invalid') is None
+
+
+def test_get_step_lease_id() -> None:
+	assert get_step_lease_id('test-job', 0) == 'test-job.0'
+	assert get_step_lease_id('test-job', 12) == 'test-job.12'
+
+
+def test_create_segment_ranges() -> None:
+	assert create_segment_ranges(0, 100, 200, []) == [ (0, 100) ]
+	assert create_segment_ranges(0, 100, 40, []) == [ (0, 40), (40, 80), (80, 100) ]
+	assert create_segment_ranges(10, 100, 40, [ 0, 48, 75, 99 ]) == [ (10, 48), (48, 75), (75, 100) ]
+	assert create_segment_ranges(0, 100, 40, [ 0, 5, 95 ]) == [ (0, 40), (40, 80), (80, 100) ]
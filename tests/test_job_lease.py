@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from time import time
+from unittest.mock import patch
+
+import pytest
+
+from facefusion import process_manager
+from facefusion.jobs import job_lease
+from facefusion.jobs.job_lease import claim_lease, get_lease_path, heartbeat_lease, lock_lease, read_lease, release_lease, renew_lease
+from facefusion.jobs.job_manager import clear_jobs, init_jobs
+from .helper import get_test_jobs_directory
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory())
+
+
+def claim_test_lease(jobs_path : str, worker_id : str) -> bool:
+	init_jobs(jobs_path)
+	return claim_lease('job-test-claim-lease', worker_id)
+
+
+def test_claim_lease() -> None:
+	assert claim_lease('job-test-claim-lease', 'worker-1') is True
+	assert claim_lease('job-test-claim-lease', 'worker-2') is False
+	assert read_lease('job-test-claim-lease') == 'worker-1'
+
+
+def test_claim_lease_with_processes() -> None:
+	with ProcessPoolExecutor(max_workers = 4, mp_context = multiprocessing.get_context('spawn')) as executor:
+		futures = [ executor.submit(claim_test_lease, get_test_jobs_directory(), 'worker-' + str(index)) for index in range(8) ]
+
+		assert [ future.result() for future in futures ].count(True) == 1
+
+
+def test_renew_lease() -> None:
+	claim_lease('job-test-renew-lease', 'worker-1')
+	os.utime(get_lease_path('job-test-renew-lease'), (0, 0))
+
+	assert renew_lease('job-test-renew-lease', 'worker-2') is False
+	assert renew_lease('job-test-renew-lease', 'worker-1') is True
+	assert time() - os.path.getmtime(get_lease_path('job-test-renew-lease')) < job_lease.LEASE_DURATION
+
+
+def test_release_lease() -> None:
+	claim_lease('job-test-release-lease', 'worker-1')
+
+	assert release_lease('job-test-release-lease', 'worker-2') is False
+	assert release_lease('job-test-release-lease', 'worker-1') is True
+	assert claim_lease('job-test-release-lease', 'worker-2') is True
+
+
+def test_reclaim_lease_with_clock_skew() -> None:
+	claim_lease('job-test-reclaim-lease', 'worker-1')
+
+	with patch('time.time', return_value = time() + job_lease.LEASE_DURATION * 2):
+		assert claim_lease('job-test-reclaim-lease', 'worker-2') is False
+
+	assert read_lease('job-test-reclaim-lease') == 'worker-1'
+
+
+def test_reclaim_lease() -> None:
+	claim_lease('job-test-reclaim-lease', 'worker-1')
+
+	assert claim_lease('job-test-reclaim-lease', 'worker-2') is False
+
+	os.utime(get_lease_path('job-test-reclaim-lease'), (0, 0))
+
+	assert claim_lease('job-test-reclaim-lease', 'worker-2') is True
+	assert read_lease('job-test-reclaim-lease') == 'worker-2'
+	assert renew_lease('job-test-reclaim-lease', 'worker-1') is False
+
+
+def test_lock_lease() -> None:
+	claim_lease('job-test-lock-lease', 'worker-2')
+	lock_thread = threading.Timer(0.5, release_lease, args = ('job-test-lock-lease', 'worker-2'))
+	lock_thread.start()
+
+	with lock_lease('job-test-lock-lease', 'worker-1'):
+		assert read_lease('job-test-lock-lease') == 'worker-1'
+
+	lock_thread.join()
+
+	assert read_lease('job-test-lock-lease') is None
+
+
+def test_heartbeat_lease() -> None:
+	claim_lease('job-test-heartbeat-lease', 'worker-1')
+	process_manager.start()
+
+	with patch('facefusion.jobs.job_lease.LEASE_INTERVAL', 0):
+		heartbeat_lease('job-test-heartbeat-lease', 'worker-2', threading.Event())
+
+	assert process_manager.is_stopping() is True
+
+	process_manager.end()
@@ -1,16 +1,17 @@
 from time import sleep
 
 import pytest
+from pytest import FixtureRequest
 
 from facefusion.jobs.job_helper import get_step_output_path
-from facefusion.jobs.job_manager import add_step, clear_jobs, count_step_total, create_job, delete_job, delete_jobs, find_job_ids, find_jobs, get_steps, init_jobs, insert_step, move_job_file, remix_step, remove_step, set_step_status, set_steps_status, submit_job, submit_jobs
+from facefusion.jobs.job_manager import add_step, clear_jobs, count_step_total, create_job, delete_job, delete_jobs, find_job_ids, find_job_status, find_jobs, get_steps, init_jobs, insert_step, migrate_jobs, move_job_file, remix_step, remove_step, set_step_status, set_steps_status, submit_job, submit_jobs
 from .helper import get_test_jobs_directory
 
 
-@pytest.fixture(scope = 'function', autouse = True)
-def before_each() -> None:
+@pytest.fixture(scope = 'function', autouse = True, params = [ 'json', 'sqlite' ])
+def before_each(request : FixtureRequest) -> None:
 	clear_jobs(get_test_jobs_directory())
-	init_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory(), request.param)
 
 
 def test_create_job() -> None:
@@ -164,6 +165,17 @@ def test_find_job_ids() -> None:
 	assert find_job_ids('failed') == [ 'job-test-find-job-ids-2' ]
 
 
+def test_find_job_status() -> None:
+	create_job('job-test-find-job-status')
+
+	assert find_job_status('job-test-find-job-status') == 'drafted'
+
+	move_job_file('job-test-find-job-status', 'failed')
+
+	assert find_job_status('job-test-find-job-status') == 'failed'
+	assert find_job_status('job-invalid') is None
+
+
 def test_add_step() -> None:
 	args_1 =\
 	{
@@ -427,3 +439,38 @@ def test_set_steps_status() -> None:
 	assert steps[0].get('status') == 'queued'
 	assert steps[1].get('status') == 'queued'
 	assert count_step_total('job-test-set-steps-status') == 2
+
+
+def test_migrate_jobs() -> None:
+	args_1 =\
+	{
+		'source_path': 'source-1.jpg',
+		'target_path': 'target-1.jpg',
+		'output_path': 'output-1.jpg'
+	}
+
+	clear_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory(), 'json')
+	create_job('job-test-migrate-jobs-1')
+	create_job('job-test-migrate-jobs-2')
+	add_step('job-test-migrate-jobs-1', args_1)
+	submit_job('job-test-migrate-jobs-1')
+
+	assert migrate_jobs(get_test_jobs_directory(), 'json') is False
+	assert migrate_jobs(get_test_jobs_directory(), 'sqlite') is True
+
+	init_jobs(get_test_jobs_directory(), 'sqlite')
+
+	assert find_job_ids('queued') == [ 'job-test-migrate-jobs-1' ]
+	assert find_job_ids('drafted') == [ 'job-test-migrate-jobs-2' ]
+	assert get_steps('job-test-migrate-jobs-1')[0].get('args') == args_1
+
+	init_jobs(get_test_jobs_directory(), 'json')
+	create_job('job-test-migrate-jobs-3')
+
+	assert migrate_jobs(get_test_jobs_directory(), 'sqlite') is True
+
+	init_jobs(get_test_jobs_directory(), 'sqlite')
+
+	assert find_job_ids('queued') == [ 'job-test-migrate-jobs-1' ]
+	assert find_job_ids('drafted') == [ 'job-test-migrate-jobs-2', 'job-test-migrate-jobs-3' ]
@@ -1,11 +1,15 @@
 import os
 import subprocess
+from time import sleep, time
 
 import pytest
 
+from facefusion import state_manager
 from facefusion.download import conditional_download
-from facefusion.filesystem import copy_file, create_directory, get_file_extension
-from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, init_jobs, move_job_file, submit_job, submit_jobs
+from facefusion.filesystem import copy_file, create_directory, get_file_extension, resolve_file_pattern
+from facefusion.jobs.job_helper import get_step_lease_id
+from facefusion.jobs.job_lease import claim_lease, read_lease
+from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, find_job_ids, get_steps, init_jobs, move_job_file, submit_job, submit_jobs
 from facefusion.jobs.job_runner import collect_output_set, finalize_steps, retry_job, retry_jobs, run_job, run_jobs, run_steps
 from facefusion.types import Args
 from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_path, is_test_output_file, is_test_output_sequence, prepare_test_output_directory
@@ -19,6 +23,7 @@ def before_all() -> None:
 		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
 	])
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vframes', '1', get_test_example_file('target-240p.jpg') ])
+	state_manager.init_item('log_level', 'info')
 
 
 @pytest.fixture(scope = 'function', autouse = True)
@@ -40,6 +45,22 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 	return copy_file(target_path, output_path)
 
 
+def process_step_abruptly(job_id : str, step_index : int, step_args : Args) -> bool:
+	os._exit(1)
+
+
+def process_step_concurrently(job_id : str, step_index : int, step_args : Args) -> bool:
+	with open(get_test_output_path(job_id + '-' + str(step_index) + '.barrier'), 'w'):
+		pass
+	start_time = time()
+
+	while time() - start_time < 10:
+		if len(resolve_file_pattern(get_test_output_path(job_id + '-*.barrier'))) == 2:
+			return process_step(job_id, step_index, step_args)
+		sleep(0.1)
+	return False
+
+
 def test_run_job() -> None:
 	args_1 =\
 	{
@@ -126,6 +147,113 @@ def test_run_jobs() -> None:
 	assert run_jobs(process_step, halt_on_error) is True
 
 
+def test_run_jobs_with_workers() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_path('output-1.jpg')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_path('output-2.jpg')
+	}
+	halt_on_error = True
+	job_workers = 2
+
+	create_job('job-test-run-jobs-with-workers-1')
+	create_job('job-test-run-jobs-with-workers-2')
+	add_step('job-test-run-jobs-with-workers-1', args_1)
+	add_step('job-test-run-jobs-with-workers-2', args_2)
+	submit_jobs(halt_on_error)
+
+	assert run_jobs(process_step, halt_on_error, job_workers) is True
+	assert sorted(find_job_ids('completed')) == [ 'job-test-run-jobs-with-workers-1', 'job-test-run-jobs-with-workers-2' ]
+	assert is_test_output_file('output-1.jpg') is True
+	assert is_test_output_file('output-2.jpg') is True
+
+
+def test_run_jobs_with_worker_id() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_path('output-1.jpg')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_path('output-2.jpg')
+	}
+	halt_on_error = True
+
+	create_job('job-test-run-jobs-with-worker-id-1')
+	create_job('job-test-run-jobs-with-worker-id-2')
+	add_step('job-test-run-jobs-with-worker-id-1', args_1)
+	add_step('job-test-run-jobs-with-worker-id-2', args_2)
+	submit_jobs(halt_on_error)
+	claim_lease(get_step_lease_id('job-test-run-jobs-with-worker-id-2', 0), 'worker-2')
+
+	assert run_jobs(process_step, halt_on_error, 1, 'worker-1') is True
+	assert find_job_ids('completed') == [ 'job-test-run-jobs-with-worker-id-1' ]
+	assert find_job_ids('queued') == [ 'job-test-run-jobs-with-worker-id-2' ]
+	assert read_lease('job-test-run-jobs-with-worker-id-1') is None
+	assert read_lease(get_step_lease_id('job-test-run-jobs-with-worker-id-2', 0)) == 'worker-2'
+
+
+def test_run_jobs_with_lost_worker() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_path('output-1.jpg')
+	}
+	halt_on_error = True
+	job_workers = 2
+
+	create_job('job-test-run-jobs-with-lost-worker')
+	add_step('job-test-run-jobs-with-lost-worker', args_1)
+	submit_jobs(halt_on_error)
+
+	assert run_jobs(process_step_abruptly, halt_on_error, job_workers) is False
+	assert find_job_ids('failed') == [ 'job-test-run-jobs-with-lost-worker' ]
+	assert get_steps('job-test-run-jobs-with-lost-worker')[0].get('status') == 'failed'
+	assert read_lease(get_step_lease_id('job-test-run-jobs-with-lost-worker', 0)) is None
+
+
+def test_run_jobs_with_segments() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_path('output-1.mp4'),
+		'trim_frame_start': 0,
+		'trim_frame_end': 135
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_path('output-1.mp4'),
+		'trim_frame_start': 135,
+		'trim_frame_end': 270
+	}
+	halt_on_error = True
+	job_workers = 2
+
+	create_job('job-test-run-jobs-with-segments')
+	add_step('job-test-run-jobs-with-segments', args_1)
+	add_step('job-test-run-jobs-with-segments', args_2)
+	submit_jobs(halt_on_error)
+
+	assert run_jobs(process_step_concurrently, halt_on_error, job_workers) is True
+	assert find_job_ids('completed') == [ 'job-test-run-jobs-with-segments' ]
+	assert is_test_output_file('output-1.mp4') is True
+
+
 def test_retry_job() -> None:
 	args_1 =\
 	{
@@ -1,6 +1,10 @@
+import os
+import stat
 import tempfile
 
-from facefusion.json import read_json, write_json
+import pytest
+
+from facefusion.json import FILE_UMASK, read_json, write_json
 
 
 def test_read_json() -> None:
@@ -17,3 +21,20 @@ def test_write_json() -> None:
 	_, json_path = tempfile.mkstemp(suffix = '.json')
 
 	assert write_json(json_path, {})
+
+
+def test_write_json_with_file_mode() -> None:
+	json_path = os.path.join(tempfile.mkdtemp(), 'test.json')
+
+	assert write_json(json_path, {})
+	assert stat.S_IMODE(os.stat(json_path).st_mode) == 0o666 & ~FILE_UMASK
+	assert os.listdir(os.path.dirname(json_path)) == [ 'test.json' ]
+
+
+def test_write_json_with_invalid_content() -> None:
+	json_path = os.path.join(tempfile.mkdtemp(), 'test.json')
+
+	with pytest.raises(TypeError):
+		write_json(json_path, { 'invalid': object() })
+
+	assert os.listdir(os.path.dirname(json_path)) == []
@@ -0,0 +1,78 @@
+import subprocess
+
+import pytest
+
+from facefusion.download import conditional_download
+from facefusion.media_probe import create_media_probe, parse_frame_rate, parse_resolution, probe_media
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/source.mp3',
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vframes', '1', get_test_example_file('target-240p.jpg') ])
+
+
+def test_probe_media() -> None:
+	media_probe = probe_media(get_test_example_file('target-240p.mp4'))
+
+	assert media_probe.get('fps') == 25.0
+	assert media_probe.get('frame_total') == 270
+	assert media_probe.get('resolution') == (426, 226)
+	assert probe_media(get_test_example_file('target-240p.jpg')).get('resolution') == (426, 226)
+	assert probe_media(get_test_example_file('source.mp3')).get('sample_rate') == 44100
+	assert probe_media(get_test_example_file('source.mp3')).get('channels') == 1
+	assert probe_media('invalid') is None
+
+
+def test_create_media_probe() -> None:
+	media_probe = create_media_probe(
+	{
+		'streams':
+		[
+			{
+				'codec_type': 'video',
+				'width': 1920,
+				'height': 1080,
+				'avg_frame_rate': '30000/1001',
+				'duration': '10.010000'
+			},
+			{
+				'codec_type': 'audio',
+				'sample_rate': '48000',
+				'channels': 2,
+				'duration': '10.000000'
+			}
+		],
+		'format':
+		{
+			'duration': '10.010000'
+		}
+	})
+
+	assert media_probe.get('streams') == [ 'video', 'audio' ]
+	assert media_probe.get('duration') == 10.01
+	assert media_probe.get('fps') == pytest.approx(29.97, rel = 1e-3)
+	assert media_probe.get('frame_total') == 300
+	assert media_probe.get('resolution') == (1920, 1080)
+	assert media_probe.get('sample_rate') == 48000
+	assert media_probe.get('sample_total') == 480480
+	assert media_probe.get('channels') == 2
+	assert create_media_probe({}).get('resolution') is None
+
+
+def test_parse_frame_rate() -> None:
+	assert parse_frame_rate('25/1') == 25.0
+	assert parse_frame_rate('0/0') is None
+	assert parse_frame_rate(None) is None
+
+
+def test_parse_resolution() -> None:
+	assert parse_resolution({ 'width': 1920, 'height': 1080 }) == (1920, 1080)
+	assert parse_resolution({ 'width': 1920, 'height': 1080, 'side_data_list': [ { 'rotation': -90 } ] }) == (1080, 1920)
+	assert parse_resolution({ 'width': 1920, 'height': 1080, 'tags': { 'rotate': '180' } }) == (1920, 1080)
+	assert parse_resolution({}) is None
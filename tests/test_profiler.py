@@ -0,0 +1,47 @@
+import tempfile
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.json import read_json
+from facefusion.profiler import PROFILER, clear_profiler, create_profile_wrapper, profile, write_profile_trace
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	state_manager.init_item('profile', True)
+	clear_profiler()
+
+
+def test_profile() -> None:
+	with profile('test'):
+		pass
+
+	with profile('test'):
+		pass
+
+	assert PROFILER.get('profile_stages').get('test').get('call_total') == 2
+	assert len(PROFILER.get('trace_events')) == 2
+
+	state_manager.init_item('profile', False)
+
+	with profile('test'):
+		pass
+
+	assert PROFILER.get('profile_stages').get('test').get('call_total') == 2
+
+
+def test_create_profile_wrapper() -> None:
+	profile_wrapper = create_profile_wrapper('test', lambda value: value * 2)
+
+	assert profile_wrapper(2) == 4
+	assert PROFILER.get('profile_stages').get('test').get('call_total') == 1
+
+
+def test_write_profile_trace() -> None:
+	with profile('test'):
+		pass
+
+	with tempfile.NamedTemporaryFile(suffix = '.json') as trace_file:
+		assert write_profile_trace(trace_file.name) is True
+		assert read_json(trace_file.name).get('traceEvents')[0].get('name') == 'test'
@@ -5,7 +5,7 @@ import pytest
 
 from facefusion import state_manager
 from facefusion.download import conditional_download
-from facefusion.temp_helper import get_temp_directory_path, get_temp_file_path, get_temp_frames_pattern
+from facefusion.temp_helper import append_processed_frame_numbers, clear_processed_frame_numbers, clear_temp_directory, create_temp_directory, get_temp_checkpoint_log_path, get_temp_directory_path, get_temp_file_path, get_temp_frames_pattern, get_temp_partial_frame_path, read_processed_frame_numbers, read_temp_checkpoint, write_temp_checkpoint
 from .helper import get_test_example_file, get_test_examples_directory
 
 
@@ -30,3 +30,40 @@ def test_get_temp_directory_path() -> None:
 
 def test_get_temp_frames_pattern() -> None:
 	assert get_temp_frames_pattern(state_manager.get_temp_path(), get_test_example_file('target-240p.mp4'), state_manager.get_item('temp_frame_format'), '%04d') == os.path.join(state_manager.get_temp_path(), 'facefusion', 'target-240p', '%04d.png')
+
+
+def test_get_temp_partial_frame_path() -> None:
+	assert get_temp_partial_frame_path(os.path.join('facefusion', 'target-240p', '00000001.png')) == os.path.join('facefusion', 'target-240p', 'partial', '00000001.png')
+
+
+def test_temp_checkpoint() -> None:
+	output_path = get_test_example_file('target-240p.mp4')
+	create_temp_directory(state_manager.get_temp_path(), output_path)
+
+	assert read_temp_checkpoint(state_manager.get_temp_path(), output_path) is None
+	assert write_temp_checkpoint(state_manager.get_temp_path(), output_path,
+	{
+		'checkpoint_key': 'a1b2c3d4',
+		'frame_total': 270
+	}) is True
+	assert read_temp_checkpoint(state_manager.get_temp_path(), output_path).get('frame_total') == 270
+
+	clear_temp_directory(state_manager.get_temp_path(), output_path)
+
+
+def test_processed_frame_numbers() -> None:
+	output_path = get_test_example_file('target-240p.mp4')
+	create_temp_directory(state_manager.get_temp_path(), output_path)
+
+	assert read_processed_frame_numbers(state_manager.get_temp_path(), output_path) == set()
+	assert append_processed_frame_numbers(state_manager.get_temp_path(), output_path, [ 0, 1, 2 ]) is True
+	assert append_processed_frame_numbers(state_manager.get_temp_path(), output_path, [ 4 ]) is True
+
+	with open(get_temp_checkpoint_log_path(state_manager.get_temp_path(), output_path), 'a') as temp_checkpoint_log_file:
+		temp_checkpoint_log_file.write('5')
+
+	assert read_processed_frame_numbers(state_manager.get_temp_path(), output_path) == { 0, 1, 2, 4 }
+	assert clear_processed_frame_numbers(state_manager.get_temp_path(), output_path) is True
+	assert read_processed_frame_numbers(state_manager.get_temp_path(), output_path) == set()
+
+	clear_temp_directory(state_manager.get_temp_path(), output_path)
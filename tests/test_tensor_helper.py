@@ -0,0 +1,54 @@
+import numpy
+
+from facefusion.tensor_helper import normalize_vision_tensor, normalize_vision_tensors, prepare_vision_tensor, prepare_vision_tensors
+
+
+def test_prepare_vision_tensor() -> None:
+	vision_frame = numpy.random.randint(0, 255, (32, 48, 3), dtype = numpy.uint8)
+	vision_tensor = prepare_vision_tensor(vision_frame, [ 0.5, 0.5, 0.5 ], [ 0.5, 0.5, 0.5 ])
+	reference_tensor = ((vision_frame[:, :, ::-1] / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)
+
+	assert vision_tensor.shape == (1, 3, 32, 48)
+	assert vision_tensor.dtype == numpy.float32
+	assert numpy.allclose(vision_tensor[0], reference_tensor, atol = 1e-6)
+
+
+def test_prepare_vision_tensors() -> None:
+	vision_frames = [ numpy.full((16, 16, 3), 255, dtype = numpy.uint8), numpy.zeros((16, 16, 3), dtype = numpy.uint8) ]
+	vision_tensors = prepare_vision_tensors(vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
+
+	assert vision_tensors.shape == (2, 3, 16, 16)
+	assert numpy.all(vision_tensors[0] == 1)
+	assert numpy.all(vision_tensors[1] == 0)
+
+
+def test_prepare_vision_tensors_with_buffer() -> None:
+	vision_frames = [ numpy.full((16, 16, 3), 255, dtype = numpy.uint8) ]
+	vision_tensors = prepare_vision_tensors(vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], 'test')
+
+	assert vision_tensors.shape == (1, 3, 16, 16)
+	assert numpy.all(vision_tensors == 1)
+	assert numpy.shares_memory(prepare_vision_tensors(vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ], 'test'), vision_tensors)
+	assert not numpy.shares_memory(prepare_vision_tensors(vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ]), vision_tensors)
+
+
+def test_normalize_vision_tensor() -> None:
+	vision_frame = numpy.random.randint(0, 255, (32, 48, 3), dtype = numpy.uint8)
+	vision_mean = [ 0.485, 0.456, 0.406 ]
+	vision_standard_deviation = [ 0.229, 0.224, 0.225 ]
+	vision_tensor = prepare_vision_tensor(vision_frame, vision_mean, vision_standard_deviation)
+
+	vision_offset = vision_frame.astype(numpy.int16) - normalize_vision_tensor(vision_tensor, vision_mean, vision_standard_deviation)
+
+	assert numpy.isin(vision_offset, [ 0, 1 ]).all()
+	assert numpy.array_equal(normalize_vision_tensor(vision_tensor[0], vision_mean, vision_standard_deviation), normalize_vision_tensor(vision_tensor, vision_mean, vision_standard_deviation))
+	assert numpy.all(normalize_vision_tensor(numpy.full((3, 8, 8), 2, dtype = numpy.float32), [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ]) == 255)
+	assert numpy.all(normalize_vision_tensor(numpy.full((3, 8, 8), 254.9 / 255, dtype = numpy.float32), [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ]) == 254)
+
+
+def test_normalize_vision_tensors() -> None:
+	vision_frames = [ numpy.random.randint(0, 255, (16, 16, 3), dtype = numpy.uint8) for _ in range(3) ]
+	vision_tensors = prepare_vision_tensors(vision_frames, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])
+
+	for vision_frame, normalize_frame in zip(vision_frames, normalize_vision_tensors(vision_tensors, [ 0.0, 0.0, 0.0 ], [ 1.0, 1.0, 1.0 ])):
+		assert numpy.array_equal(vision_frame, normalize_frame)
@@ -1,9 +1,10 @@
 import subprocess
 
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.vision import calculate_histogram_difference, count_video_frame_total, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, match_frame_color, normalize_resolution, pack_resolution, predict_video_frame_total, read_image, read_video_frame, restrict_image_resolution, restrict_trim_video_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, unpack_resolution, write_image
+from facefusion.vision import calculate_histogram_difference, count_video_frame_total, create_tile_frames, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, match_frame_color, merge_tile_frames, normalize_resolution, pack_resolution, predict_video_frame_total, read_image, read_video_frame, restrict_image_resolution, restrict_trim_video_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, unpack_resolution, write_image
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_path, prepare_test_output_directory
 
 
@@ -157,3 +158,25 @@ def test_match_frame_color() -> None:
 	output_vision_frame = match_frame_color(source_vision_frame, target_vision_frame)
 
 	assert calculate_histogram_difference(source_vision_frame, output_vision_frame) > 0.5
+
+
+def test_create_tile_frames() -> None:
+	vision_frame = numpy.random.randint(0, 255, (240, 426, 3), dtype = numpy.uint8)
+	tile_vision_frames, pad_width, pad_height = create_tile_frames(vision_frame, (128, 8, 4))
+
+	assert len(tile_vision_frames) == 12
+	assert tile_vision_frames[0].shape == (128, 128, 3)
+	assert (pad_width, pad_height) == (488, 368)
+
+
+def test_merge_tile_frames() -> None:
+	vision_frame = numpy.random.randint(0, 255, (240, 426, 3), dtype = numpy.uint8)
+	tile_vision_frames, pad_width, pad_height = create_tile_frames(vision_frame, (128, 8, 4))
+
+	assert numpy.array_equal(merge_tile_frames(tile_vision_frames, 426, 240, pad_width, pad_height, (128, 8, 4)), vision_frame)
+
+	tile_vision_frames = [ numpy.repeat(numpy.repeat(tile_vision_frame, 2, axis = 0), 2, axis = 1) for tile_vision_frame in tile_vision_frames ]
+	merge_vision_frame = merge_tile_frames(tile_vision_frames, 852, 480, pad_width * 2, pad_height * 2, (256, 16, 8))
+
+	assert merge_vision_frame.flags.c_contiguous
+	assert numpy.array_equal(merge_vision_frame[::2, ::2], vision_frame)
@@ -0,0 +1,22 @@
+from typing import List
+from unittest.mock import patch
+
+import numpy
+
+from facefusion.types import AudioChunk, VoiceChunk
+from facefusion.voice_extractor import batch_extract_voice, stream_extract_voice
+
+
+def extract_voices(temp_audio_chunks : List[AudioChunk]) -> List[VoiceChunk]:
+	return [ temp_audio_chunk.astype(numpy.float32) * 0.5 + len(temp_audio_chunk) % 7 for temp_audio_chunk in temp_audio_chunks ]
+
+
+def test_stream_extract_voice() -> None:
+	audio = numpy.random.randint(-32768, 32767, (1000001, 2), dtype = numpy.int16)
+	audio_chunks = [ audio[index:index + 300000] for index in range(0, len(audio), 300000) ]
+
+	with patch('facefusion.voice_extractor.extract_voices', extract_voices):
+		voice = batch_extract_voice(audio, 24000, 18000, 8)
+
+		assert numpy.array_equal(numpy.concatenate(list(stream_extract_voice(iter(audio_chunks), 24000, 18000, 8))), voice)
+		assert list(stream_extract_voice(iter([]), 24000, 18000, 8)) == []
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import List
+
+import numpy
+import pytest
+from pytest_mock import MockerFixture
+
+from facefusion import process_manager, state_manager
+from facefusion.filesystem import move_file
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path, read_processed_frame_numbers, read_temp_checkpoint, resolve_temp_frame_paths, write_temp_checkpoint
+from facefusion.types import VisionFrame
+from facefusion.vision import read_image, read_static_image, write_image
+from facefusion.workflows.core import conditional_clear, create_checkpoint_key, process_frames, process_pipe_frames
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+	state_manager.init_item('output_path', os.path.join(tempfile.gettempdir(), 'test-workflows.mp4'))
+	state_manager.init_item('temp_frame_format', 'png')
+	state_manager.init_item('execution_batch_size', 1)
+	state_manager.init_item('execution_worker_mode', 'thread')
+	state_manager.init_item('execution_thread_count', 1)
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('log_level', 'error')
+	state_manager.init_item('processors', [])
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	create_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	read_static_image.cache_clear()
+	process_manager.start()
+
+
+def process_test_vision_frames(target_vision_frames : List[VisionFrame], frame_numbers : List[int]) -> List[VisionFrame]:
+	return [ target_vision_frame + 1 for target_vision_frame in target_vision_frames ]
+
+
+def test_process_frames_after_interrupted_batch(mocker : MockerFixture) -> None:
+	temp_directory_path = get_temp_directory_path(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+	interrupted_frame_path = os.path.join(temp_directory_path, '00000001.png')
+
+	for frame_number in range(4):
+		write_image(os.path.join(temp_directory_path, str(frame_number).zfill(8) + '.png'), numpy.full((8, 8, 3), 10, dtype = numpy.uint8))
+
+	def interrupt_move_file(file_path : str, move_path : str) -> bool:
+		if move_path == interrupted_frame_path:
+			raise KeyboardInterrupt
+		return move_file(file_path, move_path)
+
+	process_vision_frames_mock = mocker.patch('facefusion.workflows.core.process_vision_frames', side_effect = process_test_vision_frames)
+	move_file_mock = mocker.patch('facefusion.workflows.core.move_file', side_effect = interrupt_move_file)
+
+	with pytest.raises(KeyboardInterrupt):
+		process_frames()
+
+	assert 1 in read_processed_frame_numbers(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+
+	move_file_mock.side_effect = move_file
+	read_static_image.cache_clear()
+	process_manager.start()
+
+	assert process_frames() == 0
+	assert process_vision_frames_mock.call_count == 4
+
+	for temp_frame_path in resolve_temp_frame_paths(state_manager.get_temp_path(), state_manager.get_item('output_path'), state_manager.get_item('temp_frame_format')):
+		assert numpy.all(read_image(temp_frame_path) == 11)
+
+
+def test_process_pipe_frames_with_failing_processor(mocker : MockerFixture) -> None:
+	read_process = subprocess.Popen([ sys.executable, '-c', 'import sys\nwhile True: sys.stdout.buffer.write(bytes(192))' ], stdout = subprocess.PIPE)
+	write_process = subprocess.Popen([ sys.executable, '-c', 'import sys\nsys.stdin.buffer.read()' ], stdin = subprocess.PIPE)
+	mocker.patch('facefusion.workflows.core.process_vision_frames', side_effect = RuntimeError)
+
+	with pytest.raises(RuntimeError):
+		process_pipe_frames(read_process, write_process, (8, 8), 100)
+
+	assert read_process.wait(timeout = 10) != 0
+	assert write_process.wait(timeout = 10) != 0
+	assert [ thread for thread in threading.enumerate() if not thread.daemon ] == [ threading.main_thread() ]
+
+
+def test_conditional_clear_with_different_steps() -> None:
+	state_manager.init_item('target_path', state_manager.get_item('output_path'))
+	state_manager.init_item('face_swapper_model', 'hyperswap_1a_256')
+	step_set =\
+	[
+		('trim_frame_start', 0, 100),
+		('face_swapper_model', 'hyperswap_1a_256', 'inswapper_128')
+	]
+
+	for key, value, step_value in step_set:
+		state_manager.set_item('processors', [ 'face_swapper' ])
+		state_manager.set_item(key, value)
+		write_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path'),
+		{
+			'checkpoint_key': create_checkpoint_key(),
+			'frame_total': 0
+		})
+
+		assert conditional_clear() == 0
+		assert read_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+
+		state_manager.set_item(key, step_value)
+
+		assert conditional_clear() == 0
+		assert read_temp_checkpoint(state_manager.get_temp_path(), state_manager.get_item('output_path')) is None
+
+		create_temp_directory(state_manager.get_temp_path(), state_manager.get_item('output_path'))
+
+	state_manager.set_item('processors', [])